@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from pdfplumber.page import Page
+
+from build_rbi_datasets import DEFAULT_MANIFEST, dataset_tables, load_graph
+from page_analysis import TABLE_SETTINGS, iter_page_analysis, iter_text_lines
+from pdf_cache import PageCache, iter_page_results
+from text_backends import TEXT_SETTINGS, extract_page_lines
+
+
+layout_passes = 0
+
+
+def count_layout_passes() -> None:
+    # Counts pdfminer layout passes: Page.layout interprets the page's content
+    # stream the first time it is read on each Page object.
+    original = Page.layout
+
+    def layout(page: Page):
+        global layout_passes
+        if not hasattr(page, "_layout"):
+            layout_passes += 1
+        return original.fget(page)
+
+    Page.layout = property(layout)
+
+
+def legacy_page_tables(page: Page) -> List[List[List[str]]]:
+    return page.extract_tables(TABLE_SETTINGS) or []
+
+
+def separate_passes(paths: List[Path], cache: PageCache) -> Dict[Tuple[Path, int], object]:
+    # Before the shared analysis: extract_tables cached "tables" entries and
+    # build_rbi_datasets "text" entries, each from its own layout pass.
+    results: Dict[Tuple[Path, int], object] = {}
+    for path in paths:
+        for page_number, lines in iter_page_results(path, "text", TEXT_SETTINGS, extract_page_lines, cache):
+            results[(path, page_number)] = {"lines": lines}
+        for page_number, tables in iter_page_results(path, "tables", TABLE_SETTINGS, legacy_page_tables, cache):
+            results[(path, page_number)]["tables"] = tables
+    return results
+
+
+def shared_pass(paths: List[Path], cache: PageCache) -> Dict[Tuple[Path, int], object]:
+    # The table consumer fills the analysis cache; the text consumer then
+    # reads its lines from the same entries.
+    results: Dict[Tuple[Path, int], object] = {}
+    for path in paths:
+        for page_number, analysis in iter_page_analysis(path, cache):
+            results[(path, page_number)] = {"tables": analysis["tables"]}
+        for page_number, lines in iter_text_lines(path, cache):
+            results[(path, page_number)]["lines"] = lines
+    return results
+
+
+def measure(run: Callable[[List[Path], PageCache], Dict], paths: List[Path], repeat: int) -> Tuple[float, int, Dict]:
+    global layout_passes
+    best = float("inf")
+    passes = 0
+    results: Dict = {}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="bench-analysis-") as temp:
+            layout_passes = 0
+            start = time.perf_counter()
+            results = run(paths, PageCache(Path(temp)))
+            best = min(best, time.perf_counter() - start)
+            passes = layout_passes
+    return best, passes, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare separate text/table layout passes with the shared page analysis."
+    )
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Path to manifest.json.")
+    parser.add_argument(
+        "--pdf-dir",
+        type=Path,
+        help="Directory containing the RBI table PDFs (defaults to the manifest's pdf_dir).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    tables, datasets = load_graph(args.manifest, args.pdf_dir)
+    paths = list(dict.fromkeys(tables[name] for dataset in datasets for name in dataset_tables(dataset)))
+    count_layout_passes()
+
+    separate_time, separate_count, separate = measure(separate_passes, paths, args.repeat)
+    shared_time, shared_count, shared = measure(shared_pass, paths, args.repeat)
+    pages = len(shared)
+    print(f"{len(paths)} PDFs, {pages} pages; text + tables for every page, fresh page cache, best of {args.repeat}")
+    print(f"  separate passes: {separate_count} layout passes, {separate_time:.2f}s")
+    print(f"  shared analysis: {shared_count} layout passes, {shared_time:.2f}s")
+    print(
+        f"  {separate_count - shared_count} fewer layout passes "
+        f"({(1 - shared_count / separate_count) * 100 if separate_count else 0:.0f}%), "
+        f"{separate_time - shared_time:.2f}s saved ({(1 - shared_time / separate_time) * 100:.0f}%)"
+    )
+    if separate != shared:
+        mismatched = sorted(
+            f"{path.name}:{page}" for (path, page), result in separate.items() if result != shared.get((path, page))
+        )
+        print(f"MISMATCH: shared analysis differs on {', '.join(mismatched)}")
+        sys.exit(1)
+    print("Text lines and tables are identical to the separate extract_text/extract_tables calls.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from bench_parse import build_all
+from build_rbi_datasets import DEFAULT_MANIFEST, dataset_tables, extract_lines, load_graph, parse_state_lines
+from text_backends import DEFAULT_TEXT_BACKEND, TEXT_BACKENDS
+
+
+def time_extraction(paths: List[Path], backend: str, repeat: int) -> float:
+    # Lines only for every backend: pdfplumber does not search for tables here.
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            extract_lines(path, None, backend)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def normalized(lines: List[str]) -> List[str]:
+    return [" ".join(line.split()) for line in lines if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare text-extraction backends for speed and for identical parsed datasets."
+    )
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Path to manifest.json.")
+    parser.add_argument(
+        "--pdf-dir",
+        type=Path,
+        help="Directory containing the RBI table PDFs (defaults to the manifest's pdf_dir).",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=sorted(TEXT_BACKENDS),
+        default=sorted(TEXT_BACKENDS),
+        help="Backends to compare against the pdfplumber reference.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    tables, datasets = load_graph(args.manifest, args.pdf_dir)
+    table_names = list(dict.fromkeys(name for dataset in datasets for name in dataset_tables(dataset)))
+    paths = list(dict.fromkeys(tables[name] for name in table_names))
+    backends = [DEFAULT_TEXT_BACKEND] + [backend for backend in args.backends if backend != DEFAULT_TEXT_BACKEND]
+
+    lines: Dict[str, Dict[Path, List[str]]] = {}
+    outputs: Dict[str, Dict[str, str]] = {}
+    for backend in backends:
+        lines[backend] = {path: extract_lines(path, None, backend) for path in paths}
+        parsed = {name: parse_state_lines(lines[backend][tables[name]]) for name in table_names}
+        outputs[backend] = build_all(datasets, parsed)
+
+    reference_time = time_extraction(paths, DEFAULT_TEXT_BACKEND, args.repeat)
+    reference = outputs[DEFAULT_TEXT_BACKEND]
+    failed = []
+    print(f"{len(paths)} PDFs, {len(reference)} datasets (extraction without the page cache, best of {args.repeat})")
+    for backend in backends:
+        elapsed = reference_time if backend == DEFAULT_TEXT_BACKEND else time_extraction(paths, backend, args.repeat)
+        total_lines = sum(len(page_lines) for page_lines in lines[backend].values())
+        same_lines = sum(
+            normalized(lines[backend][path]) == normalized(lines[DEFAULT_TEXT_BACKEND][path]) for path in paths
+        )
+        mismatched = [name for name in reference if outputs[backend][name] != reference[name]]
+        print(
+            f"  {backend + ':':12} {elapsed * 1000:9.1f} ms, {total_lines / elapsed:10,.0f} lines/s, "
+            f"{reference_time / elapsed:5.2f}x; identical lines in {same_lines}/{len(paths)} PDFs, "
+            f"datasets {'identical' if not mismatched else 'DIFFER: ' + ', '.join(mismatched)}"
+        )
+        if mismatched:
+            failed.append(backend)
+
+    if failed:
+        print(f"MISMATCH: {', '.join(failed)} produced different datasets than {DEFAULT_TEXT_BACKEND}.")
+        sys.exit(1)
+    print(f"Equivalence check passed: every backend builds the same {len(reference)} datasets.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from build_json import build_columns, build_rows, compute_national, compute_national_columns, load_csv
+from synthetic_pdfs import write_dataset_csv
+
+
+COLUMNS = {
+    "state": {"source": ["state"]},
+    "gsdp": {"source": ["gsdp"]},
+    "growth": {"source": ["growth"]},
+    "perCapita": {"source": ["per capita"]},
+}
+NUMERIC_FIELDS = ["gsdp", "growth", "perCapita"]
+NATIONAL = {
+    "sum": {"totalGDP": "gsdp"},
+    "avg": {"avgGrowth": "growth", "avgPerCapita": "perCapita"},
+    "median": {"medianPerCapita": "perCapita"},
+    "percentile": {"p90PerCapita": {"field": "perCapita", "q": 90}},
+    "weighted_avg": {"weightedGrowth": {"field": "growth", "weight": "gsdp"}},
+    "min": {"minGrowth": "growth"},
+    "max": {"maxGrowth": "growth"},
+}
+
+
+def best_of(func: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare build_json's row and NumPy column build paths.")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows in the synthetic CSV.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best run is reported).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic CSV.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="rbi-build-json-") as work_dir:
+        csv_path = Path(work_dir) / "synthetic.csv"
+        write_dataset_csv(csv_path, args.rows, args.seed)
+        rows = load_csv(csv_path)
+
+    def row_path() -> Tuple[List[Dict[str, object]], Dict[str, object]]:
+        data = build_rows(rows, COLUMNS, NUMERIC_FIELDS, 0)
+        return data, compute_national(data, NATIONAL)
+
+    def column_path() -> Tuple[List[Dict[str, object]], Dict[str, object]]:
+        table = build_columns(rows, COLUMNS, NUMERIC_FIELDS, 0)
+        return table.to_records(), compute_national_columns(table, NATIONAL)
+
+    stages = {
+        "rows: build_rows + compute_national": row_path,
+        "columns: build_columns + to_records + national": column_path,
+        "columns: build_columns only": lambda: build_columns(rows, COLUMNS, NUMERIC_FIELDS, 0),
+    }
+    timings: Dict[str, float] = {}
+    results: Dict[str, object] = {}
+    for name, stage in stages.items():
+        timings[name], results[name] = best_of(stage, args.repeat)
+
+    reference = timings["rows: build_rows + compute_national"]
+    print(f"{len(rows) - 1:,} CSV rows (best of {args.repeat}):")
+    for name, elapsed in timings.items():
+        print(f"  {name + ':':48} {elapsed * 1000:8.1f} ms, {(len(rows) - 1) / elapsed:12,.0f} rows/s, "
+              f"{reference / elapsed:5.2f}x")
+
+    row_data, row_national = results["rows: build_rows + compute_national"]
+    column_data, column_national = results["columns: build_columns + to_records + national"]
+    print(f"  national: {json.dumps(column_national)}")
+    if json.dumps(row_data) != json.dumps(column_data) or json.dumps(row_national) != json.dumps(column_national):
+        print("MISMATCH: the column path built different records or aggregates.")
+        sys.exit(1)
+    print("Equivalence check passed: identical records and national aggregates.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from build_rbi_datasets import (
+    DEFAULT_MANIFEST,
+    SKIP_LINES,
+    SKIP_PREFIXES,
+    YEAR_RE,
+    Series,
+    build_series_dataset,
+    dataset_tables,
+    extract_lines,
+    load_graph,
+    normalize_state_name,
+    parse_state_lines,
+    parse_state_series,
+    stop_years,
+    year_sort_key,
+)
+from pdf_cache import add_cache_arguments, cache_from_args, finish_cache
+
+
+# Reference implementation of parse_state_series and its helpers before the
+# single-pass tokenizer; kept verbatim as the baseline and golden for this
+# benchmark.
+def parse_years(line: str) -> List[str]:
+    return YEAR_RE.findall(line)
+
+
+def parse_numbers(text: str) -> List[Optional[float]]:
+    numbers = []
+    for token in re.findall(r"-|\d[\d,]*\.?\d*", text):
+        token = token.strip()
+        if token in {"-", ""}:
+            continue
+        value = token.replace(",", "")
+        try:
+            num = float(value)
+        except ValueError:
+            continue
+        numbers.append(num)
+    return numbers
+
+
+def legacy_parse_state_lines(lines: List[str]) -> Series:
+    header_years: List[str] = []
+    all_years: List[str] = []
+    rows: Dict[str, Dict[str, Optional[float]]] = {}
+    pending_name = ""
+
+    for line in lines:
+        line = " ".join(line.split())
+        if not line:
+            continue
+        lowered = line.lower()
+        years = parse_years(line)
+        if years and len(years) >= 3:
+            header_years = years
+            pending_name = ""
+            for year in years:
+                if year not in all_years:
+                    all_years.append(year)
+            continue
+        if lowered.startswith(SKIP_PREFIXES):
+            pending_name = ""
+            continue
+        if "all india" in lowered or "all-india" in lowered:
+            pending_name = ""
+            continue
+        if "state/union territory" in lowered or "region/state/union" in lowered:
+            pending_name = ""
+            continue
+
+        if not any(ch.isdigit() for ch in line):
+            if lowered in SKIP_LINES or lowered.startswith("and daman"):
+                continue
+            if "-" in line and header_years:
+                name_part = re.split(r"\s-+", line)[0].strip()
+                name = normalize_state_name(name_part)
+                if name and "region" not in name.lower():
+                    rows.setdefault(name, {})
+                continue
+            pending_name = (pending_name + " " + line).strip()
+            continue
+
+        first_digit = re.search(r"\d", line)
+        if not first_digit:
+            continue
+        idx = first_digit.start()
+        name_part = line[:idx].strip()
+        values_part = line[idx:].strip()
+
+        if not name_part and pending_name:
+            name_part = pending_name
+            pending_name = ""
+        elif pending_name:
+            name_part = f"{pending_name} {name_part}".strip()
+            pending_name = ""
+
+        if not name_part:
+            continue
+
+        values = parse_numbers(values_part)
+        if not header_years:
+            continue
+        if len(values) < len(header_years):
+            values = [None] * (len(header_years) - len(values)) + values
+        if len(values) > len(header_years):
+            values = values[: len(header_years)]
+
+        name = normalize_state_name(name_part)
+        if not name or "region" in name.lower():
+            continue
+        rows.setdefault(name, {})
+        for year, value in zip(header_years, values):
+            if value is None:
+                continue
+            if year in rows[name]:
+                rows[name][year] += value
+            else:
+                rows[name][year] = value
+
+    sorted_years = sorted(all_years, key=year_sort_key)
+    normalized_rows: Dict[str, List[Optional[float]]] = {}
+    for name, year_map in rows.items():
+        normalized_rows[name] = [year_map.get(year) for year in sorted_years]
+
+    return sorted_years, normalized_rows
+
+
+def time_parser(parser: Callable[[List[str]], Series], line_sets: List[List[str]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for lines in line_sets:
+            parser(lines)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_all(datasets: List[Dict[str, object]], parsed: Dict[str, Series]) -> Dict[str, str]:
+    return {
+        dataset["output"]: json.dumps(
+            build_series_dataset(dataset, {name: parsed[name] for name in dataset_tables(dataset)}),
+            indent=2,
+        )
+        for dataset in datasets
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parse_state_series against the legacy line parser.")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Path to manifest.json.")
+    parser.add_argument(
+        "--pdf-dir",
+        type=Path,
+        help="Directory containing the RBI table PDFs (defaults to the manifest's pdf_dir).",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best run is reported).")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    cache = cache_from_args(args)
+    tables, datasets = load_graph(args.manifest, args.pdf_dir)
+    table_names = list(dict.fromkeys(name for dataset in datasets for name in dataset_tables(dataset)))
+    line_sets = [extract_lines(tables[name], cache) for name in table_names]
+    finish_cache(cache)
+    total_lines = sum(len(lines) for lines in line_sets)
+
+    legacy = {name: legacy_parse_state_lines(lines) for name, lines in zip(table_names, line_sets)}
+    current = {name: parse_state_lines(lines) for name, lines in zip(table_names, line_sets)}
+    mismatched_tables = [name for name in table_names if repr(legacy[name]) != repr(current[name])]
+    legacy_outputs = build_all(datasets, legacy)
+    current_outputs = build_all(datasets, current)
+    mismatched_datasets = [name for name in legacy_outputs if legacy_outputs[name] != current_outputs[name]]
+
+    # --early-exit must not drop rows: every PDF it would cut short lists the
+    # same states as a full parse, and the datasets built from it match.
+    targets = stop_years(datasets, tables)
+    early = dict(current)
+    for name in table_names:
+        if tables[name] in targets:
+            early[name] = parse_state_series(tables[name], cache, stop_after_years=targets[tables[name]])
+    mismatched_early = [
+        f"{name} ({len(early[name][1])} rows vs {len(current[name][1])})"
+        for name in table_names
+        if set(early[name][1]) != set(current[name][1])
+    ]
+    early_outputs = build_all(datasets, early)
+    mismatched_early.extend(name for name in early_outputs if early_outputs[name] != current_outputs[name])
+
+    legacy_time = time_parser(legacy_parse_state_lines, line_sets, args.repeat)
+    current_time = time_parser(parse_state_lines, line_sets, args.repeat)
+    print(f"{len(table_names)} tables, {total_lines} lines (best of {args.repeat})")
+    print(f"  legacy:   {total_lines / legacy_time:,.0f} lines/s ({legacy_time * 1000:.2f} ms)")
+    print(f"  current:  {total_lines / current_time:,.0f} lines/s ({current_time * 1000:.2f} ms)")
+    print(f"  speedup:  {legacy_time / current_time:.2f}x")
+
+    if mismatched_tables or mismatched_datasets or mismatched_early:
+        for name in mismatched_tables:
+            print(f"MISMATCH table: {name}")
+        for name in mismatched_datasets:
+            print(f"MISMATCH dataset: {name}")
+        for name in mismatched_early:
+            print(f"MISMATCH early exit: {name}")
+        sys.exit(1)
+    print(f"Golden check passed: {len(table_names)} tables and {len(current_outputs)} datasets identical.")
+    print(f"Early exit check passed: {len(targets)} PDFs, same rows and datasets as a full parse.")
+
+
+if __name__ == "__main__":
+    main()
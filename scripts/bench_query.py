@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlencode
+
+from query_service import DEFAULT_DATA_DIR, QueryEngine, make_server
+
+
+def query_mix(engine: QueryEngine, seed: int) -> List[str]:
+    # Analyst-style questions over every dataset: top-k per region and
+    # indicator, single-state lookups, threshold filters and joins.
+    paths = []
+    names = sorted(engine.datasets)
+    for name in names:
+        index = engine.datasets[name]
+        for field in index.fields:
+            for region in sorted(index.by_region):
+                paths.append({"dataset": name, "region": region, "sort": field, "top": 5})
+            values = sorted(index.rows[position][field] for position in index.ranked[field])
+            if values:
+                paths.append({"dataset": name, "where": f"{field}>{values[len(values) // 2]}", "sort": field})
+        for code in sorted(index.by_code):
+            paths.append({"dataset": name, "state": code})
+        for other in names:
+            if other != name:
+                paths.append({"dataset": name, "join": other, "sort": index.fields[0], "top": 10})
+    rng = random.Random(seed)
+    rng.shuffle(paths)
+    return ["/query?" + urlencode(params) for params in paths]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_load(port: int, paths: List[str], requests: int, concurrency: int, seed: int) -> Dict[str, object]:
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def client(worker: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed + worker)
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        local: List[float] = []
+        failed = 0
+        for _ in range(requests // concurrency):
+            path = rng.choice(paths)
+            start = time.perf_counter()
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            local.append(time.perf_counter() - start)
+            if response.status != 200:
+                failed += 1
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed": elapsed,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": latencies[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the query service and report latency percentiles.")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Directory of dataset JSON files.")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per run.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client connections.")
+    parser.add_argument("--cache-size", type=int, default=1024, help="LRU size for the cached run.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the query mix.")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.concurrency} connections, data from {args.data_dir}")
+    for label, cache_size in (("uncached", 0), ("cached", args.cache_size)):
+        engine = QueryEngine(args.data_dir, cache_size)
+        server = make_server(engine, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        paths = query_mix(engine, args.seed)
+        try:
+            result = run_load(server.server_address[1], paths, args.requests, args.concurrency, args.seed)
+        finally:
+            server.shutdown()
+            server.server_close()
+        cache = engine.stats()["cache"]
+        lookups = cache["hits"] + cache["misses"]
+        print(
+            f"  {label:8} p50 {result['p50'] * 1000:6.2f} ms, p90 {result['p90'] * 1000:6.2f} ms, "
+            f"p99 {result['p99'] * 1000:6.2f} ms, max {result['max'] * 1000:6.2f} ms, "
+            f"{result['requests'] / result['elapsed']:7.0f} req/s, {result['errors']} errors, "
+            f"{len(paths)} distinct queries, cache hit rate {cache['hits'] / lookups if lookups else 0:.0%}"
+        )
+    print(json.dumps(engine.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from extract_tables import extract_tables_from_pdf, extract_tables_sharded
+from synthetic_pdfs import state_names, write_handbook_pdf, year_labels
+
+
+def read_outputs(written: List[Path], output_dir: Path) -> Dict[str, bytes]:
+    return {str(path.relative_to(output_dir)): path.read_bytes() for path in written}
+
+
+def run_once(pdf: Path, work_dir: Path, jobs: Optional[int]) -> Dict[str, object]:
+    output_dir = Path(tempfile.mkdtemp(dir=work_dir))
+    start = time.perf_counter()
+    if jobs is None:
+        written = extract_tables_from_pdf(pdf, output_dir)
+    else:
+        written = extract_tables_sharded(pdf, output_dir, jobs=jobs)
+    elapsed = time.perf_counter() - start
+    return {"elapsed": elapsed, "order": [path.name for path in written], "files": read_outputs(written, output_dir)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Scaling report for page-sharded table extraction from one large PDF."
+    )
+    parser.add_argument("--pdf", type=Path, help="PDF to extract (defaults to a generated synthetic handbook).")
+    parser.add_argument("--years", type=int, default=420, help="Year columns in the synthetic handbook.")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to compare.")
+    parser.add_argument("--repeat", type=int, default=1, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-shards-") as temp:
+        work_dir = Path(temp)
+        pdf = args.pdf
+        if pdf is None:
+            pdf = work_dir / "900T_SYNTHETIC.PDF"
+            stats = write_handbook_pdf(pdf, "900", state_names(36), year_labels(args.years))
+            print(f"Generated {pdf.name}: {stats['pages']} pages, {stats['bytes'] / 1024:.0f} KB")
+
+        # Extraction without the page cache, so every run does the full work.
+        serial = min((run_once(pdf, work_dir, None) for _ in range(args.repeat)), key=lambda run: run["elapsed"])
+        print(
+            f"{pdf.name}: {len(serial['files'])} tables, serial {serial['elapsed']:.2f}s "
+            f"({os.cpu_count()} CPUs, best of {args.repeat})"
+        )
+        if not serial["files"]:
+            # No tables means nothing to compare: the equivalence check below
+            # would pass whatever the sharding did.
+            print(f"{pdf.name} has no tables to extract; use a PDF with ruled tables.")
+            sys.exit(1)
+        failed = []
+        for jobs in args.jobs:
+            run = min((run_once(pdf, work_dir, jobs) for _ in range(args.repeat)), key=lambda run: run["elapsed"])
+            speedup = serial["elapsed"] / run["elapsed"]
+            identical = run["order"] == serial["order"] and run["files"] == serial["files"]
+            print(
+                f"  {jobs} worker{'s' if jobs != 1 else ' '}: {run['elapsed']:6.2f}s, {speedup:5.2f}x, "
+                f"efficiency {speedup / jobs:4.0%}, output {'identical' if identical else 'DIFFERS'}"
+            )
+            if not identical:
+                failed.append(jobs)
+
+    if failed:
+        print(f"MISMATCH: sharded output differs from the serial run with {', '.join(map(str, failed))} workers.")
+        sys.exit(1)
+    print("Sharded output matches the serial run at every worker count.")
+
+
+if __name__ == "__main__":
+    main()
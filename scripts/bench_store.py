@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from build_rbi_datasets import DEFAULT_MANIFEST, dataset_tables, load_graph, parse_state_series
+from pdf_cache import PageCache, add_cache_arguments, cache_from_args
+from series_store import DEFAULT_STORE_PATH, SeriesStore, open_store
+
+
+def source_tables(manifest_path: Path, pdf_dir: Optional[Path]) -> Dict[str, Path]:
+    tables, datasets = load_graph(manifest_path, pdf_dir)
+    return {name: tables[name] for dataset in datasets for name in dataset_tables(dataset)}
+
+
+def latest_year_by_reparse(pdf_path: Path, cache: Optional[PageCache]) -> Dict[str, Optional[float]]:
+    years, rows = parse_state_series(pdf_path, cache)
+    column = years.index(years[-1])
+    return {state: values[column] for state, values in rows.items()}
+
+
+def latest_year_from_store(store: SeriesStore, table: str) -> Dict[str, Optional[float]]:
+    return store.get_year(table, store.years(table)[-1])
+
+
+def best_time(run: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(store_path: Path, tables: Dict[str, Path], repeat: int, cache: Optional[PageCache]) -> None:
+    def reparse(page_cache: Optional[PageCache]) -> Callable[[], object]:
+        return lambda: [latest_year_by_reparse(path, page_cache) for path in tables.values()]
+
+    def read_store() -> object:
+        with open_store(store_path) as store:
+            return [latest_year_from_store(store, name) for name in tables]
+
+    timings = {"reparse PDFs": best_time(reparse(None), repeat)}
+    if cache is not None:
+        reparse(cache)()
+        timings["reparse, warm page cache"] = best_time(reparse(cache), repeat)
+    timings["series store"] = best_time(read_store, repeat)
+
+    store_time = timings["series store"]
+    print(f"Latest-year slice of {len(tables)} tables (best of {repeat}):")
+    for label, elapsed in timings.items():
+        speedup = f" ({elapsed / store_time:,.0f}x store time)" if store_time > 0 and label != "series store" else ""
+        print(f"  {label + ':':28} {elapsed * 1000:9.3f} ms{speedup}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark series store reads against reparsing the RBI PDFs.")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE_PATH, help="Series store written by --store.")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Path to manifest.json.")
+    parser.add_argument(
+        "--pdf-dir",
+        type=Path,
+        help="Directory containing the RBI table PDFs (defaults to the manifest's pdf_dir).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best run is reported).")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    run_benchmark(args.store, source_tables(args.manifest, args.pdf_dir), args.repeat, cache_from_args(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from build_json import build_columns, build_rows, load_csv
+from build_rbi_datasets import extract_lines, parse_state_lines, parse_state_series
+from extract_tables import extract_tables_from_pdf
+from synthetic_pdfs import state_names, write_dataset_csv, write_handbook_pdf, year_labels
+
+
+DEFAULT_RESULTS_PATH = Path(__file__).resolve().parent / ".cache" / "bench_results.json"
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "bench_baseline.json"
+CSV_COLUMNS = {
+    "state": {"source": ["state"]},
+    "gsdp": {"source": ["gsdp"]},
+    "growth": {"source": ["growth"]},
+    "perCapita": {"source": ["per capita"]},
+}
+
+# A stage returns (pages, rows) processed in one run.
+Stage = Callable[[], Tuple[int, int]]
+
+
+def measure(stage: Stage, repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    pages = rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages, rows = stage()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        "seconds": round(best, 4),
+        "rows": rows,
+        "rows_per_sec": round(rows / best, 1) if best > 0 else 0.0,
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+    if pages:
+        result["pages"] = pages
+        result["pages_per_sec"] = round(pages / best, 2) if best > 0 else 0.0
+    return result
+
+
+def generate_inputs(work_dir: Path, config: Dict[str, int]) -> Tuple[List[Path], Dict[Path, Dict[str, int]], Path]:
+    states = state_names(config["states"])
+    pdfs: Dict[Path, Dict[str, int]] = {}
+    for index in range(config["files"]):
+        path = work_dir / f"{900 + index}T_SYNTHETIC.PDF"
+        years = year_labels(config["years"], fiscal=index % 2 == 0)
+        pdfs[path] = write_handbook_pdf(
+            path, str(900 + index), states, years, config["years_per_page"], config["seed"] + index
+        )
+    csv_path = work_dir / "synthetic.csv"
+    write_dataset_csv(csv_path, config["csv_rows"], config["seed"])
+    return list(pdfs), pdfs, csv_path
+
+
+def run_suite(work_dir: Path, config: Dict[str, int], repeat: int) -> Dict[str, Dict[str, float]]:
+    pdf_paths, pdf_stats, csv_path = generate_inputs(work_dir, config)
+    total_pages = sum(stats["pages"] for stats in pdf_stats.values())
+    total_rows = sum(stats["rows"] for stats in pdf_stats.values())
+    line_sets = [extract_lines(path) for path in pdf_paths]
+
+    def parse_pdfs() -> Tuple[int, int]:
+        for path in pdf_paths:
+            parse_state_series(path)
+        return total_pages, total_rows
+
+    def parse_lines() -> Tuple[int, int]:
+        for lines in line_sets:
+            parse_state_lines(lines)
+        return 0, total_rows
+
+    def extract() -> Tuple[int, int]:
+        rows = 0
+        for path in pdf_paths:
+            for csv_file in extract_tables_from_pdf(path, work_dir / "tables" / path.stem):
+                rows += len(load_csv(csv_file))
+        return total_pages, rows
+
+    def build() -> Tuple[int, int]:
+        rows = load_csv(csv_path)
+        return 0, len(build_rows(rows, CSV_COLUMNS, ["gsdp", "growth", "perCapita"], 0))
+
+    def build_column_table() -> Tuple[int, int]:
+        rows = load_csv(csv_path)
+        table = build_columns(rows, CSV_COLUMNS, ["gsdp", "growth", "perCapita"], 0)
+        return 0, len(table.to_records())
+
+    stages: Dict[str, Stage] = {
+        "parse_state_series": parse_pdfs,
+        "parse_state_lines": parse_lines,
+        "extract_tables_from_pdf": extract,
+        "build_rows": build,
+        "build_columns": build_column_table,
+    }
+    return {name: measure(stage, repeat) for name, stage in stages.items()}
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    regressions = []
+    for stage, current in results.items():
+        previous = baseline.get(stage)
+        if not previous:
+            continue
+        for metric in ("rows_per_sec", "pages_per_sec"):
+            if metric in current and previous.get(metric) and current[metric] < previous[metric] * (1 - threshold):
+                regressions.append(
+                    f"{stage}: {metric} {current[metric]:,.1f} vs baseline {previous[metric]:,.1f} "
+                    f"({(current[metric] / previous[metric] - 1) * 100:+.1f}%)"
+                )
+        if previous.get("peak_mb") and current["peak_mb"] > previous["peak_mb"] * (1 + threshold):
+            regressions.append(
+                f"{stage}: peak_mb {current['peak_mb']:.2f} vs baseline {previous['peak_mb']:.2f} "
+                f"({(current['peak_mb'] / previous['peak_mb'] - 1) * 100:+.1f}%)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark extraction, parsing and CSV builds on synthetic handbook PDFs."
+    )
+    parser.add_argument("--files", type=int, default=2, help="Number of synthetic handbook PDFs.")
+    parser.add_argument("--states", type=int, default=36, help="State rows per table.")
+    parser.add_argument("--years", type=int, default=21, help="Year columns per table.")
+    parser.add_argument("--years-per-page", type=int, default=7, help="Year columns per page.")
+    parser.add_argument("--csv-rows", type=int, default=20000, help="Rows in the synthetic dataset CSV.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic data.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best run is reported).")
+    parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS_PATH, help="Where to write the results JSON.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH, help="Baseline results JSON.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Fail when throughput drops (or peak memory grows) by more than this fraction of the baseline.",
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the new baseline.")
+    args = parser.parse_args()
+
+    config = {
+        "files": args.files,
+        "states": args.states,
+        "years": args.years,
+        "years_per_page": args.years_per_page,
+        "csv_rows": args.csv_rows,
+        "seed": args.seed,
+    }
+    with tempfile.TemporaryDirectory(prefix="rbi-bench-") as work_dir:
+        stages = run_suite(Path(work_dir), config, args.repeat)
+
+    results = {
+        "config": config,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stages": stages,
+    }
+    print(f"Synthetic benchmark (best of {args.repeat}):")
+    for name, stage in stages.items():
+        pages = f", {stage['pages_per_sec']:,.2f} pages/s" if "pages_per_sec" in stage else ""
+        print(
+            f"  {name + ':':26} {stage['seconds'] * 1000:9.1f} ms, {stage['rows_per_sec']:12,.0f} rows/s{pages}, "
+            f"peak {stage['peak_mb']:.2f} MB"
+        )
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Updated baseline {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(
+            f"WARNING: no baseline at {args.baseline}; regression check skipped. "
+            "Run with --update-baseline on this machine to record one.",
+            file=sys.stderr,
+        )
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("config") != config:
+        print(
+            f"WARNING: baseline config {baseline.get('config')} differs from this run; regression check skipped.",
+            file=sys.stderr,
+        )
+        return
+    regressions = compare(stages, baseline.get("stages", {}), args.threshold)
+    if regressions:
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
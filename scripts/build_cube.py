@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from state_dimension import StateDimension, load_state_dimension
+
+
+DEFAULT_MANIFEST = Path(__file__).resolve().parent / "manifest.json"
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "src" / "data"
+
+STATE_METRICS = ["value", "rank", "percentile", "share", "yoy", "cagr"]
+REGION_METRICS = ["total", "avg", "share", "count", "rank"]
+NATIONAL_METRICS = ["total", "avg", "count"]
+
+Indicators = Dict[str, Dict[str, Dict[str, float]]]
+
+
+def year_start(year: str) -> int:
+    return int(year.split("-")[0])
+
+
+def round_or_none(value: Optional[float], digits: int = 2) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+def load_regions(dimension: StateDimension) -> Dict[str, str]:
+    return {code: dimension.region(code) for code in dimension.codes}
+
+
+def manifest_outputs(manifest_path: Path) -> Tuple[List[Tuple[str, str]], Set[str]]:
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    outputs: Dict[str, str] = {}
+    additive: Set[str] = set()
+    for dataset in manifest.get("series_datasets", []):
+        outputs[dataset["output"]] = dataset["name"]
+        for aggregate in dataset.get("national", []):
+            if aggregate.get("op") == "sum":
+                additive.add(f"{dataset['name']}.{aggregate['field']}")
+    for dataset in manifest.get("datasets", []):
+        name = dataset.get("name", "dataset")
+        output = dataset.get("output", f"{name}.json")
+        outputs.setdefault(output, name)
+        for field in ((dataset.get("national") or {}).get("sum") or {}).values():
+            additive.add(f"{outputs[output]}.{field}")
+    return list(outputs.items()), additive
+
+
+def collect_indicators(data_dir: Path, outputs: List[Tuple[str, str]], dimension: StateDimension) -> Indicators:
+    indicators: Indicators = {}
+    for output, name in outputs:
+        series_path = data_dir / "series" / f"{name}.json"
+        if series_path.exists():
+            series = json.loads(series_path.read_text(encoding="utf-8"))
+            for field, by_year in series["fields"].items():
+                years = indicators.setdefault(f"{name}.{field}", {})
+                for year, column in zip(series["years"], by_year):
+                    values = {
+                        dimension.key(state): value
+                        for state, value in zip(series["states"], column)
+                        if isinstance(value, (int, float))
+                    }
+                    if values:
+                        years[year] = values
+            continue
+
+        dataset_path = data_dir / output
+        if not dataset_path.exists():
+            continue
+        payload = json.loads(dataset_path.read_text(encoding="utf-8"))
+        year = str(payload.get("year", ""))
+        for row in payload.get("data", []):
+            for field, value in row.items():
+                if field == "state" or isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                indicators.setdefault(f"{name}.{field}", {}).setdefault(year, {})[dimension.key(row["state"])] = value
+    return indicators
+
+
+def rank_states(values: Dict[str, float]) -> Dict[str, Tuple[int, float]]:
+    ordered = sorted(values.items(), key=lambda item: item[1], reverse=True)
+    count = len(ordered)
+    ranks: Dict[str, Tuple[int, float]] = {}
+    rank = 0
+    previous = None
+    for position, (state, value) in enumerate(ordered, start=1):
+        if value != previous:
+            rank = position
+            previous = value
+        percentile = 100.0 if count == 1 else (count - rank) / (count - 1) * 100
+        ranks[state] = (rank, round(percentile, 2))
+    return ranks
+
+
+def growth_rate(current: float, previous: Optional[float]) -> Optional[float]:
+    if previous is None or previous == 0:
+        return None
+    return (current - previous) / abs(previous) * 100
+
+
+def compound_growth(current: float, first: Optional[Tuple[str, float]], year: str) -> Optional[float]:
+    if first is None or current <= 0:
+        return None
+    first_year, first_value = first
+    periods = year_start(year) - year_start(first_year)
+    if periods <= 0 or first_value <= 0:
+        return None
+    return ((current / first_value) ** (1 / periods) - 1) * 100
+
+
+def build_indicator(
+    by_year: Dict[str, Dict[str, float]],
+    regions: Dict[str, str],
+    additive: bool,
+) -> Dict[str, object]:
+    years = sorted(by_year, key=year_start)
+    first_seen: Dict[str, Tuple[str, float]] = {}
+    cube_years: Dict[str, object] = {}
+    by_start = {year_start(year): by_year[year] for year in years}
+
+    for year in years:
+        values = by_year[year]
+        # YoY only against the immediately preceding year; gaps in the
+        # series are left to CAGR rather than reported as one year's growth.
+        previous_values = by_start.get(year_start(year) - 1, {})
+        total = sum(values.values())
+        ranks = rank_states(values)
+        states: Dict[str, List[Optional[float]]] = {}
+        for state, value in values.items():
+            rank, percentile = ranks[state]
+            share = value / total * 100 if additive and total else None
+            states[state] = [
+                value,
+                rank,
+                percentile,
+                round_or_none(share),
+                round_or_none(growth_rate(value, previous_values.get(state))),
+                round_or_none(compound_growth(value, first_seen.get(state), year)),
+            ]
+            if value > 0 and state not in first_seen:
+                first_seen[state] = (year, value)
+
+        grouped: Dict[str, List[float]] = {}
+        for state, value in values.items():
+            grouped.setdefault(regions.get(state, "Other"), []).append(value)
+        region_rows: Dict[str, List[Optional[float]]] = {}
+        for region, region_values in grouped.items():
+            region_total = sum(region_values)
+            region_rows[region] = [
+                round(region_total, 2) if additive else None,
+                round(region_total / len(region_values), 2),
+                round_or_none(region_total / total * 100 if additive and total else None),
+                len(region_values),
+                None,
+            ]
+        key_index = 0 if additive else 1
+        region_ranks = rank_states({region: row[key_index] for region, row in region_rows.items()})
+        for region, row in region_rows.items():
+            row[4] = region_ranks[region][0]
+
+        cube_years[year] = {
+            "states": states,
+            "regions": region_rows,
+            "national": [
+                round(total, 2) if additive else None,
+                round(total / len(values), 2),
+                len(values),
+            ],
+        }
+
+    return {"additive": additive, "years": cube_years}
+
+
+def build_cube(indicators: Indicators, additive: Set[str], regions: Dict[str, str]) -> Dict[str, object]:
+    return {
+        "stateMetrics": STATE_METRICS,
+        "regionMetrics": REGION_METRICS,
+        "nationalMetrics": NATIONAL_METRICS,
+        "indicators": {
+            name: build_indicator(by_year, regions, name in additive)
+            for name, by_year in sorted(indicators.items())
+        },
+    }
+
+
+def write_cube(data_dir: Path, output_path: Path, manifest_path: Path = DEFAULT_MANIFEST) -> int:
+    outputs, additive = manifest_outputs(manifest_path)
+    states_path = data_dir / "states.json"
+    dimension = load_state_dimension(states_path if states_path.exists() else DEFAULT_DATA_DIR / "states.json")
+    cube = build_cube(collect_indicators(data_dir, outputs, dimension), additive, load_regions(dimension))
+    text = json.dumps(cube, separators=(",", ":"))
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(text, encoding="utf-8")
+    print(f"Wrote {output_path} ({len(cube['indicators'])} indicators, {len(text.encode('utf-8')) / 1024:.1f} KB)")
+    return len(text.encode("utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompute ranks, shares, growth and region rollups for every dataset indicator."
+    )
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Path to manifest.json.")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Directory with the dataset JSON.")
+    parser.add_argument("--output", type=Path, help="Output path (defaults to <data-dir>/cube.json).")
+    args = parser.parse_args()
+
+    write_cube(args.data_dir, args.output or args.data_dir / "cube.json", args.manifest)
+
+
+if __name__ == "__main__":
+    main()
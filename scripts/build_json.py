@@ -3,9 +3,27 @@ import argparse
 import csv
 import json
 import re
+from itertools import zip_longest
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import numpy as np
+
+from build_cube import write_cube
+from build_state import BuildState, code_version, file_digest, fingerprint, load_output, print_rebuild_summary
+from column_engine import (
+    ColumnTable,
+    aggregate_fields,
+    columns_from_records,
+    compute_national_columns,
+    extended_aggregates,
+    parse_numeric_column,
+)
+from release_assets import add_release_arguments, print_release_report, write_release
+from snapshots import add_snapshot_arguments, print_snapshot_report, write_snapshot
+from stage_trace import add_profile_argument, count, finish_profile, span, start_tracing
+from state_dimension import STATES_PATH, load_state_dimension
+
 
 def normalize_header(value: str) -> str:
     return re.sub(r"[^a-z0-9]+", " ", value.lower()).strip()
@@ -37,13 +55,18 @@ def load_csv(path: Path) -> List[List[str]]:
         return [row for row in reader if any(cell.strip() for cell in row)]
 
 
-def find_column_index(headers: List[str], column_def: Dict[str, object]) -> Optional[int]:
+def find_column_index(
+    headers: List[str],
+    column_def: Dict[str, object],
+    normalized_headers: Optional[List[str]] = None,
+) -> Optional[int]:
     if "index" in column_def:
         return int(column_def["index"])
     tokens = column_def.get("source", [])
     if isinstance(tokens, str):
         tokens = [tokens]
-    normalized_headers = [normalize_header(header) for header in headers]
+    if normalized_headers is None:
+        normalized_headers = [normalize_header(header) for header in headers]
     for index, header in enumerate(normalized_headers):
         if all(normalize_header(str(token)) in header for token in tokens):
             return index
@@ -56,6 +79,7 @@ def build_rows(
     numeric_fields: List[str],
     header_row: int,
 ) -> List[Dict[str, object]]:
+    dimension = load_state_dimension()
     headers = rows[header_row]
     indices = {key: find_column_index(headers, column_def) for key, column_def in columns.items()}
     data_rows = []
@@ -73,10 +97,62 @@ def build_rows(
         state_value = record.get("state")
         if not state_value or str(state_value).lower().startswith("total"):
             continue
+        record["state"] = dimension.canonical_name(str(state_value))
         data_rows.append(record)
     return data_rows
 
 
+def build_columns(
+    rows: List[List[str]],
+    columns: Dict[str, Dict[str, object]],
+    numeric_fields: List[str],
+    header_row: int,
+) -> ColumnTable:
+    # Column-at-a-time build_rows: the same records, but each configured
+    # column is transposed once and parsed in vectorized passes.
+    dimension = load_state_dimension()
+    headers = rows[header_row]
+    normalized_headers = [normalize_header(header) for header in headers]
+    indices = {
+        key: find_column_index(headers, column_def, normalized_headers) for key, column_def in columns.items()
+    }
+    body = rows[header_row + 1 :]
+    lengths = np.fromiter(map(len, body), dtype=np.int64, count=len(body))
+    width = int(lengths.max(initial=0))
+    transposed = list(zip_longest(*body, fillvalue="")) if body else []
+
+    def cells(index: Optional[int]) -> np.ndarray:
+        if index is None or index >= width:
+            return np.full(len(body), "", dtype=np.str_)
+        return np.array(transposed[index], dtype=np.str_)
+
+    state_index = indices.get("state")
+    if state_index is None:
+        keep = np.zeros(len(body), dtype=bool)
+    else:
+        states = np.strings.strip(cells(state_index))
+        keep = (states != "") & ~np.strings.startswith(np.strings.lower(states), "total")
+
+    numeric = {}
+    text: Dict[str, List[Optional[str]]] = {}
+    for key, index in indices.items():
+        column = cells(index)[keep]
+        if key in numeric_fields:
+            numeric[key] = parse_numeric_column(column)
+            continue
+        stripped = np.strings.strip(column)
+        if key == "state":
+            # Resolve each distinct spelling once; kept rows always have a state.
+            names, inverse = np.unique(stripped, return_inverse=True)
+            canonical = np.array([dimension.canonical_name(name) for name in names.tolist()], dtype=object)
+            text[key] = canonical[inverse].tolist()
+            continue
+        values = stripped.astype(object)
+        values[lengths[keep] <= (index if index is not None else -1)] = None
+        text[key] = values.tolist()
+    return ColumnTable(int(keep.sum()), list(columns), numeric, text)
+
+
 def compute_national(data: List[Dict[str, object]], config: Dict[str, object]) -> Dict[str, object]:
     national: Dict[str, object] = {}
     for key, field in (config.get("sum") or {}).items():
@@ -85,6 +161,9 @@ def compute_national(data: List[Dict[str, object]], config: Dict[str, object]) -
     for key, field in (config.get("avg") or {}).items():
         values = [row.get(field) for row in data if isinstance(row.get(field), (int, float))]
         national[key] = round(sum(values) / len(values), 2) if values else 0
+    fields = aggregate_fields(config)
+    if fields:
+        national.update(extended_aggregates(columns_from_records(data, fields), config))
     national.update(config.get("static", {}) or {})
     return national
 
@@ -93,12 +172,45 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Build JSON datasets from cleaned CSV tables.")
     parser.add_argument("--manifest", type=Path, required=True, help="Path to manifest.json.")
     parser.add_argument("--output-dir", type=Path, default=Path("src/data"), help="Output directory.")
+    parser.add_argument(
+        "--cube",
+        action="store_true",
+        help="Also write the precomputed rank/share/growth/region cube to <output-dir>/cube.json.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every dataset even if its CSV and manifest entry are unchanged since the last run.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["columns", "rows"],
+        default="rows",
+        help="Build one dict per row (rows) or parse each CSV column into NumPy arrays (columns).",
+    )
+    add_release_arguments(parser)
+    add_snapshot_arguments(parser)
+    add_profile_argument(parser, "build_json")
     args = parser.parse_args()
 
+    if args.profile:
+        start_tracing()
+
     manifest = json.loads(args.manifest.read_text(encoding="utf-8"))
     datasets = manifest.get("datasets", [])
     output_dir = args.output_dir
     output_dir.mkdir(parents=True, exist_ok=True)
+    release_payloads: Dict[str, object] = {}
+    build_state = BuildState(output_dir)
+    scripts_dir = Path(__file__).resolve().parent
+    code = code_version(
+        scripts_dir / "build_json.py",
+        scripts_dir / "column_engine.py",
+        scripts_dir / "state_dimension.py",
+        STATES_PATH,
+    )
+    rebuilt: List[str] = []
+    reused: List[str] = []
 
     for dataset in datasets:
         csv_path_value = dataset.get("csv")
@@ -110,11 +222,27 @@ def main() -> None:
             print(f"Skipping {dataset.get('name', 'unknown')}: csv not found at {csv_path}")
             continue
 
-        rows = load_csv(csv_path)
+        output_name = dataset.get("output", f"{dataset.get('name', 'dataset')}.json")
+        current = fingerprint({"dataset": dataset, "csv": file_digest(csv_path), "code": code})
+        if not args.force and build_state.is_fresh(output_name, current, [output_name]):
+            release_payloads[output_name] = load_output(output_dir, output_name)
+            reused.append(output_name)
+            continue
+
+        with span("load_csv", "io", csv=csv_path.name):
+            rows = load_csv(csv_path)
+            count("rows", len(rows))
         header_row = int(dataset.get("header_row", 0))
         columns = dataset.get("columns", {})
         numeric_fields = dataset.get("numeric_fields") or [key for key in columns if key != "state"]
-        data_rows = build_rows(rows, columns, numeric_fields, header_row)
+        table = None
+        with span("build_rows", dataset=output_name, engine=args.engine):
+            if args.engine == "columns":
+                table = build_columns(rows, columns, numeric_fields, header_row)
+                data_rows = table.to_records()
+            else:
+                data_rows = build_rows(rows, columns, numeric_fields, header_row)
+            count("rows", len(data_rows))
 
         payload: Dict[str, object] = {
             "title": dataset.get("title", dataset.get("name", "")),
@@ -127,12 +255,39 @@ def main() -> None:
             payload["unit"] = dataset["unit"]
         national_config = dataset.get("national", {})
         if national_config:
-            payload["national"] = compute_national(data_rows, national_config)
+            with span("compute_national", dataset=output_name):
+                if table is not None:
+                    payload["national"] = compute_national_columns(table, national_config)
+                else:
+                    payload["national"] = compute_national(data_rows, national_config)
 
-        output_file = output_dir / dataset.get("output", f"{dataset.get('name', 'dataset')}.json")
-        output_file.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        output_file = output_dir / output_name
+        with span("write_json", "write", output=output_name):
+            text = json.dumps(payload, indent=2)
+            count("bytes", len(text))
+            output_file.write_text(text, encoding="utf-8")
+        release_payloads[output_name] = payload
+        build_state.record(output_name, current, [output_name])
+        rebuilt.append(output_name)
         print(f"Wrote {output_file}")
 
+    build_state.save()
+    print_rebuild_summary(rebuilt, reused, args.force)
+
+    if args.cube:
+        with span("write_cube", "write"):
+            write_cube(output_dir, output_dir / "cube.json", args.manifest)
+        release_payloads["cube.json"] = json.loads((output_dir / "cube.json").read_text(encoding="utf-8"))
+    if args.release:
+        with span("write_release", "write"):
+            report = write_release(release_payloads, args.release_dir)
+        print_release_report(report, args.release_dir)
+    if args.snapshot:
+        with span("write_snapshot", "write"):
+            snapshot_report = write_snapshot(release_payloads, args.snapshot, args.snapshot_dir)
+        print_snapshot_report(snapshot_report, args.snapshot_dir)
+    finish_profile(args.profile)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+import argparse
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from state_dimension import load_state_dimension
+
+
+PUBLIC_DIR = Path(__file__).resolve().parent.parent / "public"
+DEFAULT_INPUT = PUBLIC_DIR / "india-states.json"
+
+# name -> (Douglas-Peucker tolerance in degrees, quantization grid size).
+# IndiaMap draws India at Mercator scale 1000, where a degree is ~17px:
+# 0.1 degrees stays under 2px at zoom 1, and 0.02 under 2px at 5x zoom.
+# The source grid is ~20,000 cells wide, so finer grids add no detail.
+LEVELS: Dict[str, Tuple[float, int]] = {
+    "overview": (0.1, 10000),
+    "detail": (0.02, 20000),
+}
+# Arcs in a crossing are re-simplified at half the tolerance, this many
+# times, before they fall back to their original points.
+REFINE_STEPS = 4
+# Side of the spatial hash cells used to find crossings, in grid units.
+CELL_SIZE = 64
+
+Point = Tuple[float, float]
+Arc = List[Point]
+
+
+def decode_arcs(topology: Dict[str, object]) -> List[Arc]:
+    transform = topology.get("transform")
+    arcs: List[Arc] = []
+    for encoded in topology["arcs"]:
+        if not transform:
+            arcs.append([(float(x), float(y)) for x, y, *_ in encoded])
+            continue
+        (scale_x, scale_y), (translate_x, translate_y) = transform["scale"], transform["translate"]
+        x = y = 0
+        arc = []
+        for dx, dy, *_ in encoded:
+            x += dx
+            y += dy
+            arc.append((x * scale_x + translate_x, y * scale_y + translate_y))
+        arcs.append(arc)
+    return arcs
+
+
+def geometry_rings(geometry: Dict[str, object]) -> List[List[List[int]]]:
+    # Polygons as lists of rings, each ring a list of arc references.
+    if geometry["type"] == "Polygon":
+        return [geometry["arcs"]]
+    if geometry["type"] == "MultiPolygon":
+        return list(geometry["arcs"])
+    return []
+
+
+def ring_points(arcs: Sequence[Arc], refs: List[int]) -> List[Point]:
+    points: List[Point] = []
+    for ref in refs:
+        arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+        points.extend(arc[1:] if points else arc)
+    return points
+
+
+def simplify(points: Arc, tolerance: float) -> Arc:
+    # Douglas-Peucker with fixed endpoints. Arcs meet only at their
+    # endpoints, so shared borders stay shared after simplification; it can
+    # still make arcs cross, which build_level checks for.
+    if len(points) <= 2 or tolerance <= 0:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    tolerance_sq = tolerance * tolerance
+    while stack:
+        first, last = stack.pop()
+        (x1, y1), (x2, y2) = points[first], points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length_sq = dx * dx + dy * dy
+        farthest, farthest_sq = -1, tolerance_sq
+        for index in range(first + 1, last):
+            px, py = points[index]
+            if length_sq == 0:
+                distance_sq = (px - x1) ** 2 + (py - y1) ** 2
+            else:
+                cross = dx * (py - y1) - dy * (px - x1)
+                distance_sq = cross * cross / length_sq
+            if distance_sq > farthest_sq:
+                farthest, farthest_sq = index, distance_sq
+        if farthest > 0:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def bounds(arcs: Sequence[Arc]) -> Tuple[float, float, float, float]:
+    xs = [x for arc in arcs for x, _ in arc]
+    ys = [y for arc in arcs for _, y in arc]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def quantize_arc(arc: Arc, box: Tuple[float, float, float, float], size: int) -> List[Tuple[int, int]]:
+    x0, y0, x1, y1 = box
+    kx = (size - 1) / (x1 - x0) if x1 > x0 else 1
+    ky = (size - 1) / (y1 - y0) if y1 > y0 else 1
+    quantized: List[Tuple[int, int]] = []
+    for x, y in arc:
+        point = (round((x - x0) * kx), round((y - y0) * ky))
+        if not quantized or point != quantized[-1]:
+            quantized.append(point)
+    if len(quantized) == 1:
+        quantized.append(quantized[0])
+    return quantized
+
+
+def orientation(a: Tuple[int, int], b: Tuple[int, int], c: Tuple[int, int]) -> int:
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def crossing_arcs(quantized: List[List[Tuple[int, int]]]) -> Set[int]:
+    # Arcs with a segment that properly crosses another segment (of another
+    # arc or the same one). Integer grid points make the test exact; segments
+    # that only touch at a shared vertex do not count.
+    cells: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    for index, arc in enumerate(quantized):
+        for position in range(len(arc) - 1):
+            (ax, ay), (bx, by) = arc[position], arc[position + 1]
+            for cx in range(min(ax, bx) // CELL_SIZE, max(ax, bx) // CELL_SIZE + 1):
+                for cy in range(min(ay, by) // CELL_SIZE, max(ay, by) // CELL_SIZE + 1):
+                    cells.setdefault((cx, cy), []).append((index, position))
+    crossing: Set[int] = set()
+    checked: Set[Tuple[Tuple[int, int], Tuple[int, int]]] = set()
+    for segments in cells.values():
+        for i, first in enumerate(segments):
+            a, b = quantized[first[0]][first[1]], quantized[first[0]][first[1] + 1]
+            for second in segments[i + 1 :]:
+                if (first, second) in checked:
+                    continue
+                checked.add((first, second))
+                c, d = quantized[second[0]][second[1]], quantized[second[0]][second[1] + 1]
+                if (
+                    orientation(a, b, c) * orientation(a, b, d) < 0
+                    and orientation(c, d, a) * orientation(c, d, b) < 0
+                ):
+                    crossing.update((first[0], second[0]))
+    return crossing
+
+
+def delta_encode(arc: List[Tuple[int, int]]) -> List[List[int]]:
+    encoded = []
+    previous_x = previous_y = 0
+    for x, y in arc:
+        encoded.append([x - previous_x, y - previous_y])
+        previous_x, previous_y = x, y
+    return encoded
+
+
+def ring_area_centroid(ring: List[Point]) -> Tuple[float, float, float]:
+    area = cx = cy = 0.0
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+        cross = x1 * y2 - x2 * y1
+        area += cross
+        cx += (x1 + x2) * cross
+        cy += (y1 + y2) * cross
+    area /= 2
+    if area == 0:
+        xs, ys = zip(*ring)
+        return 0.0, sum(xs) / len(xs), sum(ys) / len(ys)
+    return area, cx / (6 * area), cy / (6 * area)
+
+
+def label_geometry(arcs: Sequence[Arc], polygons: List[List[List[int]]]) -> Dict[str, List[float]]:
+    # The label point is the area centroid of the largest polygon, so island
+    # groups are labelled on their main island rather than in the sea.
+    points = [point for polygon in polygons for ring in polygon for point in ring_points(arcs, ring)]
+    xs, ys = zip(*points)
+    largest: Optional[Tuple[float, float, float]] = None
+    for polygon in polygons:
+        rings = [ring_area_centroid(ring_points(arcs, ring)) for ring in polygon]
+        area = abs(rings[0][0]) - sum(abs(hole[0]) for hole in rings[1:])
+        if largest is None or area > largest[0]:
+            outer_area, cx, cy = rings[0]
+            hole_area = sum(abs(hole[0]) for hole in rings[1:])
+            if hole_area:
+                cx = (abs(outer_area) * cx - sum(abs(hole[0]) * hole[1] for hole in rings[1:])) / area
+                cy = (abs(outer_area) * cy - sum(abs(hole[0]) * hole[2] for hole in rings[1:])) / area
+            largest = (area, cx, cy)
+    return {
+        "centroid": [round(largest[1], 4), round(largest[2], 4)],
+        "bbox": [round(min(xs), 4), round(min(ys), 4), round(max(xs), 4), round(max(ys), 4)],
+    }
+
+
+def build_level(
+    topology: Dict[str, object],
+    arcs: List[Arc],
+    labels: Dict[int, Dict[str, object]],
+    tolerance: float,
+    size: int,
+) -> Tuple[Dict[str, object], Dict[str, int]]:
+    box = bounds(arcs)
+    rings = [
+        ring
+        for geometries in (obj.get("geometries", [obj]) for obj in topology["objects"].values())
+        for geometry in geometries
+        for polygon in geometry_rings(geometry)
+        for ring in polygon
+    ]
+    # Per-arc tolerance, lowered until the result keeps the topology: a ring
+    # needs three distinct vertices to stay a polygon, and no two arcs may
+    # cross. Rings that would collapse keep their original arcs (tolerance
+    # 0); arcs in a crossing are re-simplified at half the tolerance, up to
+    # REFINE_STEPS times, and then also keep their original points.
+    tolerances = [tolerance] * len(arcs)
+    quantized = [quantize_arc(simplify(arc, tolerance), box, size) for arc in arcs]
+    while True:
+        lowered: Dict[int, float] = {}
+        for ring in rings:
+            if len(set(ring_points(quantized, ring))) < 3:
+                lowered.update((ref if ref >= 0 else ~ref, 0.0) for ref in ring)
+        for index in crossing_arcs(quantized):
+            if index not in lowered and tolerances[index] > 0:
+                half = tolerances[index] / 2
+                lowered[index] = half if half >= tolerance / 2**REFINE_STEPS else 0.0
+        lowered = {index: value for index, value in lowered.items() if value < tolerances[index]}
+        if not lowered:
+            break
+        for index, value in lowered.items():
+            tolerances[index] = value
+            quantized[index] = quantize_arc(simplify(arcs[index], value), box, size)
+
+    x0, y0, x1, y1 = box
+    objects = {}
+    for name, obj in topology["objects"].items():
+        geometries = []
+        for index, geometry in enumerate(obj.get("geometries", [])):
+            output = {key: value for key, value in geometry.items() if key != "properties"}
+            output["properties"] = labels[index]
+            geometries.append(output)
+        objects[name] = dict(obj, geometries=geometries)
+    level = {
+        "type": "Topology",
+        "transform": {
+            "scale": [(x1 - x0) / (size - 1), (y1 - y0) / (size - 1)],
+            "translate": [x0, y0],
+        },
+        "objects": objects,
+        "arcs": [delta_encode(arc) for arc in quantized],
+    }
+    stats = {
+        "vertices": sum(len(arc) for arc in quantized),
+        "refined_arcs": sum(1 for value in tolerances if 0 < value < tolerance),
+        "protected_arcs": sum(1 for value in tolerances if value == 0),
+        "crossing_arcs": len(crossing_arcs(quantized)),
+    }
+    return level, stats
+
+
+def state_labels(topology: Dict[str, object], arcs: List[Arc]) -> Dict[int, Dict[str, object]]:
+    dimension = load_state_dimension()
+    labels: Dict[int, Dict[str, object]] = {}
+    for obj in topology["objects"].values():
+        for index, geometry in enumerate(obj.get("geometries", [])):
+            name = geometry.get("properties", {}).get("st_nm", "")
+            properties: Dict[str, object] = {"st_nm": name}
+            code = dimension.code(name)
+            if code:
+                properties["code"] = code
+            polygons = geometry_rings(geometry)
+            if polygons:
+                properties.update(label_geometry(arcs, polygons))
+            labels[index] = properties
+    return labels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Simplify and quantize the India state topology into per-zoom map files with label points."
+    )
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT, help="Source TopoJSON topology.")
+    parser.add_argument("--output-dir", type=Path, default=PUBLIC_DIR, help="Where to write the map levels.")
+    parser.add_argument(
+        "--level",
+        action="append",
+        metavar="NAME:TOLERANCE:GRID",
+        help="Custom level, e.g. overview:0.1:10000 (repeatable; replaces the default levels).",
+    )
+    args = parser.parse_args()
+
+    levels = LEVELS
+    if args.level:
+        levels = {}
+        for spec in args.level:
+            name, tolerance, size = spec.split(":")
+            levels[name] = (float(tolerance), int(size))
+
+    source_text = args.input.read_text(encoding="utf-8")
+    topology = json.loads(source_text)
+    if topology.get("type") != "Topology":
+        raise SystemExit(f"{args.input} is not a TopoJSON topology")
+    arcs = decode_arcs(topology)
+    labels = state_labels(topology, arcs)
+
+    source_bytes = len(source_text.encode("utf-8"))
+    source_vertices = sum(len(arc) for arc in arcs)
+    print(f"{args.input.name}: {source_bytes / 1024:.1f} KB, {source_vertices:,} vertices, {len(arcs):,} arcs")
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    stem = args.input.name.removesuffix(".json")
+    for name, (tolerance, size) in levels.items():
+        level, stats = build_level(topology, arcs, labels, tolerance, size)
+        text = json.dumps(level, separators=(",", ":"))
+        output_path = args.output_dir / f"{stem}.{name}.json"
+        output_path.write_text(text, encoding="utf-8")
+        size_bytes = len(text.encode("utf-8"))
+        gzip_bytes = len(gzip.compress(text.encode("utf-8"), 9))
+        print(
+            f"  {name:9} tolerance {tolerance:g}, grid {size:,}: {size_bytes / 1024:7.1f} KB "
+            f"({size_bytes / source_bytes:.0%}), gzip {gzip_bytes / 1024:6.1f} KB, "
+            f"{stats['vertices']:,} vertices ({stats['vertices'] / source_vertices:.0%}), "
+            f"{stats['refined_arcs']} arcs refined, {stats['protected_arcs']} kept unsimplified, "
+            f"{stats['crossing_arcs']} still crossing -> {output_path}"
+        )
+
+
+if __name__ == "__main__":
+    main()
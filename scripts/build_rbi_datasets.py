@@ -1,30 +1,57 @@
 #!/usr/bin/env python3
+import argparse
 import json
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-
-import pdfplumber
-
-
-STATE_MAP = {
-    "andaman & nicobar": "Andaman and Nicobar Islands",
-    "andaman & nicobar islands": "Andaman and Nicobar Islands",
-    "andaman & nicobar island": "Andaman and Nicobar Islands",
-    "andaman and nicobar": "Andaman and Nicobar Islands",
-    "andaman and nicobar island": "Andaman and Nicobar Islands",
-    "dadra & nagar haveli": "Dadra and Nagar Haveli and Daman and Diu",
-    "dadra & nagar haveli and daman & diu": "Dadra and Nagar Haveli and Daman and Diu",
-    "dadra and nagar haveli and daman and diu": "Dadra and Nagar Haveli and Daman and Diu",
-    "daman & diu and dadra &": "Dadra and Nagar Haveli and Daman and Diu",
-    "daman and diu and dadra and": "Dadra and Nagar Haveli and Daman and Diu",
-    "daman & diu": "Dadra and Nagar Haveli and Daman and Diu",
-    "jammu & kashmir": "Jammu and Kashmir",
-    "nct of delhi": "Delhi",
-    "delhi": "Delhi",
-    "orissa": "Odisha",
-    "pondicherry": "Puducherry",
-}
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from build_cube import write_cube
+from build_state import BuildState, code_version, fingerprint, load_output, print_rebuild_summary
+from page_analysis import iter_text_lines
+from pdf_cache import (
+    PageCache,
+    add_cache_arguments,
+    cache_from_args,
+    file_sha256,
+    finish_cache,
+    iter_page_results,
+)
+from release_assets import add_release_arguments, print_release_report, write_release
+from series_store import open_store, write_store
+from snapshots import add_snapshot_arguments, print_snapshot_report, write_snapshot
+from stage_trace import (
+    add_profile_argument,
+    count,
+    finish_profile,
+    span,
+    start_tracing,
+    submit_traced,
+    traced_result,
+)
+from state_dimension import STATES_PATH, STATE_ALIASES, load_state_dimension
+from text_backends import DEFAULT_TEXT_BACKEND, TEXT_BACKENDS, text_settings
+
+
+Series = Tuple[List[str], Dict[str, List[Optional[float]]]]
+
+DEFAULT_MANIFEST = Path(__file__).resolve().parent / "manifest.json"
+
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}(?:-\d{2})?\b")
+LINE_SPLIT_RE = re.compile(r"(\D*)(.*)", re.DOTALL)
+NUMBER_RE = re.compile(r"\d[\d,]*\.?\d*")
+DASH_SPLIT_RE = re.compile(r"\s-+")
+
+LINE_HEADER = "header"
+LINE_RESET = "reset"
+LINE_SKIP = "skip"
+LINE_NAME = "name"
+LINE_DASH_NAME = "dash_name"
+LINE_ROW = "row"
 
 SKIP_PREFIXES = (
     "table",
@@ -51,41 +78,47 @@ def normalize_state_name(name: str) -> str:
     cleaned = re.sub(r"(?:\s-+\s*)+$", "", cleaned)
     cleaned = re.sub(r"\s+", " ", cleaned)
     lowered = cleaned.lower()
-    if lowered in STATE_MAP:
-        return STATE_MAP[lowered]
+    if lowered in STATE_ALIASES:
+        return STATE_ALIASES[lowered]
     cleaned = cleaned.replace("&", "and")
     cleaned = re.sub(r"\s+and\s+", " and ", cleaned)
     cleaned = re.sub(r"\s+", " ", cleaned).strip()
     return cleaned
 
 
-def parse_years(line: str) -> List[str]:
-    tokens = re.findall(r"\b(?:19|20)\d{2}(?:-\d{2})?\b", line)
-    return tokens
-
-
-def parse_numbers(text: str) -> List[Optional[float]]:
-    numbers = []
-    for token in re.findall(r"-|\d[\d,]*\.?\d*", text):
-        token = token.strip()
-        if token in {"-", ""}:
-            continue
-        value = token.replace(",", "")
-        try:
-            num = float(value)
-        except ValueError:
-            continue
-        numbers.append(num)
-    return numbers
-
-
-def extract_lines(pdf_path: Path) -> List[str]:
-    lines: List[str] = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            lines.extend(text.splitlines())
-    return lines
+@lru_cache(maxsize=4096)
+def canonical_state_name(name: str) -> str:
+    normalized = normalize_state_name(name)
+    if "region" in normalized.lower():
+        return ""
+    return load_state_dimension().canonical_name(normalized)
+
+
+def iter_page_lines(
+    pdf_path: Path,
+    cache: Optional[PageCache] = None,
+    backend: str = DEFAULT_TEXT_BACKEND,
+) -> Iterator[List[str]]:
+    if backend == DEFAULT_TEXT_BACKEND:
+        # Parsing needs no tables, so pdfplumber pages skip table finding,
+        # but reuse the shared analysis where extract_tables or page_index
+        # has already cached one.
+        for _, page_lines in iter_text_lines(pdf_path, cache):
+            yield page_lines
+        return
+    document_type, extract_page = TEXT_BACKENDS[backend]
+    for _, page_lines in iter_page_results(
+        pdf_path, "text", text_settings(backend), extract_page, cache, document_type=document_type
+    ):
+        yield page_lines
+
+
+def extract_lines(
+    pdf_path: Path,
+    cache: Optional[PageCache] = None,
+    backend: str = DEFAULT_TEXT_BACKEND,
+) -> List[str]:
+    return [line for page_lines in iter_page_lines(pdf_path, cache, backend) for line in page_lines]
 
 
 def year_sort_key(year: str) -> int:
@@ -94,91 +127,157 @@ def year_sort_key(year: str) -> int:
     return int(year)
 
 
-def parse_state_series(pdf_path: Path) -> Tuple[List[str], Dict[str, List[Optional[float]]]]:
-    lines = extract_lines(pdf_path)
-    header_years: List[str] = []
-    all_years: List[str] = []
-    rows: Dict[str, Dict[str, Optional[float]]] = {}
-    pending_name = ""
-
-    for line in lines:
-        line = " ".join(line.split())
-        if not line:
-            continue
-        lowered = line.lower()
-        years = parse_years(line)
-        if years and len(years) >= 3:
-            header_years = years
-            pending_name = ""
-            for year in years:
-                if year not in all_years:
-                    all_years.append(year)
-            continue
-        if lowered.startswith(SKIP_PREFIXES):
-            pending_name = ""
-            continue
-        if "all india" in lowered or "all-india" in lowered:
-            pending_name = ""
-            continue
-        if "state/union territory" in lowered or "region/state/union" in lowered:
-            pending_name = ""
-            continue
-
-        if not any(ch.isdigit() for ch in line):
-            if lowered in SKIP_LINES or lowered.startswith("and daman"):
-                continue
-            if "-" in line and header_years:
-                name_part = re.split(r"\s-+", line)[0].strip()
-                name = normalize_state_name(name_part)
-                if name and "region" not in name.lower():
-                    rows.setdefault(name, {})
-                continue
-            pending_name = (pending_name + " " + line).strip()
-            continue
-
-        first_digit = re.search(r"\d", line)
-        if not first_digit:
-            continue
-        idx = first_digit.start()
-        name_part = line[:idx].strip()
-        values_part = line[idx:].strip()
-
-        if not name_part and pending_name:
-            name_part = pending_name
-            pending_name = ""
-        elif pending_name:
-            name_part = f"{pending_name} {name_part}".strip()
-            pending_name = ""
-
-        if not name_part:
-            continue
-
-        values = parse_numbers(values_part)
-        if not header_years:
-            continue
-        if len(values) < len(header_years):
-            values = [None] * (len(header_years) - len(values)) + values
-        if len(values) > len(header_years):
-            values = values[: len(header_years)]
-
-        name = normalize_state_name(name_part)
-        if not name or "region" in name.lower():
-            continue
-        rows.setdefault(name, {})
-        for year, value in zip(header_years, values):
-            if value is None:
+def classify_line(line: str) -> Tuple[str, object]:
+    name_part, values_part = LINE_SPLIT_RE.match(line).groups()
+    if values_part and len(YEAR_RE.findall(line, len(name_part))) >= 3:
+        return LINE_HEADER, YEAR_RE.findall(line)
+
+    lowered = line.lower()
+    if lowered.startswith(SKIP_PREFIXES):
+        return LINE_RESET, None
+    if "all india" in lowered or "all-india" in lowered:
+        return LINE_RESET, None
+    if "state/union territory" in lowered or "region/state/union" in lowered:
+        return LINE_RESET, None
+
+    if not values_part:
+        if lowered in SKIP_LINES or lowered.startswith("and daman"):
+            return LINE_SKIP, None
+        if "-" in line:
+            return LINE_DASH_NAME, DASH_SPLIT_RE.split(line)[0].strip()
+        return LINE_NAME, line
+
+    numbers = [float(token.replace(",", "")) for token in NUMBER_RE.findall(values_part)]
+    return LINE_ROW, (name_part.strip(), numbers)
+
+
+class StateSeriesParser:
+    # Resumable form of the line parser: feed() takes any run of lines (one
+    # page at a time, say) and carries pending names and the current header
+    # across calls, so the result is the same however the lines are split.
+    def __init__(self) -> None:
+        self.header_years: List[str] = []
+        self.all_years: List[str] = []
+        self.rows: Dict[str, Dict[str, Optional[float]]] = {}
+        self.pending_name = ""
+        self.closed_years: Set[str] = set()
+
+    def feed(self, lines: Iterable[str]) -> None:
+        header_years = self.header_years
+        all_years = self.all_years
+        rows = self.rows
+        pending_name = self.pending_name
+
+        for line in lines:
+            line = " ".join(line.split())
+            if not line:
                 continue
-            if year in rows[name]:
-                rows[name][year] += value
-            else:
-                rows[name][year] = value
-
-    sorted_years = sorted(all_years, key=year_sort_key)
-    normalized_rows: Dict[str, List[Optional[float]]] = {}
-    for name, year_map in rows.items():
-        normalized_rows[name] = [year_map.get(year) for year in sorted_years]
-
-    return sorted_years, normalized_rows
+            kind, payload = classify_line(line)
+            if kind == LINE_ROW:
+                name_part, values = payload
+                if not name_part and pending_name:
+                    name_part = pending_name
+                    pending_name = ""
+                elif pending_name:
+                    name_part = f"{pending_name} {name_part}".strip()
+                    pending_name = ""
+                if not name_part or not header_years:
+                    continue
+                width = len(header_years)
+                if len(values) < width:
+                    values = [None] * (width - len(values)) + values
+                elif len(values) > width:
+                    values = values[:width]
+                name = canonical_state_name(name_part)
+                if not name:
+                    continue
+                year_map = rows.setdefault(name, {})
+                for year, value in zip(header_years, values):
+                    if value is None:
+                        continue
+                    if year in year_map:
+                        year_map[year] += value
+                    else:
+                        year_map[year] = value
+            elif kind == LINE_NAME:
+                pending_name = (pending_name + " " + payload).strip()
+            elif kind == LINE_HEADER:
+                # A header for other years starts the next block, so every
+                # state row of the current one has been seen. Continuation
+                # pages repeat the same header and keep the block open.
+                if header_years and payload != header_years:
+                    self.closed_years.update(header_years)
+                header_years = payload
+                pending_name = ""
+                for year in header_years:
+                    if year not in all_years:
+                        all_years.append(year)
+            elif kind == LINE_RESET:
+                pending_name = ""
+            elif kind == LINE_DASH_NAME:
+                if header_years:
+                    name = canonical_state_name(payload)
+                    if name:
+                        rows.setdefault(name, {})
+                else:
+                    pending_name = (pending_name + " " + line).strip()
+
+        self.header_years = header_years
+        self.pending_name = pending_name
+
+    def complete(self, years: Iterable[str]) -> bool:
+        return self.closed_years.issuperset(years)
+
+    def result(self) -> Series:
+        sorted_years = sorted(self.all_years, key=year_sort_key)
+        normalized_rows: Dict[str, List[Optional[float]]] = {}
+        for name, year_map in self.rows.items():
+            normalized_rows[name] = [year_map.get(year) for year in sorted_years]
+        return sorted_years, normalized_rows
+
+
+def parse_state_lines(lines: Iterable[str]) -> Series:
+    parser = StateSeriesParser()
+    parser.feed(lines)
+    return parser.result()
+
+
+def parse_state_series(
+    pdf_path: Path,
+    cache: Optional[PageCache] = None,
+    backend: str = DEFAULT_TEXT_BACKEND,
+    stop_after_years: Optional[Iterable[str]] = None,
+) -> Series:
+    # With stop_after_years, reading stops at the first page boundary after
+    # the blocks holding all of those years have closed, i.e. once the next
+    # block's header has been read; later pages are never extracted. This
+    # assumes each year block is contiguous. Years missing from the table,
+    # or held by the last block, mean a full read.
+    target = list(stop_after_years) if stop_after_years else []
+    parser = StateSeriesParser()
+    with span("parse_state_series", "pdf", pdf=pdf_path.name):
+        with closing(iter_page_lines(pdf_path, cache, backend)) as pages:
+            for page_lines in pages:
+                with span("parse_state_lines"):
+                    parser.feed(page_lines)
+                    count("lines", len(page_lines))
+                if target and parser.complete(target):
+                    count("early_exit")
+                    break
+        series = parser.result()
+        count("rows", len(series[1]))
+    return series
+
+
+def timed_parse(
+    pdf_path: Path,
+    cache: Optional[PageCache] = None,
+    backend: str = DEFAULT_TEXT_BACKEND,
+    stop_after_years: Optional[Iterable[str]] = None,
+) -> Tuple[Series, float]:
+    start = time.perf_counter()
+    series = parse_state_series(pdf_path, cache, backend, stop_after_years)
+    return series, time.perf_counter() - start
 
 
 def pick_year_value(values: List[Optional[float]], years: List[str], target: str) -> Optional[float]:
@@ -188,213 +287,524 @@ def pick_year_value(values: List[Optional[float]], years: List[str], target: str
     return values[-1] if values else None
 
 
-def build_gdp_dataset(pdf_dir: Path) -> Dict[str, object]:
-    gdp_year = "2016-17"
-    gdp_prev_year = "2015-16"
-    per_capita_year = "2016-17"
-
-    gdp_years, gdp_rows = parse_state_series(pdf_dir / "21T_11122025D994949B48C44B68B4465FBB9ADDFF3D.PDF")
-    per_years, per_rows = parse_state_series(pdf_dir / "19T_11122025B8CC230E4A34431999B4D6A107707BCA.PDF")
-
-    data = []
-    for state, series in gdp_rows.items():
-        gsdp_lakh = pick_year_value(series, gdp_years, gdp_year)
-        gsdp_prev = pick_year_value(series, gdp_years, gdp_prev_year)
-        if gsdp_lakh is None:
+def load_graph(manifest_path: Path, pdf_dir: Optional[Path] = None) -> Tuple[Dict[str, Path], List[Dict[str, object]]]:
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if pdf_dir is None:
+        pdf_dir = (manifest_path.parent / manifest.get("pdf_dir", "../../pdfs")).resolve()
+    tables = {name: pdf_dir / str(spec["pdf"]) for name, spec in manifest.get("tables", {}).items()}
+    datasets = manifest.get("series_datasets", [])
+    for dataset in datasets:
+        missing = [table for table in dataset_tables(dataset) if table not in tables]
+        if missing:
+            raise ValueError(f"{dataset.get('name', 'dataset')}: unknown tables {', '.join(missing)}")
+    return tables, datasets
+
+
+def dataset_tables(dataset: Dict[str, object]) -> List[str]:
+    names = [str(dataset["rows_from"])]
+    names.extend(str(field["table"]) for field in dataset.get("fields", []) if "table" in field)
+    return list(dict.fromkeys(names))
+
+
+def stop_years(datasets: List[Dict[str, object]], tables: Dict[str, Path]) -> Dict[Path, Set[str]]:
+    # The years each PDF is read at by single-year builds. A PDF that any
+    # dataset uses without a year (only for its rows) gets no entry.
+    needed: Dict[Path, Set[str]] = {}
+    unbounded: Set[Path] = set()
+    for dataset in datasets:
+        read = {str(dataset["rows_from"])}
+        for field in dataset.get("fields", []):
+            if "table" not in field:
+                continue
+            read.add(str(field["table"]))
+            path = tables[str(field["table"])]
+            needed.setdefault(path, set()).add(str(field["year"]))
+            if "base_year" in field:
+                needed[path].add(str(field["base_year"]))
+        for name in read:
+            if tables[name] not in needed:
+                unbounded.add(tables[name])
+    return {path: years for path, years in needed.items() if path not in unbounded}
+
+
+def lookup_value(series: Series, state: str, year: str) -> Optional[float]:
+    years, rows = series
+    if state not in rows:
+        return None
+    return pick_year_value(rows[state], years, year)
+
+
+def convert_value(value: Optional[float], field: Dict[str, object]) -> Optional[float]:
+    if value is None:
+        return None
+    if "multiply" in field:
+        value = value * field["multiply"]
+    if "divide" in field:
+        value = value / field["divide"]
+    if "round" in field:
+        value = round(value, int(field["round"]))
+    if field.get("cast") == "int":
+        value = int(value)
+    return value
+
+
+def derive_growth(current: Optional[float], previous: Optional[float]) -> Optional[float]:
+    if current is None or not previous:
+        return None
+    return ((current - previous) / previous) * 100
+
+
+def build_series_dataset(dataset: Dict[str, object], tables: Dict[str, Series]) -> Dict[str, object]:
+    fields: List[Dict[str, object]] = dataset.get("fields", [])
+    records: List[Dict[str, object]] = []
+    for state in tables[dataset["rows_from"]][1]:
+        record: Dict[str, object] = {"state": state}
+        for field in fields:
+            name = field["name"]
+            derive = field.get("derive")
+            if derive == "share":
+                record[name] = None
+            elif derive == "sum":
+                parts = [record.get(part) for part in field["fields"]]
+                record[name] = sum(parts) if all(part is not None for part in parts) else None
+            elif derive == "growth":
+                series = tables[field["table"]]
+                current = lookup_value(series, state, field["year"])
+                previous = lookup_value(series, state, field["base_year"])
+                record[name] = convert_value(derive_growth(current, previous), field)
+            else:
+                value = lookup_value(tables[field["table"]], state, field["year"])
+                if value is None and field.get("required"):
+                    break
+                record[name] = convert_value(value, field)
+        else:
+            records.append(record)
+
+    for field in fields:
+        if field.get("derive") != "share":
             continue
-        per_capita = None
-        if state in per_rows:
-            per_capita = pick_year_value(per_rows[state], per_years, per_capita_year)
-        gsdp_crore = gsdp_lakh / 100 if gsdp_lakh is not None else None
-        growth = None
-        if gsdp_prev and gsdp_prev != 0:
-            growth = ((gsdp_lakh - gsdp_prev) / gsdp_prev) * 100
-
-        data.append(
-            {
-                "state": state,
-                "gsdp": round(gsdp_crore, 2) if gsdp_crore is not None else None,
-                "growth": round(growth, 2) if growth is not None else None,
-                "perCapita": int(per_capita) if per_capita is not None else None,
-            }
-        )
-
-    totals = [row["gsdp"] for row in data if isinstance(row.get("gsdp"), (int, float))]
-    growths = [row["growth"] for row in data if isinstance(row.get("growth"), (int, float))]
-    per_caps = [row["perCapita"] for row in data if isinstance(row.get("perCapita"), (int, float))]
-
-    return {
-        "title": "Gross State Domestic Product (Current Prices)",
-        "description": "Gross State Domestic Product at current prices (₹ Crore)",
-        "source": "RBI Handbook of Statistics on Indian States, 2024-25",
-        "year": gdp_year,
-        "unit": "₹ Crore",
-        "data": sorted(data, key=lambda d: d["gsdp"] or 0, reverse=True),
-        "national": {
-            "totalGDP": round(sum(totals), 2) if totals else 0,
-            "avgGrowth": round(sum(growths) / len(growths), 2) if growths else 0,
-            "avgPerCapita": round(sum(per_caps) / len(per_caps), 2) if per_caps else 0,
-        },
+        of = field["of"]
+        total = sum(record[of] for record in records if record[of] is not None)
+        for record in records:
+            if record[of] is None:
+                continue
+            record[field["name"]] = convert_value((record[of] / total) * 100, field) if total else 0
+
+    national = {aggregate["name"]: compute_aggregate(records, aggregate) for aggregate in dataset.get("national", [])}
+
+    hidden = {field["name"] for field in fields if field.get("emit") is False}
+    data = [{key: value for key, value in record.items() if key not in hidden} for record in records]
+    sort = dataset.get("sort")
+    if sort:
+        data = sorted(data, key=lambda row: row.get(sort["field"]) or 0, reverse=bool(sort.get("reverse")))
+
+    payload: Dict[str, object] = dict(dataset.get("meta", {}))
+    payload["data"] = data
+    payload["national"] = national
+    return payload
+
+
+def compute_aggregate(records: List[Dict[str, object]], aggregate: Dict[str, object]) -> object:
+    op = aggregate["op"]
+    values = [record.get(aggregate["field"]) for record in records]
+    values = [value for value in values if isinstance(value, (int, float))]
+    if op == "growth":
+        previous = [record.get(aggregate["base"]) for record in records]
+        previous_total = sum(value for value in previous if isinstance(value, (int, float)))
+        current_total = sum(values)
+        result = ((current_total - previous_total) / previous_total) * 100 if previous_total else 0
+        return convert_value(result, aggregate)
+    if not values:
+        return 0
+    if op == "sum":
+        return convert_value(sum(values), aggregate)
+    if op == "avg":
+        return convert_value(sum(values) / len(values), aggregate)
+    raise ValueError(f"Unknown national aggregate op: {op}")
+
+
+def build_series_payload(dataset: Dict[str, object], tables: Dict[str, Series]) -> Dict[str, object]:
+    years, rows = tables[dataset["rows_from"]]
+    states = list(rows)
+    year_columns = {
+        name: {year: index for index, year in enumerate(series[0])} for name, series in tables.items()
     }
 
+    def exact(table: str, state: str, year: str) -> Optional[float]:
+        column = year_columns[table].get(year)
+        values = tables[table][1].get(state)
+        if column is None or values is None:
+            return None
+        return values[column]
 
-def build_banking_dataset(pdf_dir: Path) -> Dict[str, object]:
-    year = "2014"
-
-    branches_years, branches_rows = parse_state_series(pdf_dir / "152T_1112202512B2BF0FBDB74FF48CF835E2A6B7C592.PDF")
-    deposits_years, deposits_rows = parse_state_series(pdf_dir / "155T_11122025BC88547570414295AB088FBCF5C90806.PDF")
-    credit_years, credit_rows = parse_state_series(pdf_dir / "156T_1112202520771561966C49F1B9C00F56ACF97557.PDF")
-    cd_years, cd_rows = parse_state_series(pdf_dir / "154T_111220253A00C718ED584E7C850BBCAC3B2FA18B.PDF")
-
-    data = []
-    for state, branches_series in branches_rows.items():
-        branches = pick_year_value(branches_series, branches_years, year)
-        deposits = pick_year_value(deposits_rows.get(state, []), deposits_years, year) if state in deposits_rows else None
-        credit = pick_year_value(credit_rows.get(state, []), credit_years, year) if state in credit_rows else None
-        cd_ratio = pick_year_value(cd_rows.get(state, []), cd_years, year) if state in cd_rows else None
-
-        if branches is None:
+    fields: Dict[str, List[List[Optional[float]]]] = {}
+    for field in dataset.get("fields", []):
+        if field.get("emit") is False:
             continue
-
-        data.append(
-            {
-                "state": state,
-                "branches": int(branches) if branches is not None else None,
-                "deposits": round(deposits, 2) if deposits is not None else None,
-                "credit": round(credit, 2) if credit is not None else None,
-                "cdRatio": round(cd_ratio, 2) if cd_ratio is not None else None,
-            }
-        )
-
-    totals_branches = [row["branches"] for row in data if isinstance(row.get("branches"), (int, float))]
-    totals_deposits = [row["deposits"] for row in data if isinstance(row.get("deposits"), (int, float))]
-    totals_credit = [row["credit"] for row in data if isinstance(row.get("credit"), (int, float))]
-    cd_ratios = [row["cdRatio"] for row in data if isinstance(row.get("cdRatio"), (int, float))]
-
-    return {
-        "title": "Banking Statistics (Scheduled Commercial Banks)",
-        "description": "State-wise number of offices, deposits, and credit (As at end-March)",
-        "source": "RBI Handbook of Statistics on Indian States, 2024-25",
-        "year": year,
-        "data": sorted(data, key=lambda d: d["deposits"] or 0, reverse=True),
-        "national": {
-            "totalBranches": int(sum(totals_branches)) if totals_branches else 0,
-            "totalDeposits": round(sum(totals_deposits), 2) if totals_deposits else 0,
-            "totalCredit": round(sum(totals_credit), 2) if totals_credit else 0,
-            "avgCDRatio": round(sum(cd_ratios) / len(cd_ratios), 2) if cd_ratios else 0,
-        },
-    }
-
-
-def build_exports_dataset(pdf_dir: Path) -> Dict[str, object]:
-    year = "2023-24"
-    prev_year = "2022-23"
-    usd_to_inr = 83.0
-    usd_million_to_crore = usd_to_inr / 10.0
-
-    years, rows = parse_state_series(pdf_dir / "181T_1112202574821AB7B09745AC82B77B352FF4E3EB.PDF")
-
-    data = []
-    total_prev = 0.0
-    for state, series in rows.items():
-        value_usd_mn = pick_year_value(series, years, year)
-        prev_usd_mn = pick_year_value(series, years, prev_year)
-        if value_usd_mn is None:
-            continue
-        exports_crore = value_usd_mn * usd_million_to_crore
-        if prev_usd_mn is not None:
-            total_prev += prev_usd_mn * usd_million_to_crore
-        data.append(
-            {
-                "state": state,
-                "exports": round(exports_crore, 2),
-            }
-        )
-
-    total_exports = sum(row["exports"] for row in data)
-    for row in data:
-        row["share"] = round((row["exports"] / total_exports) * 100, 2) if total_exports else 0
-
-    growth_rate = ((total_exports - total_prev) / total_prev) * 100 if total_prev else 0
-
-    return {
-        "title": "State-wise Exports",
-        "description": "State-wise exports (approx ₹ Crore from USD millions, USD@83)",
-        "source": "RBI Handbook of Statistics on Indian States, 2024-25",
-        "year": year,
-        "unit": "₹ Crore (approx)",
-        "data": sorted(data, key=lambda d: d["exports"], reverse=True),
-        "national": {
-            "totalExports": round(total_exports, 2),
-            "growthRate": round(growth_rate, 2),
-        },
+        name = field["name"]
+        derive = field.get("derive")
+        by_year: List[List[Optional[float]]] = []
+        for year_index, year in enumerate(years):
+            if derive == "share":
+                parts = fields[field["of"]][year_index]
+                total = sum(part for part in parts if part is not None)
+                column = [
+                    convert_value((part / total) * 100, field) if part is not None and total else None
+                    for part in parts
+                ]
+            elif derive == "sum":
+                column = []
+                for state_index in range(len(states)):
+                    parts = [fields[part][year_index][state_index] for part in field["fields"]]
+                    column.append(sum(parts) if all(part is not None for part in parts) else None)
+            elif derive == "growth":
+                previous_year = years[year_index - 1] if year_index else None
+                column = [
+                    convert_value(
+                        derive_growth(
+                            exact(field["table"], state, year),
+                            exact(field["table"], state, previous_year) if previous_year else None,
+                        ),
+                        field,
+                    )
+                    for state in states
+                ]
+            else:
+                column = [convert_value(exact(field["table"], state, year), field) for state in states]
+            by_year.append(column)
+        fields[name] = by_year
+
+    payload: Dict[str, object] = {
+        "dataset": dataset["name"],
+        "title": dataset.get("meta", {}).get("title", dataset["name"]),
+        "source": dataset.get("meta", {}).get("source", ""),
     }
-
-
-def build_tourism_dataset(pdf_dir: Path) -> Dict[str, object]:
-    year = "2016"
-    domestic_years, domestic_rows = parse_state_series(pdf_dir / "13T_1112202529FAEEB805FE49E78D8A39C8679DEC25.PDF")
-    foreign_years, foreign_rows = parse_state_series(pdf_dir / "182T_111220255D1D4A3006504017A6916B26516E0915.PDF")
-
-    data = []
-    for state, domestic_series in domestic_rows.items():
-        domestic_mn = pick_year_value(domestic_series, domestic_years, year)
-        foreign_lakh = pick_year_value(foreign_rows.get(state, []), foreign_years, year) if state in foreign_rows else None
-        if domestic_mn is None and foreign_lakh is None:
-            continue
-        domestic = int(round(domestic_mn * 1_000_000)) if domestic_mn is not None else None
-        foreign = int(round(foreign_lakh * 100_000)) if foreign_lakh is not None else None
-        total = None
-        if domestic is not None and foreign is not None:
-            total = domestic + foreign
-        if total is None:
-            continue
-        data.append(
-            {
-                "state": state,
-                "domestic": domestic,
-                "foreign": foreign,
-                "total": total,
+    if dataset.get("meta", {}).get("unit"):
+        payload["unit"] = dataset["meta"]["unit"]
+    dimension = load_state_dimension()
+    payload["years"] = list(years)
+    payload["states"] = [dimension.key(state) for state in states]
+    payload["fields"] = fields
+    return payload
+
+
+def write_series(payload: Dict[str, object], series_dir: Path) -> Tuple[int, List[int]]:
+    name = payload["dataset"]
+    series_dir.mkdir(parents=True, exist_ok=True)
+    series_text = json.dumps(payload, separators=(",", ":"))
+    (series_dir / f"{name}.json").write_text(series_text, encoding="utf-8")
+
+    shard_dir = series_dir / name
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for stale in shard_dir.glob("*.json"):
+        stale.unlink()
+    shard_sizes = []
+    for year_index, year in enumerate(payload["years"]):
+        shard: Dict[str, object] = {"dataset": name, "year": year, "states": payload["states"]}
+        for field, by_year in payload["fields"].items():
+            shard[field] = by_year[year_index]
+        shard_text = json.dumps(shard, separators=(",", ":"))
+        (shard_dir / f"{year}.json").write_text(shard_text, encoding="utf-8")
+        shard_sizes.append(len(shard_text.encode("utf-8")))
+    return len(series_text.encode("utf-8")), shard_sizes
+
+
+def format_kb(size: float) -> str:
+    return f"{size / 1024:.1f} KB"
+
+
+def timed_build(dataset: Dict[str, object], tables: Dict[str, Series]) -> Tuple[Dict[str, object], float]:
+    start = time.perf_counter()
+    with span("build_series_dataset", dataset=dataset["name"]):
+        payload = build_series_dataset(dataset, tables)
+        count("rows", len(payload["data"]))
+    return payload, time.perf_counter() - start
+
+
+def run_graph(
+    datasets: List[Dict[str, object]],
+    tables: Dict[str, Path],
+    jobs: int = 1,
+    cache: Optional[PageCache] = None,
+    parsed: Optional[Dict[str, Series]] = None,
+    backend: str = DEFAULT_TEXT_BACKEND,
+    early_exit: bool = False,
+) -> Tuple[Dict[str, Dict[str, object]], Dict[str, Series], Dict[Path, float], Dict[str, float]]:
+    needs = {dataset["name"]: dataset_tables(dataset) for dataset in datasets}
+    targets = stop_years(datasets, tables) if early_exit else {}
+    by_path: Dict[Path, Series] = {}
+    if parsed is not None:
+        by_path = {tables[name]: series for name, series in parsed.items()}
+    pending_paths = [
+        path
+        for path in dict.fromkeys(tables[name] for names in needs.values() for name in names)
+        if path not in by_path
+    ]
+    timings: Dict[Path, float] = {path: 0.0 for path in by_path}
+    results: Dict[str, Tuple[Dict[str, object], float]] = {}
+
+    def inputs(dataset: Dict[str, object]) -> Dict[str, Series]:
+        return {name: by_path[tables[name]] for name in needs[dataset["name"]]}
+
+    if jobs <= 1:
+        for path in pending_paths:
+            by_path[path], timings[path] = timed_parse(path, cache, backend, targets.get(path))
+        for dataset in datasets:
+            results[dataset["name"]] = timed_build(dataset, inputs(dataset))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            parse_futures = {
+                submit_traced(executor, timed_parse, path, cache, backend, targets.get(path)): path
+                for path in pending_paths
             }
-        )
-
-    totals_domestic = [row["domestic"] for row in data if isinstance(row.get("domestic"), int)]
-    totals_foreign = [row["foreign"] for row in data if isinstance(row.get("foreign"), int)]
-    totals_total = [row["total"] for row in data if isinstance(row.get("total"), int)]
-
-    return {
-        "title": "Tourism Statistics",
-        "description": "State-wise domestic and foreign tourist visits",
-        "source": "RBI Handbook of Statistics on Indian States, 2024-25",
-        "year": year,
-        "data": sorted(data, key=lambda d: d.get("total") or 0, reverse=True),
-        "national": {
-            "totalDomestic": sum(totals_domestic) if totals_domestic else 0,
-            "totalForeign": sum(totals_foreign) if totals_foreign else 0,
-            "total": sum(totals_total) if totals_total else 0,
-        },
-    }
+            build_futures = {}
+
+            def submit_ready() -> None:
+                for dataset in datasets:
+                    name = dataset["name"]
+                    if name in build_futures:
+                        continue
+                    if all(tables[table] in by_path for table in needs[name]):
+                        build_futures[name] = submit_traced(executor, timed_build, dataset, inputs(dataset))
+
+            submit_ready()
+            for future in as_completed(parse_futures):
+                path = parse_futures[future]
+                by_path[path], timings[path] = traced_result(future)
+                submit_ready()
+            for name, future in build_futures.items():
+                results[name] = traced_result(future)
+
+    payloads = {dataset["output"]: results[dataset["name"]][0] for dataset in datasets}
+    build_times = {dataset["output"]: results[dataset["name"]][1] for dataset in datasets}
+    parsed_tables = {name: by_path[tables[name]] for names in needs.values() for name in names}
+    return payloads, parsed_tables, timings, build_times
+
+
+def dataset_outputs(dataset: Dict[str, object], series: bool = False) -> List[str]:
+    outputs = [str(dataset["output"])]
+    if series:
+        outputs.append(f"series/{dataset['name']}.json")
+    return outputs
+
+
+def dataset_fingerprint(
+    dataset: Dict[str, object],
+    tables: Dict[str, Path],
+    source_digest: Callable[[Path], str],
+    code: str,
+    backend: str = DEFAULT_TEXT_BACKEND,
+    early_exit: bool = False,
+) -> str:
+    return fingerprint(
+        {
+            "dataset": dataset,
+            "tables": {name: source_digest(tables[name]) for name in dataset_tables(dataset)},
+            "code": code,
+            "text_backend": backend,
+            "early_exit": early_exit,
+        }
+    )
+
+
+def builder_code_version() -> str:
+    scripts_dir = Path(__file__).resolve().parent
+    return code_version(
+        scripts_dir / "build_rbi_datasets.py",
+        scripts_dir / "pdf_cache.py",
+        scripts_dir / "page_analysis.py",
+        scripts_dir / "text_backends.py",
+        scripts_dir / "state_dimension.py",
+        STATES_PATH,
+    )
 
 
 def write_dataset(payload: Dict[str, object], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    with span("write_dataset", "write", output=output_path.name):
+        text = json.dumps(payload, indent=2)
+        count("bytes", len(text))
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(text, encoding="utf-8")
 
 
 def main() -> None:
-    pdf_dir = Path(__file__).resolve().parent.parent.parent / "pdfs"
-    output_dir = Path(__file__).resolve().parent.parent / "src" / "data"
-
-    datasets = {
-        "gdp.json": build_gdp_dataset(pdf_dir),
-        "banking.json": build_banking_dataset(pdf_dir),
-        "exports.json": build_exports_dataset(pdf_dir),
-        "tourism.json": build_tourism_dataset(pdf_dir),
+    parser = argparse.ArgumentParser(description="Build dashboard JSON datasets directly from RBI table PDFs.")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Path to manifest.json.")
+    parser.add_argument(
+        "--pdf-dir",
+        type=Path,
+        help="Directory containing the RBI table PDFs (defaults to the manifest's pdf_dir).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "src" / "data",
+        help="Output directory.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for PDF parsing and dataset builds (0 = one per CPU).",
+    )
+    parser.add_argument("--store", type=Path, help="Also write every parsed table to this columnar series store.")
+    parser.add_argument(
+        "--from-store",
+        type=Path,
+        help="Build from a series store written by --store instead of parsing the PDFs.",
+    )
+    parser.add_argument(
+        "--series",
+        action="store_true",
+        help="Also write each dataset's full time series and per-year shards to <output-dir>/series/.",
+    )
+    parser.add_argument(
+        "--cube",
+        action="store_true",
+        help="Also write the precomputed rank/share/growth/region cube to <output-dir>/cube.json.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every dataset even if its inputs are unchanged since the last run.",
+    )
+    parser.add_argument(
+        "--text-backend",
+        choices=sorted(TEXT_BACKENDS),
+        default=DEFAULT_TEXT_BACKEND,
+        help="Library used to read text lines from the PDFs (see bench_backends.py for an equivalence check).",
+    )
+    parser.add_argument(
+        "--early-exit",
+        action="store_true",
+        help="Stop reading a PDF once the next year block starts after the blocks holding the years the "
+        "datasets use. Assumes each year block's pages are contiguous; bench_parse.py checks this against a "
+        "full parse. Ignored with --series and --store, which need every year.",
+    )
+    add_release_arguments(parser)
+    add_snapshot_arguments(parser)
+    add_cache_arguments(parser)
+    add_profile_argument(parser, "build_rbi_datasets")
+    args = parser.parse_args()
+
+    if args.profile:
+        start_tracing()
+    tables, all_datasets = load_graph(args.manifest, args.pdf_dir)
+    output_dir = args.output_dir
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    cache = cache_from_args(args)
+
+    # --store writes every table, so it needs every PDF parsed anyway.
+    forced = args.force or bool(args.store)
+    early_exit = args.early_exit and not (args.series or args.store)
+    code = builder_code_version()
+    store_digest = file_sha256(args.from_store) if args.from_store else None
+
+    def source_digest(path: Path) -> str:
+        return store_digest or file_sha256(path)
+
+    build_state = BuildState(output_dir)
+    fingerprints = {
+        dataset["output"]: dataset_fingerprint(dataset, tables, source_digest, code, args.text_backend, early_exit)
+        for dataset in all_datasets
     }
-
-    for filename, payload in datasets.items():
+    datasets = [
+        dataset
+        for dataset in all_datasets
+        if forced
+        or not build_state.is_fresh(
+            dataset["output"], fingerprints[dataset["output"]], dataset_outputs(dataset, args.series)
+        )
+    ]
+    reused = [dataset for dataset in all_datasets if dataset not in datasets]
+
+    parsed = None
+    if args.from_store:
+        with open_store(args.from_store) as store:
+            needed = dict.fromkeys(name for dataset in datasets for name in dataset_tables(dataset))
+            parsed = {name: store.as_series(name) for name in needed}
+
+    graph_start = time.perf_counter()
+    payloads, parsed, timings, build_times = run_graph(
+        datasets, tables, jobs, cache, parsed, args.text_backend, early_exit
+    )
+    graph_wall = time.perf_counter() - graph_start
+    if args.store:
+        with span("write_store", "write"):
+            size = write_store(args.store, parsed)
+        print(f"Wrote {len(parsed)} tables ({size / 1024:.1f} KB) to {args.store}")
+
+    write_start = time.perf_counter()
+    release_payloads: Dict[str, object] = {}
+    for dataset in reused:
+        for output in dataset_outputs(dataset, args.series):
+            release_payloads[output] = load_output(output_dir, output)
+    release_payloads.update(payloads)
+    for filename, payload in payloads.items():
         write_dataset(payload, output_dir / filename)
         print(f"Wrote {filename}")
+    if args.series and datasets:
+        series_dir = output_dir / "series"
+        print(f"Series output ({series_dir}):")
+        for dataset in datasets:
+            inputs = {name: parsed[name] for name in dataset_tables(dataset)}
+            series_payload = build_series_payload(dataset, inputs)
+            release_payloads[f"series/{dataset['name']}.json"] = series_payload
+            with span("write_series", "write", dataset=dataset["name"]):
+                series_size, shard_sizes = write_series(series_payload, series_dir)
+            current_size = len(json.dumps(payloads[dataset["output"]], indent=2).encode("utf-8"))
+            average_shard = sum(shard_sizes) / len(shard_sizes) if shard_sizes else 0
+            print(
+                f"  {dataset['name']}: {dataset['output']} (indent=2, 1 year) {format_kb(current_size)}; "
+                f"full series {format_kb(series_size)} ({len(shard_sizes)} years, "
+                f"{series_size / current_size:.2f}x); per-year shard avg {format_kb(average_shard)} "
+                f"({average_shard / current_size:.2f}x)"
+            )
+    for dataset in datasets:
+        build_state.record(
+            dataset["output"], fingerprints[dataset["output"]], dataset_outputs(dataset, args.series)
+        )
+    build_state.save()
+    if args.cube:
+        with span("write_cube", "write"):
+            write_cube(output_dir, output_dir / "cube.json", args.manifest)
+        release_payloads["cube.json"] = json.loads((output_dir / "cube.json").read_text(encoding="utf-8"))
+    if args.release:
+        with span("write_release", "write"):
+            report = write_release(release_payloads, args.release_dir)
+        print_release_report(report, args.release_dir)
+    if args.snapshot:
+        with span("write_snapshot", "write"):
+            snapshot_report = write_snapshot(release_payloads, args.snapshot, args.snapshot_dir)
+        print_snapshot_report(snapshot_report, args.snapshot_dir)
+    write_wall = time.perf_counter() - write_start
+
+    print_rebuild_summary(
+        [dataset["output"] for dataset in datasets], [dataset["output"] for dataset in reused], forced
+    )
+
+    if not datasets:
+        finish_cache(cache)
+        finish_profile(args.profile)
+        return
+
+    parse_serial = sum(timings.values())
+    build_serial = sum(build_times.values())
+    print(f"Timing ({jobs} job{'s' if jobs != 1 else ''}):")
+    for dataset in datasets:
+        source_times = [timings[tables[name]] for name in dataset_tables(dataset)]
+        pdfs = f"{len(source_times)} PDF{'s' if len(source_times) != 1 else ''}"
+        print(
+            f"  {dataset['output']}: parse {sum(source_times):.2f}s over {pdfs}, "
+            f"build {build_times[dataset['output']]:.3f}s"
+        )
+    print(
+        f"  parse + build: {len(timings)} PDFs, {len(payloads)} datasets, {graph_wall:.2f}s wall, "
+        f"{parse_serial:.2f}s parse + {build_serial:.2f}s build task time"
+    )
+    print(f"  write stage: {write_wall:.3f}s")
+    finish_cache(cache)
+    finish_profile(args.profile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# Build state lives next to the page cache, not in the output directory,
+# so tools that publish or snapshot every *.json there never see it.
+DEFAULT_STATE_DIR = Path(__file__).resolve().parent / ".cache" / "build-state"
+LEGACY_STATE_FILENAME = ".build-state.json"
+STATE_VERSION = 1
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_version(*paths: Path) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def fingerprint(inputs: Dict[str, object]) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class BuildState:
+    def __init__(self, output_dir: Path, state_dir: Path = DEFAULT_STATE_DIR) -> None:
+        # One state file per output directory.
+        self.output_dir = output_dir
+        key = hashlib.sha256(str(output_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+        self.path = state_dir / f"{key}.json"
+        self.entries: Dict[str, Dict[str, object]] = {}
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if state.get("version") == STATE_VERSION:
+            self.entries = state.get("datasets", {})
+
+    def is_fresh(self, key: str, current: str, outputs: Iterable[str]) -> bool:
+        entry = self.entries.get(key)
+        if not entry or entry.get("fingerprint") != current:
+            return False
+        recorded = set(entry.get("outputs", []))
+        return all(output in recorded and (self.output_dir / output).exists() for output in outputs)
+
+    def record(self, key: str, current: str, outputs: List[str]) -> None:
+        self.entries[key] = {"fingerprint": current, "outputs": outputs}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        state = {"version": STATE_VERSION, "output_dir": str(self.output_dir.resolve()), "datasets": self.entries}
+        self.path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+        # Earlier builds kept the state inside the output directory.
+        (self.output_dir / LEGACY_STATE_FILENAME).unlink(missing_ok=True)
+
+
+def print_rebuild_summary(rebuilt: List[str], reused: List[str], forced: bool = False) -> None:
+    reason = " (forced)" if forced else ""
+    print(f"Rebuilt {len(rebuilt)} dataset{'s' if len(rebuilt) != 1 else ''}{reason}: {', '.join(rebuilt) or '-'}")
+    print(f"Reused {len(reused)} unchanged: {', '.join(reused) or '-'}")
+
+
+def load_output(output_dir: Path, name: str) -> Optional[object]:
+    try:
+        return json.loads((output_dir / name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
 import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+
+USER_AGENT = "Mozilla/5.0 (RBI stats downloader)"
+STATE_FILENAME = ".download-state.json"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 
 def iter_urls(path: Path) -> Iterable[str]:
@@ -17,25 +28,208 @@ def sanitize_filename(url: str) -> str:
     return url.rsplit("/", 1)[-1]
 
 
-def download_pdf(url: str, output_path: Path, timeout: int = 30) -> bool:
-    headers = {"User-Agent": "Mozilla/5.0 (RBI stats downloader)"}
-    with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
-        response.raise_for_status()
-        content_type = response.headers.get("Content-Type", "")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with output_path.open("wb") as handle:
-            for chunk in response.iter_content(chunk_size=1024 * 64):
-                if chunk:
-                    handle.write(chunk)
+def make_session(pool_size: int = 1) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class Backoff:
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 60.0) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+        self.not_before = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self.lock:
+            pause = self.not_before - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+
+    def throttle(self, retry_after: Optional[float] = None) -> float:
+        with self.lock:
+            self.delay = min(self.max_delay, max(self.base_delay, self.delay * 2))
+            pause = retry_after if retry_after is not None else self.delay * random.uniform(0.5, 1.0)
+            self.not_before = max(self.not_before, time.monotonic() + pause)
+            return pause
+
+    def success(self) -> None:
+        with self.lock:
+            self.delay /= 2
+            if self.delay < self.base_delay / 8:
+                self.delay = 0.0
+
+
+class DownloadState:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, str]] = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                self.entries = {}
+
+    def get(self, filename: str) -> Dict[str, str]:
+        with self.lock:
+            return dict(self.entries.get(filename, {}))
+
+    def update(self, filename: str, response: requests.Response) -> None:
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["last_modified"] = response.headers["Last-Modified"]
+        with self.lock:
+            if validators:
+                self.entries[filename] = validators
+            else:
+                self.entries.pop(filename, None)
+
+    def discard(self, filename: str) -> None:
+        with self.lock:
+            self.entries.pop(filename, None)
+
+    def save(self) -> None:
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+
 
-    with output_path.open("rb") as handle:
-        signature = handle.read(4)
-    if signature != b"%PDF":
-        output_path.unlink(missing_ok=True)
-        print(f"Skipped (not PDF): {url} | content-type: {content_type}")
-        return False
-    print(f"Downloaded: {output_path.name}")
-    return True
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def if_range_validator(validators: Dict[str, str]) -> Optional[str]:
+    # If-Range needs a strong ETag or a date; weak ETags never match.
+    etag = validators.get("etag", "")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return validators.get("last_modified")
+
+
+def content_range_start(value: Optional[str]) -> Optional[int]:
+    # "bytes 1000-1999/5000" -> 1000
+    if not value or not value.startswith("bytes "):
+        return None
+    try:
+        return int(value[len("bytes ") :].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def download_pdf(
+    url: str,
+    output_path: Path,
+    timeout: int = 30,
+    session: Optional[requests.Session] = None,
+    state: Optional[DownloadState] = None,
+    backoff: Optional[Backoff] = None,
+    max_retries: int = 5,
+) -> Tuple[str, int]:
+    session = session or make_session()
+    backoff = backoff or Backoff()
+    part_path = output_path.with_name(output_path.name + ".part")
+    validators = state.get(output_path.name) if state else {}
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def forget_part() -> None:
+        part_path.unlink(missing_ok=True)
+        if state:
+            state.discard(part_path.name)
+            state.save()
+
+    for attempt in range(max_retries + 1):
+        headers = {}
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if offset:
+            # A .part is only resumed against the validator of the response
+            # that started it, so a changed file is never appended to old bytes.
+            part_validator = if_range_validator(state.get(part_path.name)) if state else None
+            if part_validator:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = part_validator
+            else:
+                forget_part()
+                offset = 0
+        if not offset and output_path.exists():
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        backoff.wait()
+        received = 0
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                if response.status_code in RETRY_STATUSES and attempt < max_retries:
+                    pause = backoff.throttle(parse_retry_after(response.headers.get("Retry-After")))
+                    print(f"Retrying {output_path.name} in {pause:.1f}s (HTTP {response.status_code})")
+                    continue
+                if response.status_code == 304:
+                    backoff.success()
+                    print(f"Unchanged: {output_path.name}")
+                    return "unchanged", 0
+                if response.status_code == 416:
+                    forget_part()
+                    continue
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                mode = "wb"
+                if response.status_code == 206:
+                    start = content_range_start(response.headers.get("Content-Range"))
+                    if start == offset and offset:
+                        mode = "ab"
+                    elif start != 0:
+                        print(f"Restarting {output_path.name} (server sent range from {start}, expected {offset})")
+                        forget_part()
+                        continue
+                if mode == "wb" and state:
+                    state.update(part_path.name, response)
+                    state.save()
+                with part_path.open(mode) as handle:
+                    for chunk in response.iter_content(chunk_size=1024 * 64):
+                        if chunk:
+                            handle.write(chunk)
+                            received += len(chunk)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as error:
+            if attempt < max_retries:
+                pause = backoff.throttle()
+                print(f"Retrying {output_path.name} in {pause:.1f}s ({type(error).__name__})")
+                continue
+            print(f"Failed: {url} | {error}")
+            return "failed", received
+        except requests.HTTPError as error:
+            print(f"Failed: {url} | {error}")
+            return "failed", received
+
+        backoff.success()
+        with part_path.open("rb") as handle:
+            signature = handle.read(4)
+        if signature != b"%PDF":
+            forget_part()
+            print(f"Skipped (not PDF): {url} | content-type: {content_type}")
+            return "invalid", received
+        part_path.replace(output_path)
+        if state:
+            state.update(output_path.name, response)
+            state.discard(part_path.name)
+        print(f"Downloaded: {output_path.name}")
+        return "downloaded", received
+
+    print(f"Failed: {url} | gave up after {max_retries} retries")
+    return "failed", 0
 
 
 def main() -> None:
@@ -45,6 +239,9 @@ def main() -> None:
     parser.add_argument("--limit", type=int, help="Limit number of downloads.")
     parser.add_argument("--start-index", type=int, default=0, help="Start index in the URL list (0-based).")
     parser.add_argument("--skip-existing", action="store_true", help="Skip files that already exist.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of parallel downloads.")
+    parser.add_argument("--timeout", type=int, default=30, help="Per-request timeout in seconds.")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per URL on 429/5xx or connection errors.")
     args = parser.parse_args()
 
     urls = list(iter_urls(args.list))
@@ -53,17 +250,45 @@ def main() -> None:
     if args.limit:
         urls = urls[: args.limit]
 
-    success = 0
-    for url in urls:
-        filename = sanitize_filename(url)
-        output_path = args.output_dir / filename
+    concurrency = max(1, args.concurrency)
+    session = make_session(concurrency)
+    state = DownloadState(args.output_dir / STATE_FILENAME)
+    backoff = Backoff()
+    counts = {"downloaded": 0, "unchanged": 0, "skipped": 0, "invalid": 0, "failed": 0}
+    total_bytes = 0
+    counts_lock = threading.Lock()
+
+    def fetch(url: str) -> None:
+        nonlocal total_bytes
+        output_path = args.output_dir / sanitize_filename(url)
         if args.skip_existing and output_path.exists():
             print(f"Skipped (exists): {output_path.name}")
-            continue
-        if download_pdf(url, output_path):
-            success += 1
+            status, received = "skipped", 0
+        else:
+            status, received = download_pdf(url, output_path, args.timeout, session, state, backoff, args.max_retries)
+        with counts_lock:
+            counts[status] += 1
+            total_bytes += received
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(fetch, urls))
+    finally:
+        state.save()
+        session.close()
+    elapsed = time.perf_counter() - start
 
-    print(f"Downloaded {success}/{len(urls)} PDFs.")
+    print(f"Downloaded {counts['downloaded']}/{len(urls)} PDFs.")
+    print(
+        f"Unchanged {counts['unchanged']}, skipped {counts['skipped']}, "
+        f"not PDF {counts['invalid']}, failed {counts['failed']}."
+    )
+    rate = total_bytes / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+    print(
+        f"Transferred {total_bytes / (1024 * 1024):.2f} MB in {elapsed:.2f}s "
+        f"({rate:.2f} MB/s, {len(urls) / elapsed if elapsed > 0 else 0:.1f} URLs/s, concurrency {concurrency})."
+    )
 
 
 if __name__ == "__main__":
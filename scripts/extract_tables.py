@@ -2,10 +2,32 @@
 import argparse
 import csv
 import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional
 
-import pdfplumber
+from page_analysis import iter_page_analysis
+from page_index import DEFAULT_INDEX_PATH, PageIndex, locate_pages
+from pdf_cache import PageCache, PlumberDocument, add_cache_arguments, cache_from_args, finish_cache
+from stage_trace import (
+    add_profile_argument,
+    count,
+    finish_profile,
+    span,
+    start_tracing,
+    submit_traced,
+    traced_result,
+)
+
+
+# Each worker gets several contiguous page ranges, so a range of dense
+# table pages does not leave the other workers idle at the end.
+SHARDS_PER_WORKER = 4
 
 
 def normalize_cell(value: object) -> str:
@@ -21,30 +43,107 @@ def write_table(rows: List[List[str]], output_path: Path) -> None:
         writer.writerows(rows)
 
 
-def extract_tables_from_pdf(
+class MemoryLimitExceeded(RuntimeError):
+    pass
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    # RUSAGE_CHILDREN is the largest finished child, i.e. the peak of any
+    # shard worker once the pool has shut down.
+    peak = resource.getrusage(who).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+    return resident_pages * resource.getpagesize() / (1024 * 1024)
+
+
+def iter_tables_from_pdf(
     pdf_path: Path,
     output_dir: Path,
     pages: Optional[Iterable[int]] = None,
-) -> List[Path]:
-    written_files: List[Path] = []
-    with pdfplumber.open(pdf_path) as pdf:
-        total_pages = len(pdf.pages)
-        if pages is None:
-            pages = range(1, total_pages + 1)
-
-        for page_number in pages:
-            if page_number < 1 or page_number > total_pages:
+    cache: Optional[PageCache] = None,
+    max_rss_mb: Optional[float] = None,
+) -> Iterator[Path]:
+    # Tables come from the shared page analysis, so pages that
+    # build_rbi_datasets or page_index already analysed are cache hits.
+    for page_number, analysis in iter_page_analysis(pdf_path, cache, pages):
+        for table_index, table in enumerate(analysis["tables"], start=1):
+            normalized = [[normalize_cell(cell) for cell in row] for row in table if row]
+            if not any(any(cell for cell in row) for row in normalized):
                 continue
-            page = pdf.pages[page_number - 1]
-            tables = page.extract_tables() or []
-            for table_index, table in enumerate(tables, start=1):
-                normalized = [[normalize_cell(cell) for cell in row] for row in table if row]
-                if not any(any(cell for cell in row) for row in normalized):
-                    continue
-                output_path = output_dir / f"page_{page_number:03d}_table_{table_index:02d}.csv"
+            output_path = output_dir / f"page_{page_number:03d}_table_{table_index:02d}.csv"
+            with span("write_table", "write", page=page_number):
                 write_table(normalized, output_path)
-                written_files.append(output_path)
-    return written_files
+            count("tables")
+            count("rows", len(normalized))
+            yield output_path
+        if max_rss_mb is not None:
+            rss = current_rss_mb()
+            if rss > max_rss_mb:
+                raise MemoryLimitExceeded(
+                    f"{pdf_path.name}: resident memory {rss:.1f} MB exceeds --max-rss {max_rss_mb:.1f} MB "
+                    f"after page {page_number}"
+                )
+
+
+def extract_tables_from_pdf(
+    pdf_path: Path,
+    output_dir: Path,
+    pages: Optional[Iterable[int]] = None,
+    cache: Optional[PageCache] = None,
+    max_rss_mb: Optional[float] = None,
+) -> List[Path]:
+    return list(iter_tables_from_pdf(pdf_path, output_dir, pages, cache, max_rss_mb))
+
+
+def page_shards(pages: List[int], jobs: int) -> List[List[int]]:
+    shard_count = max(1, min(len(pages), jobs * SHARDS_PER_WORKER))
+    size, extra = divmod(len(pages), shard_count)
+    shards = []
+    start = 0
+    for index in range(shard_count):
+        end = start + size + (1 if index < extra else 0)
+        shards.append(pages[start:end])
+        start = end
+    return shards
+
+
+def extract_tables_sharded(
+    pdf_path: Path,
+    output_dir: Path,
+    pages: Optional[Iterable[int]] = None,
+    cache: Optional[PageCache] = None,
+    max_rss_mb: Optional[float] = None,
+    jobs: int = 1,
+) -> List[Path]:
+    # Splits one PDF's pages across worker processes, each opening its own
+    # pdfplumber handle. Every CSV name is fixed by its page and table number,
+    # and shards are merged in page order, so the output matches a serial run.
+    if jobs <= 1:
+        return extract_tables_from_pdf(pdf_path, output_dir, pages, cache, max_rss_mb)
+    if pages is None:
+        with closing(PlumberDocument(pdf_path)) as pdf:
+            pages = range(1, len(pdf) + 1)
+    shards = page_shards(list(pages), jobs)
+    if len(shards) <= 1:
+        return extract_tables_from_pdf(pdf_path, output_dir, pages, cache, max_rss_mb)
+    written: List[Path] = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(shards))) as executor:
+        futures = [
+            submit_traced(executor, extract_tables_from_pdf, pdf_path, output_dir, shard, cache, max_rss_mb)
+            for shard in shards
+        ]
+        for future in futures:
+            written.extend(traced_result(future))
+    return written
 
 
 def parse_page_range(start: Optional[int], end: Optional[int]) -> Optional[Iterable[int]]:
@@ -57,9 +156,17 @@ def parse_page_range(start: Optional[int], end: Optional[int]) -> Optional[Itera
     return range(start, end + 1)
 
 
-def run_manifest(manifest_path: Path, output_root: Path) -> None:
+def run_manifest(
+    manifest_path: Path,
+    output_root: Path,
+    cache: Optional[PageCache] = None,
+    max_rss_mb: Optional[float] = None,
+    index_path: Path = DEFAULT_INDEX_PATH,
+    jobs: int = 1,
+) -> None:
     manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
     datasets = manifest.get("datasets", [])
+    index: Optional[PageIndex] = None
     for dataset in datasets:
         pdf_value = dataset.get("pdf")
         if not pdf_value:
@@ -70,9 +177,33 @@ def run_manifest(manifest_path: Path, output_root: Path) -> None:
             print(f"Skipping {dataset.get('name', 'unknown')}: pdf not found at {pdf_path}")
             continue
         output_dir = output_root / dataset.get("name", "dataset")
-        page_range = parse_page_range(dataset.get("page_start"), dataset.get("page_end"))
-        written = extract_tables_from_pdf(pdf_path, output_dir, page_range)
+        if dataset.get("table_title"):
+            if index is None:
+                index = PageIndex(index_path)
+            start = time.perf_counter()
+            with span("locate_pages", "index", table_title=dataset["table_title"]):
+                page_range = locate_pages(index, pdf_path, dataset["table_title"], cache)
+            print(
+                f"{dataset.get('name', 'dataset')}: '{dataset['table_title']}' on pages "
+                f"{', '.join(map(str, page_range)) or 'none'} ({(time.perf_counter() - start) * 1000:.1f} ms)"
+            )
+            if not page_range:
+                continue
+        else:
+            page_range = parse_page_range(dataset.get("page_start"), dataset.get("page_end"))
+        with span("extract_tables_from_pdf", "pdf", pdf=pdf_path.name):
+            written = extract_tables_sharded(pdf_path, output_dir, page_range, cache, max_rss_mb, jobs)
         print(f"{dataset.get('name', 'dataset')}: wrote {len(written)} tables to {output_dir}")
+    if index is not None:
+        index.close()
+
+
+def print_peak_rss(jobs: int) -> None:
+    if jobs > 1:
+        workers = peak_rss_mb(resource.RUSAGE_CHILDREN)
+        print(f"Peak RSS: {peak_rss_mb():.1f} MB main process, {workers:.1f} MB largest worker")
+    else:
+        print(f"Peak RSS: {peak_rss_mb():.1f} MB")
 
 
 def main() -> None:
@@ -82,19 +213,56 @@ def main() -> None:
     parser.add_argument("--output-dir", type=Path, default=Path("scripts/outputs"), help="Output directory.")
     parser.add_argument("--page-start", type=int, help="First page to extract (1-based).")
     parser.add_argument("--page-end", type=int, help="Last page to extract (1-based).")
+    parser.add_argument(
+        "--max-rss",
+        type=float,
+        help="Abort when any one process's resident memory exceeds this many MB (checked after every page, "
+        "in this process and in each --jobs worker; the run as a whole can use up to jobs times this).",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="Page index used to locate manifest entries that set table_title.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes that each extract a share of one PDF's pages (0 = one per CPU).",
+    )
+    add_cache_arguments(parser)
+    add_profile_argument(parser, "extract_tables")
     args = parser.parse_args()
 
-    output_dir = args.output_dir
-    if args.manifest:
-        run_manifest(args.manifest, output_dir)
-        return
-
-    if not args.pdf:
+    if not args.manifest and not args.pdf:
         parser.error("Either --manifest or --pdf is required.")
+    if args.profile:
+        start_tracing()
 
-    page_range = parse_page_range(args.page_start, args.page_end)
-    written = extract_tables_from_pdf(args.pdf, output_dir, page_range)
-    print(f"Wrote {len(written)} tables to {output_dir}")
+    output_dir = args.output_dir
+    cache = cache_from_args(args)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    try:
+        if args.manifest:
+            run_manifest(args.manifest, output_dir, cache, args.max_rss, args.index, jobs)
+        else:
+            page_range = parse_page_range(args.page_start, args.page_end)
+            written = 0
+            with span("extract_tables_from_pdf", "pdf", pdf=args.pdf.name):
+                if jobs > 1:
+                    written = len(extract_tables_sharded(args.pdf, output_dir, page_range, cache, args.max_rss, jobs))
+                else:
+                    for _ in iter_tables_from_pdf(args.pdf, output_dir, page_range, cache, args.max_rss):
+                        written += 1
+            print(f"Wrote {written} tables to {output_dir}")
+    except MemoryLimitExceeded as error:
+        print_peak_rss(jobs)
+        finish_profile(args.profile)
+        raise SystemExit(str(error))
+    finish_cache(cache)
+    finish_profile(args.profile)
+    print_peak_rss(jobs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pdfplumber.page import Page
+from pdfplumber.table import TableSettings
+
+from pdf_cache import PageCache, iter_page_results
+from text_backends import TEXT_SETTINGS, extract_page_lines
+
+
+ANALYSIS_KIND = "analysis"
+TABLE_SETTINGS: Dict[str, object] = {}
+ANALYSIS_SETTINGS: Dict[str, object] = {"text": TEXT_SETTINGS, "tables": TABLE_SETTINGS}
+
+PageAnalysis = Dict[str, object]
+
+
+def analyze_page(page: Page) -> PageAnalysis:
+    # pdfminer's layout pass runs once, on the first access to page.objects;
+    # the text lines, tables and cell boxes below are all derived from it.
+    # Tables are extracted exactly as page.extract_tables(TABLE_SETTINGS) does.
+    settings = TableSettings.resolve(TABLE_SETTINGS)
+    tables = page.find_tables(settings)
+    return {
+        "lines": extract_page_lines(page),
+        "tables": [table.extract(**(settings.text_settings or {})) for table in tables],
+        # (x0, top, x1, bottom) per cell, in points from the page's top-left.
+        "cells": [[[round(value, 2) for value in cell] for cell in table.cells] for table in tables],
+    }
+
+
+def iter_page_analysis(
+    pdf_path: Path,
+    cache: Optional[PageCache] = None,
+    pages: Optional[Iterable[int]] = None,
+) -> Iterator[Tuple[int, PageAnalysis]]:
+    return iter_page_results(pdf_path, ANALYSIS_KIND, ANALYSIS_SETTINGS, analyze_page, cache, pages)
+
+
+def iter_text_lines(
+    pdf_path: Path,
+    cache: Optional[PageCache] = None,
+    pages: Optional[Iterable[int]] = None,
+) -> Iterator[Tuple[int, List[str]]]:
+    # Text lines only, for callers that do not need tables: a page is not
+    # searched for tables, but a cached analysis of it is read when present.
+    return iter_page_results(
+        pdf_path,
+        "text",
+        TEXT_SETTINGS,
+        extract_page_lines,
+        cache,
+        pages,
+        reuse=(ANALYSIS_KIND, ANALYSIS_SETTINGS, itemgetter("lines")),
+    )
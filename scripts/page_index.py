@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+import argparse
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from page_analysis import iter_page_analysis
+from pdf_cache import PageCache, add_cache_arguments, cache_from_args, file_sha256, finish_cache
+
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent / ".cache" / "page_index.sqlite"
+TITLE_RE = re.compile(r"^\s*TABLE\s+[\w.]+\s*[:.\-]", re.IGNORECASE)
+TOKEN_RE = re.compile(r"\w+")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS documents (path TEXT PRIMARY KEY, sha256 TEXT NOT NULL, pages INTEGER NOT NULL)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5("
+    "title, body, path UNINDEXED, page UNINDEXED, tokenize = 'porter unicode61')",
+)
+
+
+def page_title(lines: List[str]) -> str:
+    for line in lines:
+        if TITLE_RE.match(line):
+            return line.strip()
+    return next((line.strip() for line in lines if line.strip()), "")
+
+
+def match_queries(title: str) -> List[str]:
+    tokens = [token.lower() for token in TOKEN_RE.findall(title)]
+    if not tokens:
+        return []
+    quoted = " ".join(f'"{token}"' for token in tokens)
+    return [
+        f'title : "{" ".join(tokens)}"',
+        f"title : ({quoted})",
+        f"body : ({quoted})",
+    ]
+
+
+class PageIndex:
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        for statement in SCHEMA:
+            self.connection.execute(statement)
+
+    def __enter__(self) -> "PageIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add_pdf(self, pdf_path: Path, cache: Optional[PageCache] = None) -> bool:
+        key = str(pdf_path.resolve())
+        digest = file_sha256(pdf_path)
+        row = self.connection.execute("SELECT sha256 FROM documents WHERE path = ?", (key,)).fetchone()
+        if row and row[0] == digest:
+            return False
+        rows = [
+            (page_title(analysis["lines"]), "\n".join(analysis["lines"]), key, page_number)
+            for page_number, analysis in iter_page_analysis(pdf_path, cache)
+        ]
+        with self.connection:
+            self.connection.execute("DELETE FROM pages WHERE path = ?", (key,))
+            self.connection.executemany("INSERT INTO pages (title, body, path, page) VALUES (?, ?, ?, ?)", rows)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO documents (path, sha256, pages) VALUES (?, ?, ?)", (key, digest, len(rows))
+            )
+        return True
+
+    def update(self, pdf_paths: Iterable[Path], cache: Optional[PageCache] = None) -> Tuple[int, int]:
+        indexed = 0
+        unchanged = 0
+        for pdf_path in pdf_paths:
+            if self.add_pdf(pdf_path, cache):
+                indexed += 1
+            else:
+                unchanged += 1
+        return indexed, unchanged
+
+    def prune(self) -> int:
+        missing = [
+            path for (path,) in self.connection.execute("SELECT path FROM documents") if not Path(path).exists()
+        ]
+        with self.connection:
+            for path in missing:
+                self.connection.execute("DELETE FROM pages WHERE path = ?", (path,))
+                self.connection.execute("DELETE FROM documents WHERE path = ?", (path,))
+        return len(missing)
+
+    def find_pages(self, title: str, pdf_path: Optional[Path] = None) -> List[Tuple[str, int, str]]:
+        sql = "SELECT path, page, title FROM pages WHERE pages MATCH ?"
+        params: List[object] = []
+        if pdf_path is not None:
+            sql += " AND path = ?"
+            params.append(str(pdf_path.resolve()))
+        sql += " ORDER BY rank"
+        for query in match_queries(title):
+            found = self.connection.execute(sql, [query] + params).fetchall()
+            if found:
+                return [(path, int(page), heading) for path, page, heading in found]
+        return []
+
+
+def locate_pages(index: PageIndex, pdf_path: Path, title: str, cache: Optional[PageCache] = None) -> List[int]:
+    index.add_pdf(pdf_path, cache)
+    return sorted(page for _, page, _ in index.find_pages(title, pdf_path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build and query a full-text index of RBI PDF pages.")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX_PATH, help="Path to the SQLite index.")
+    parser.add_argument("--pdf-dir", type=Path, help="Index (or re-index changed) PDFs in this directory.")
+    parser.add_argument("--query", help="Print the pages whose table title matches this text.")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.pdf_dir and not args.query:
+        parser.error("Either --pdf-dir or --query is required.")
+
+    cache = cache_from_args(args)
+    with PageIndex(args.index) as index:
+        if args.pdf_dir:
+            start = time.perf_counter()
+            pdf_paths = sorted(path for path in args.pdf_dir.iterdir() if path.suffix.lower() == ".pdf")
+            indexed, unchanged = index.update(pdf_paths, cache)
+            removed = index.prune()
+            print(
+                f"Indexed {indexed} PDFs ({unchanged} unchanged, {removed} removed) "
+                f"in {time.perf_counter() - start:.2f}s -> {args.index}"
+            )
+        if args.query:
+            start = time.perf_counter()
+            found = index.find_pages(args.query)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for path, page, title in found:
+                print(f"{Path(path).name} p{page}: {title}")
+            print(f"{len(found)} pages in {elapsed_ms:.2f} ms")
+    finish_cache(cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pdfplumber
+from pdfplumber.page import Page
+
+from stage_trace import count, span
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "pages"
+DEFAULT_CACHE_MAX_MB = 512
+
+_SHA256_MEMO: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_sha256(path: Path) -> str:
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _SHA256_MEMO:
+        return _SHA256_MEMO[memo_key]
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    _SHA256_MEMO[memo_key] = digest.hexdigest()
+    return _SHA256_MEMO[memo_key]
+
+
+def settings_digest(kind: str, settings: Dict[str, object]) -> str:
+    key = json.dumps(
+        {"kind": kind, "settings": settings, "pdfplumber": pdfplumber.__version__},
+        sort_keys=True,
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+class PageCache:
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def entry_path(self, pdf_sha: str, page_number: int, kind: str, settings: Dict[str, object]) -> Path:
+        digest = settings_digest(kind, settings)
+        return self.root / pdf_sha[:2] / pdf_sha / f"{page_number:04d}_{kind}_{digest}.json"
+
+    def get(self, pdf_sha: str, page_number: int, kind: str, settings: Dict[str, object]) -> Optional[object]:
+        path = self.entry_path(pdf_sha, page_number, kind, settings)
+        try:
+            value = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, pdf_sha: str, page_number: int, kind: str, settings: Dict[str, object], value: object) -> None:
+        path = self.entry_path(pdf_sha, page_number, kind, settings)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(value, handle, separators=(",", ":"))
+        os.replace(tmp_name, path)
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        found = []
+        if not self.root.exists():
+            return found
+        for path in self.root.rglob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        return found
+
+    def evict(self) -> Tuple[int, int]:
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        freed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            freed += size
+            removed += 1
+        return removed, freed
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def release_page(pdf: pdfplumber.PDF, page: Page) -> None:
+    page.close()
+    # pdfminer keeps every resolved object (including decoded content streams)
+    # for the lifetime of the document; drop them once the page is done.
+    cached_objs = getattr(pdf.doc, "_cached_objs", None)
+    if isinstance(cached_objs, dict):
+        cached_objs.clear()
+
+
+class PlumberDocument:
+    # The page source interface used by iter_page_results: len(), page(n),
+    # release(page) and close(). Other sources live in text_backends.
+    name = "pdfplumber"
+
+    def __init__(self, pdf_path: Path) -> None:
+        self.pdf = pdfplumber.open(pdf_path)
+
+    def __len__(self) -> int:
+        return len(self.pdf.pages)
+
+    def page(self, page_number: int) -> Page:
+        return self.pdf.pages[page_number - 1]
+
+    def release(self, page: Page) -> None:
+        release_page(self.pdf, page)
+
+    def close(self) -> None:
+        self.pdf.close()
+
+
+def open_document(document_type: Callable[[Path], PlumberDocument], pdf_path: Path) -> PlumberDocument:
+    with span(f"{document_type.name}.open", "pdf", pdf=pdf_path.name):
+        return document_type(pdf_path)
+
+
+def iter_page_results(
+    pdf_path: Path,
+    kind: str,
+    settings: Dict[str, object],
+    extract: Callable[[Page], object],
+    cache: Optional[PageCache] = None,
+    pages: Optional[Iterable[int]] = None,
+    document_type: Callable[[Path], PlumberDocument] = PlumberDocument,
+    reuse: Optional[Tuple[str, Dict[str, object], Callable[[object], object]]] = None,
+) -> Iterator[Tuple[int, object]]:
+    # reuse is (kind, settings, derive): on a cache miss, a cached entry of
+    # that kind is converted with derive instead of extracting the page.
+    if cache is None:
+        pdf = open_document(document_type, pdf_path)
+        total_pages = len(pdf)
+        try:
+            for page_number in pages if pages is not None else range(1, total_pages + 1):
+                if page_number < 1 or page_number > total_pages:
+                    continue
+                with span("page", "page", page=page_number):
+                    page = pdf.page(page_number)
+                    with span(f"page.extract_{kind}", "pdf"):
+                        value = extract(page)
+                    pdf.release(page)
+                yield page_number, value
+        finally:
+            pdf.close()
+        return
+
+    pdf_sha = file_sha256(pdf_path)
+    pdf = None
+    try:
+        meta = cache.get(pdf_sha, 0, "meta", {})
+        if not isinstance(meta, dict) or "pages" not in meta:
+            pdf = open_document(document_type, pdf_path)
+            meta = {"pages": len(pdf)}
+            cache.put(pdf_sha, 0, "meta", {}, meta)
+        total_pages = int(meta["pages"])
+        for page_number in pages if pages is not None else range(1, total_pages + 1):
+            if page_number < 1 or page_number > total_pages:
+                continue
+            with span("page", "page", page=page_number):
+                value = cache.get(pdf_sha, page_number, kind, settings)
+                if value is None and reuse is not None:
+                    reused = cache.get(pdf_sha, page_number, reuse[0], reuse[1])
+                    if reused is not None:
+                        value = reuse[2](reused)
+                if value is None:
+                    if pdf is None:
+                        pdf = open_document(document_type, pdf_path)
+                    page = pdf.page(page_number)
+                    with span(f"page.extract_{kind}", "pdf"):
+                        value = extract(page)
+                    pdf.release(page)
+                    cache.put(pdf_sha, page_number, kind, settings, value)
+                else:
+                    count("cache_hits")
+            yield page_number, value
+    finally:
+        if pdf is not None:
+            pdf.close()
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Directory for the page cache.")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help="Evict least recently used cache entries beyond this size.",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Extract every page without the page cache.")
+    parser.add_argument("--clear-cache", action="store_true", help="Delete the page cache before running.")
+
+
+def cache_from_args(args: argparse.Namespace) -> Optional[PageCache]:
+    cache = PageCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    if args.clear_cache:
+        cache.clear()
+        print(f"Cleared page cache at {cache.root}")
+    if args.no_cache:
+        return None
+    return cache
+
+
+def finish_cache(cache: Optional[PageCache]) -> None:
+    if cache is None:
+        return
+    removed, freed = cache.evict()
+    if removed:
+        print(f"Evicted {removed} cache entries ({freed / (1024 * 1024):.1f} MB) from {cache.root}")
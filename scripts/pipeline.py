@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from build_rbi_datasets import (
+    DEFAULT_MANIFEST,
+    builder_code_version,
+    dataset_fingerprint,
+    dataset_outputs,
+    dataset_tables,
+    load_graph,
+    stop_years,
+    timed_build,
+    timed_parse,
+    write_dataset,
+)
+from build_state import BuildState
+from download_pdfs import (
+    STATE_FILENAME,
+    Backoff,
+    DownloadState,
+    download_pdf,
+    iter_urls,
+    make_session,
+    sanitize_filename,
+)
+from pdf_cache import add_cache_arguments, cache_from_args, file_sha256, finish_cache
+from text_backends import DEFAULT_TEXT_BACKEND, TEXT_BACKENDS
+from validate_pdfs import deep_validate
+
+
+# Sentinel that tells one stage worker to exit once its inbox is drained.
+DONE = object()
+
+
+class Stage:
+    # A pool of threads that take items from a bounded inbox and put the
+    # handler's results into the next stage's inbox. A full outbox blocks the
+    # worker, so a slow stage throttles everything upstream of it.
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        handler: Callable[[object], Iterable[object]],
+        inbox: "queue.Queue[object]",
+        outbox: Optional["queue.Queue[object]"] = None,
+    ) -> None:
+        self.name = name
+        self.workers = max(1, workers)
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self.lock = threading.Lock()
+        self.done = 0
+        self.failed = 0
+        self.busy = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_depth = 0
+        self.threads = [
+            threading.Thread(target=self.run, name=f"{name}-{index}", daemon=True) for index in range(self.workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self.threads:
+            thread.start()
+
+    def add_bytes(self, size: int) -> None:
+        with self.lock:
+            self.bytes += size
+
+    def run(self) -> None:
+        while True:
+            self.sample_depth()
+            item = self.inbox.get()
+            if item is DONE:
+                return
+            with self.lock:
+                self.busy += 1
+            start = time.perf_counter()
+            try:
+                results = list(self.handler(item))
+            except Exception as exc:  # one bad PDF must not stall the pipeline
+                print(f"{self.name} failed: {item}: {type(exc).__name__}: {exc}", flush=True)
+                results = None
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.busy -= 1
+                self.busy_seconds += elapsed
+                if results is None:
+                    self.failed += 1
+                else:
+                    self.done += 1
+            for result in results or []:
+                put_start = time.perf_counter()
+                self.outbox.put(result)
+                with self.lock:
+                    self.blocked_seconds += time.perf_counter() - put_start
+
+    def close(self) -> None:
+        for _ in self.threads:
+            self.inbox.put(DONE)
+        for thread in self.threads:
+            thread.join()
+
+    def sample_depth(self) -> int:
+        depth = self.inbox.qsize()
+        with self.lock:
+            self.max_depth = max(self.max_depth, depth)
+        return depth
+
+    def status(self) -> str:
+        depth = self.sample_depth()
+        with self.lock:
+            failed = f", {self.failed} failed" if self.failed else ""
+            busy = f"{self.busy}/{self.workers} busy"
+            return f"{self.name} {self.done}{failed} ({busy}, queue {depth}/{self.inbox.maxsize})"
+
+
+def report_progress(stages: List[Stage], start: float, interval: float, stop: threading.Event) -> None:
+    # Throughput is measured at validation, which every PDF passes through
+    # whether it was downloaded or already on disk.
+    validated = stages[1]
+    last_bytes, last_done, last_time = 0, 0, start
+    while not stop.wait(interval):
+        now = time.perf_counter()
+        with validated.lock:
+            total_bytes, done = validated.bytes, validated.done
+        window = now - last_time
+        line = " | ".join(stage.status() for stage in stages)
+        print(
+            f"[{now - start:6.1f}s] {line} | {(total_bytes - last_bytes) / window / (1024 * 1024):.2f} MB/s, "
+            f"{(done - last_done) / window:.1f} PDFs/s",
+            flush=True,
+        )
+        last_bytes, last_done, last_time = total_bytes, done, now
+
+
+def serve_directory(directory: Path) -> ThreadingHTTPServer:
+    # A local HTTP stand-in for the RBI site, for offline runs.
+    handler = partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, name="http-stand-in", daemon=True).start()
+    return server
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Download, validate, parse and build the RBI datasets as one streaming pipeline."
+    )
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Path to manifest.json.")
+    parser.add_argument(
+        "--pdf-dir",
+        type=Path,
+        help="Where PDFs are downloaded to and read from (defaults to the manifest's pdf_dir).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "src" / "data",
+        help="Output directory.",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--list", type=Path, help="Download the PDFs in this URL list (one URL per line).")
+    source.add_argument(
+        "--serve",
+        type=Path,
+        metavar="DIR",
+        help="Serve the PDFs in DIR over a local HTTP stand-in and download them from it.",
+    )
+    parser.add_argument("--fetch-workers", type=int, default=4, help="Parallel downloads.")
+    parser.add_argument("--validate-workers", type=int, default=2, help="Parallel deep validations.")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Parser processes (0 = one per CPU).")
+    parser.add_argument("--build-workers", type=int, default=1, help="Parallel dataset builds.")
+    parser.add_argument("--queue-size", type=int, default=4, help="Capacity of each queue between stages.")
+    parser.add_argument("--progress-interval", type=float, default=2.0, help="Seconds between progress lines.")
+    parser.add_argument("--timeout", type=int, default=30, help="Per-request timeout in seconds.")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per URL on 429/5xx or connection errors.")
+    parser.add_argument(
+        "--text-backend",
+        choices=sorted(TEXT_BACKENDS),
+        default=DEFAULT_TEXT_BACKEND,
+        help="Library used to read text lines from the PDFs.",
+    )
+    parser.add_argument(
+        "--early-exit",
+        action="store_true",
+        help="Stop reading a PDF once the blocks holding the years the datasets use are complete.",
+    )
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    tables, datasets = load_graph(args.manifest, args.pdf_dir)
+    pdf_dir = args.pdf_dir or next(iter(tables.values())).parent
+    if args.serve and args.serve.resolve() == pdf_dir.resolve():
+        raise SystemExit("--serve must point at a different directory than --pdf-dir")
+    cache = cache_from_args(args)
+    targets = stop_years(datasets, tables) if args.early_exit else {}
+    needs = {dataset["name"]: dataset_tables(dataset) for dataset in datasets}
+    wanted: Set[Path] = {tables[name] for names in needs.values() for name in names}
+    parse_workers = args.parse_workers if args.parse_workers > 0 else (os.cpu_count() or 1)
+
+    server = None
+    if args.serve:
+        server = serve_directory(args.serve)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/{path.name}" for path in sorted(args.serve.iterdir()) if path.suffix.lower() == ".pdf"]
+    elif args.list:
+        urls = list(iter_urls(args.list))
+    else:
+        urls = []
+
+    # State shared by the parse and build stages. Handlers run on several
+    # threads, so every access holds graph_lock.
+    graph_lock = threading.Lock()
+    parsed: Dict[Path, object] = {}
+    submitted: Set[str] = set()
+    written: List[str] = []
+
+    session = make_session(args.fetch_workers)
+    download_state = DownloadState(pdf_dir / STATE_FILENAME)
+    backoff = Backoff()
+    executor = ProcessPoolExecutor(max_workers=parse_workers)
+    build_state = BuildState(args.output_dir)
+    code = builder_code_version()
+
+    def fetch(url: str) -> Iterable[Path]:
+        output_path = pdf_dir / sanitize_filename(url)
+        status, received = download_pdf(
+            url, output_path, args.timeout, session, download_state, backoff, args.max_retries
+        )
+        stages[0].add_bytes(received)
+        if status not in {"downloaded", "unchanged"}:
+            raise RuntimeError(f"download {status}")
+        yield output_path
+
+    def validate(path: Path) -> Iterable[Path]:
+        result = deep_validate(path)
+        validate_stage.add_bytes(int(result["size"]))
+        if result.get("error"):
+            raise ValueError(result["error"])
+        if path in wanted:
+            yield path
+
+    def parse(path: Path) -> Iterable[Dict[str, object]]:
+        series, _ = executor.submit(timed_parse, path, cache, args.text_backend, targets.get(path)).result()
+        parse_stage.add_bytes(path.stat().st_size)
+        ready = []
+        with graph_lock:
+            parsed[path] = series
+            for dataset in datasets:
+                name = dataset["name"]
+                if name not in submitted and all(tables[table] in parsed for table in needs[name]):
+                    submitted.add(name)
+                    ready.append(dataset)
+        return ready
+
+    def build(dataset: Dict[str, object]) -> Iterable[object]:
+        with graph_lock:
+            inputs = {name: parsed[tables[name]] for name in needs[dataset["name"]]}
+        payload, _ = timed_build(dataset, inputs)
+        write_dataset(payload, args.output_dir / dataset["output"])
+        current = dataset_fingerprint(dataset, tables, file_sha256, code, args.text_backend, args.early_exit)
+        with graph_lock:
+            build_state.record(dataset["output"], current, dataset_outputs(dataset))
+            written.append(dataset["output"])
+        print(f"Wrote {dataset['output']}", flush=True)
+        return []
+
+    queues = [queue.Queue(maxsize=max(1, args.queue_size)) for _ in range(4)]
+    fetch_stage = Stage("fetch", args.fetch_workers, fetch, queues[0], queues[1])
+    validate_stage = Stage("validate", args.validate_workers, validate, queues[1], queues[2])
+    parse_stage = Stage("parse", parse_workers, parse, queues[2], queues[3])
+    build_stage = Stage("build", args.build_workers, build, queues[3])
+    stages = [fetch_stage, validate_stage, parse_stage, build_stage]
+
+    start = time.perf_counter()
+    stop = threading.Event()
+    reporter = threading.Thread(
+        target=report_progress, args=(stages, start, args.progress_interval, stop), name="progress", daemon=True
+    )
+    for stage in stages:
+        stage.start()
+    reporter.start()
+    try:
+        if urls:
+            for url in urls:
+                queues[0].put(url)
+        else:
+            # Offline: the PDFs already in --pdf-dir enter at validation.
+            missing = [path.name for path in sorted(wanted) if not path.exists()]
+            if missing:
+                print(f"Missing from {pdf_dir}: {', '.join(missing)}", flush=True)
+            for path in sorted(wanted):
+                if path.exists():
+                    queues[1].put(path)
+        for stage in stages:
+            stage.close()
+    finally:
+        stop.set()
+        reporter.join()
+        executor.shutdown()
+        session.close()
+        download_state.save()
+        build_state.save()
+        if server:
+            server.shutdown()
+    elapsed = time.perf_counter() - start
+
+    print(f"Pipeline finished in {elapsed:.2f}s:")
+    for stage in stages:
+        rate = stage.bytes / stage.busy_seconds / (1024 * 1024) if stage.busy_seconds else 0.0
+        print(
+            f"  {stage.name:8} {stage.done} done, {stage.failed} failed, {stage.workers} workers, "
+            f"busy {stage.busy_seconds:.2f}s ({rate:.2f} MB/s per worker), "
+            f"blocked on a full queue {stage.blocked_seconds:.2f}s, max queue depth {stage.max_depth}"
+        )
+    skipped = [dataset["output"] for dataset in datasets if dataset["output"] not in written]
+    print(f"Built {len(written)} datasets: {', '.join(sorted(written)) or '-'}")
+    if skipped:
+        print(f"Skipped (inputs missing or failed): {', '.join(skipped)}")
+    finish_cache(cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import operator
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from state_dimension import StateDimension, load_state_dimension
+
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "src" / "data"
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_RELOAD_INTERVAL = 1.0
+
+WHERE_RE = re.compile(r"^\s*([\w.]+)\s*(>=|<=|!=|=|>|<)\s*(.+?)\s*$")
+COMPARISONS: Dict[str, Callable[[object, object], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+    "!=": operator.ne,
+}
+
+# A query is a frozen, canonical tuple of (key, values) pairs so it can key
+# the result cache: ("dataset", ("banking",)), ("region", ("East",)), ...
+Query = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+class QueryError(ValueError):
+    pass
+
+
+class DatasetIndex:
+    def __init__(self, name: str, payload: Dict[str, object], dimension: StateDimension) -> None:
+        self.name = name
+        self.meta = {key: value for key, value in payload.items() if key not in {"data", "national"}}
+        self.national = payload.get("national", {})
+        self.rows: List[Dict[str, object]] = []
+        self.by_code: Dict[str, int] = {}
+        self.by_region: Dict[str, List[int]] = {}
+        for row in payload.get("data", []):
+            code = dimension.code(str(row.get("state", "")))
+            indexed = dict(row)
+            indexed["code"] = code
+            indexed["region"] = dimension.region(code) if code else None
+            position = len(self.rows)
+            self.rows.append(indexed)
+            if code:
+                self.by_code.setdefault(code, position)
+                self.by_region.setdefault(indexed["region"], []).append(position)
+        self.fields = [
+            field
+            for field in dict.fromkeys(field for row in self.rows for field in row)
+            if any(is_number(row.get(field)) for row in self.rows)
+        ]
+        self.columns = set(field for row in self.rows for field in row)
+        # Row positions ordered by each indicator, largest first, rows without
+        # a value left out: a top-k query walks one list and stops at k.
+        self.ranked: Dict[str, List[int]] = {
+            field: sorted(
+                (position for position, row in enumerate(self.rows) if is_number(row.get(field))),
+                key=lambda position: self.rows[position][field],
+                reverse=True,
+            )
+            for field in self.fields
+        }
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "dataset": self.name,
+            "title": self.meta.get("title", self.name),
+            "year": self.meta.get("year"),
+            "rows": len(self.rows),
+            "fields": self.fields,
+            "regions": sorted(self.by_region),
+        }
+
+
+def is_number(value: object) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_field(field: str, base: DatasetIndex, joined: List[DatasetIndex]) -> None:
+    name, _, column = field.rpartition(".")
+    if not name:
+        if column not in base.columns:
+            raise QueryError(f"{base.name} has no field {field!r} (fields: {', '.join(base.fields)})")
+        return
+    for other in joined:
+        if other.name == name:
+            if column not in other.columns:
+                raise QueryError(f"{name} has no field {column!r} (fields: {', '.join(other.fields)})")
+            return
+    raise QueryError(f"{field}: {name!r} is not joined (add join={name})")
+
+
+def parse_where(expression: str) -> Tuple[str, Callable[[object, object], bool], object]:
+    match = WHERE_RE.match(expression)
+    if not match:
+        raise QueryError(f"where: cannot parse {expression!r} (expected e.g. cdRatio>80)")
+    field, op, raw = match.groups()
+    try:
+        value: object = float(raw)
+    except ValueError:
+        value = raw
+    return field, COMPARISONS[op], value
+
+
+def canonical_query(params: Dict[str, Iterable[str]]) -> Query:
+    # Splits comma lists and sorts the keys, so equivalent URLs and CLI calls
+    # share one cache entry.
+    query: Dict[str, Tuple[str, ...]] = {}
+    for key, values in params.items():
+        items: List[str] = []
+        for value in values:
+            items.extend(value.split(",") if key != "where" else [value])
+        items = [item.strip() for item in items if item.strip()]
+        if items:
+            query[key] = tuple(sorted(items)) if key in {"state", "region", "where"} else tuple(items)
+    return tuple(sorted(query.items()))
+
+
+class QueryEngine:
+    def __init__(
+        self,
+        data_dir: Path = DEFAULT_DATA_DIR,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        reload_interval: float = DEFAULT_RELOAD_INTERVAL,
+    ) -> None:
+        self.data_dir = data_dir
+        self.reload_interval = reload_interval
+        self.dimension = load_state_dimension()
+        self.datasets: Dict[str, DatasetIndex] = {}
+        self.signatures: Dict[Path, Tuple[int, int]] = {}
+        self.lock = threading.Lock()
+        self.checked = 0.0
+        self.reloads = 0
+        self.generation = 0
+        self.cached = lru_cache(maxsize=cache_size)(self.execute_at)
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> List[str]:
+        # Hot reload: stat the dataset files at most once per reload_interval
+        # and re-index only the ones whose size or mtime changed.
+        now = time.monotonic()
+        if not force and now - self.checked < self.reload_interval:
+            return []
+        with self.lock:
+            if not force and now - self.checked < self.reload_interval:
+                return []
+            self.checked = now
+            current: Dict[Path, Tuple[int, int]] = {}
+            for path in sorted(self.data_dir.glob("*.json")):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                current[path] = (stat.st_mtime_ns, stat.st_size)
+            if current == self.signatures:
+                return []
+            datasets = dict(self.datasets)
+            changed = []
+            for path in set(self.signatures) - set(current):
+                datasets.pop(path.stem, None)
+                changed.append(path.stem)
+            for path, signature in current.items():
+                if self.signatures.get(path) == signature:
+                    continue
+                try:
+                    payload = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    # Probably mid-write; keep the old index and retry next check.
+                    current[path] = self.signatures.get(path, (0, 0))
+                    continue
+                if isinstance(payload, dict) and isinstance(payload.get("data"), list):
+                    datasets[path.stem] = DatasetIndex(path.stem, payload, self.dimension)
+                    changed.append(path.stem)
+            self.signatures = current
+            if changed:
+                # The generation moves only after the swap (see query()).
+                self.datasets = datasets
+                self.generation += 1
+                self.cached.cache_clear()
+                self.reloads += 1
+            return changed
+
+    def query(self, params: Dict[str, Iterable[str]]) -> Dict[str, object]:
+        # The index generation is part of the cache key. It is read before
+        # execute() reads self.datasets, so a result cached under generation
+        # g was computed on index g or newer; a request racing a reload can
+        # only add an entry under an old generation that is never asked for.
+        self.refresh()
+        return self.cached(self.generation, canonical_query(params))
+
+    def execute_at(self, generation: int, query: Query) -> Dict[str, object]:
+        return self.execute(query)
+
+    def dataset(self, name: str) -> DatasetIndex:
+        if name not in self.datasets:
+            raise QueryError(f"unknown dataset {name!r} (have: {', '.join(sorted(self.datasets))})")
+        return self.datasets[name]
+
+    def execute(self, query: Query) -> Dict[str, object]:
+        spec = dict(query)
+        unknown = set(spec) - {"dataset", "state", "region", "where", "sort", "order", "top", "fields", "join"}
+        if unknown:
+            raise QueryError(f"unknown parameters: {', '.join(sorted(unknown))}")
+        if "dataset" not in spec:
+            raise QueryError("dataset is required")
+        base = self.dataset(spec["dataset"][0])
+        joined = [self.dataset(name) for name in spec.get("join", ())]
+
+        if "state" in spec:
+            codes = [self.dimension.code(state) for state in spec["state"]]
+            candidates = sorted({base.by_code[code] for code in codes if code in base.by_code})
+        elif "region" in spec:
+            candidates = sorted({position for region in spec["region"] for position in base.by_region.get(region, [])})
+        else:
+            candidates = list(range(len(base.rows)))
+
+        def value(position: int, field: str) -> object:
+            row = base.rows[position]
+            if "." in field:
+                name, _, column = field.partition(".")
+                for other in joined:
+                    if other.name == name:
+                        match = other.by_code.get(row["code"])
+                        return other.rows[match].get(column) if match is not None else None
+            return row.get(field)
+
+        filters = [parse_where(expression) for expression in spec.get("where", ())]
+        for field in [name for name, _, _ in filters] + list(spec.get("sort", ())) + list(spec.get("fields", ())):
+            check_field(field, base, joined)
+
+        def keep(position: int) -> bool:
+            for field, compare, target in filters:
+                current = value(position, field)
+                if current is None:
+                    return False
+                if is_number(current) != isinstance(target, float):
+                    current, target = str(current), str(target)
+                if not compare(current, target):
+                    return False
+            return True
+
+        sort = spec.get("sort", (None,))[0]
+        descending = spec.get("order", ("desc",))[0] != "asc"
+        try:
+            top = int(spec["top"][0]) if "top" in spec else None
+        except ValueError:
+            raise QueryError(f"top must be an integer, got {spec['top'][0]!r}")
+        if top is not None and top < 0:
+            raise QueryError(f"top must not be negative, got {top}")
+
+        if sort in base.ranked:
+            # Walk the precomputed ranking and stop once top-k rows passed.
+            allowed = set(candidates)
+            order = base.ranked[sort] if descending else base.ranked[sort][::-1]
+            selected = []
+            for position in order:
+                if top is not None and len(selected) >= top:
+                    break
+                if position in allowed and keep(position):
+                    selected.append(position)
+        else:
+            selected = [position for position in candidates if keep(position)]
+            if sort:
+                ranked = [position for position in selected if value(position, sort) is not None]
+                selected = sorted(ranked, key=lambda position: value(position, sort), reverse=descending)
+            if top is not None:
+                selected = selected[:top]
+
+        columns = list(spec.get("fields", ()))
+        rows = []
+        for position in selected:
+            row = base.rows[position]
+            output = {"state": row.get("state"), "code": row["code"], "region": row["region"]}
+            for field in columns or [field for field in row if field not in output]:
+                output[field] = value(position, field)
+            if not columns:
+                for other in joined:
+                    match = other.by_code.get(row["code"])
+                    for field in other.fields:
+                        output[f"{other.name}.{field}"] = other.rows[match].get(field) if match is not None else None
+            rows.append(output)
+        return {
+            "dataset": base.name,
+            "year": base.meta.get("year"),
+            "count": len(rows),
+            "rows": rows,
+            "national": base.national,
+        }
+
+    def stats(self) -> Dict[str, object]:
+        info = self.cached.cache_info()
+        return {
+            "datasets": sorted(self.datasets),
+            "reloads": self.reloads,
+            "cache": {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize},
+        }
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps client connections open between queries; without Nagle,
+    # the body is not held back waiting for the client's delayed ACK.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    engine: QueryEngine
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            if url.path == "/query":
+                self.respond(200, self.engine.query(parse_qs(url.query)))
+            elif url.path == "/datasets":
+                self.engine.refresh()
+                self.respond(200, [index.describe() for index in self.engine.datasets.values()])
+            elif url.path == "/stats":
+                self.respond(200, self.engine.stats())
+            else:
+                self.respond(404, {"error": f"unknown path {url.path} (use /query, /datasets or /stats)"})
+        except QueryError as error:
+            self.respond(400, {"error": str(error)})
+
+    def respond(self, status: int, body: object) -> None:
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def make_server(engine: QueryEngine, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    handler = type("BoundQueryHandler", (QueryHandler,), {"engine": engine})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def cli_params(args: argparse.Namespace) -> Dict[str, List[str]]:
+    params: Dict[str, List[str]] = {"dataset": [args.dataset]}
+    for key in ("state", "region", "where", "fields", "join"):
+        if getattr(args, key):
+            params[key] = getattr(args, key)
+    if args.sort:
+        params["sort"] = [args.sort]
+    params["order"] = ["asc" if args.asc else "desc"]
+    if args.top is not None:
+        params["top"] = [str(args.top)]
+    return params
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the generated datasets from the command line or over HTTP.")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Directory of dataset JSON files.")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="Cached query results (LRU).")
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=DEFAULT_RELOAD_INTERVAL,
+        help="Seconds between checks for changed dataset files.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Serve GET /query, /datasets and /stats as JSON.")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+    serve.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+
+    query = commands.add_parser("query", help="Run one query and print the JSON result.")
+    query.add_argument("dataset", help="Dataset name, e.g. banking.")
+    query.add_argument("--state", action="append", help="Only these states (names or codes; repeatable).")
+    query.add_argument("--region", action="append", help="Only states in these regions (repeatable).")
+    query.add_argument("--where", action="append", help="Filter such as 'cdRatio>80' (repeatable).")
+    query.add_argument("--sort", help="Field to sort by; joined fields are written dataset.field.")
+    query.add_argument("--asc", action="store_true", help="Sort ascending (default descending).")
+    query.add_argument("--top", type=int, help="Keep the first N rows after sorting.")
+    query.add_argument("--fields", action="append", help="Fields to return (repeatable; default all).")
+    query.add_argument("--join", action="append", help="Join another dataset on state (repeatable).")
+
+    commands.add_parser("datasets", help="List the loaded datasets and their fields.")
+    args = parser.parse_args()
+
+    engine = QueryEngine(args.data_dir, args.cache_size, args.reload_interval)
+    if args.command == "query":
+        try:
+            print(json.dumps(engine.query(cli_params(args)), indent=2, ensure_ascii=False))
+        except QueryError as error:
+            raise SystemExit(f"query error: {error}")
+    elif args.command == "datasets":
+        print(json.dumps([index.describe() for index in engine.datasets.values()], indent=2))
+    else:
+        server = make_server(engine, args.host, args.port)
+        print(f"Serving {len(engine.datasets)} datasets from {args.data_dir} on http://{args.host}:{args.port}/query")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "src" / "data"
+DEFAULT_RELEASE_DIR = Path(__file__).resolve().parent.parent / "public" / "data"
+ASSET_MANIFEST = "asset-manifest.json"
+HASH_LENGTH = 10
+HASHED_NAME_RE = re.compile(r"^(?P<stem>.+)\.[0-9a-f]{%d}\.json(?:\.gz)?$" % HASH_LENGTH)
+
+
+def minify(payload: object) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+def hashed_name(name: str, digest: str) -> str:
+    stem = name[: -len(".json")] if name.endswith(".json") else name
+    return f"{stem}.{digest[:HASH_LENGTH]}.json"
+
+
+def load_data_payloads(data_dir: Path) -> Dict[str, object]:
+    # The published datasets in a data directory (top level and series/),
+    # keyed by their path relative to it. Dotfiles are builder bookkeeping.
+    return {
+        path.relative_to(data_dir).as_posix(): json.loads(path.read_text(encoding="utf-8"))
+        for path in sorted(data_dir.glob("*.json")) + sorted(data_dir.glob("series/*.json"))
+        if not path.name.startswith(".")
+    }
+
+
+def write_asset(path: Path, data: bytes) -> None:
+    # Hashed names never change content, so a file of the right size is
+    # complete; anything else (missing, partial) is rewritten atomically.
+    try:
+        if path.stat().st_size == len(data):
+            return
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_name, path)
+
+
+def add_release_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--release",
+        action="store_true",
+        help="Also write minified, gzipped, content-hashed copies plus an asset manifest to --release-dir.",
+    )
+    parser.add_argument(
+        "--release-dir",
+        type=Path,
+        default=DEFAULT_RELEASE_DIR,
+        help="Output directory for release assets.",
+    )
+
+
+def write_release(payloads: Dict[str, object], release_dir: Path) -> List[Tuple[str, int, int, int]]:
+    release_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = release_dir / ASSET_MANIFEST
+    try:
+        assets: Dict[str, Dict[str, object]] = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        assets = {}
+
+    report = []
+    for name, payload in payloads.items():
+        if payload is None:
+            # A dataset with no output yet keeps whatever the manifest had.
+            continue
+        data = minify(payload)
+        digest = hashlib.sha256(data).hexdigest()
+        filename = hashed_name(name, digest)
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        target = release_dir / filename
+        write_asset(target, data)
+        write_asset(target.with_name(target.name + ".gz"), compressed)
+        assets[name] = {
+            "file": filename,
+            "gzip": filename + ".gz",
+            "sha256": digest,
+            "bytes": len(data),
+            "gzipBytes": len(compressed),
+        }
+        report.append((name, len(json.dumps(payload, indent=2).encode("utf-8")), len(data), len(compressed)))
+
+    live = {release_dir / entry[key] for entry in assets.values() for key in ("file", "gzip")}
+    for path in release_dir.rglob("*.json*"):
+        if path not in live and HASHED_NAME_RE.match(path.name):
+            path.unlink()
+    manifest_path.write_text(json.dumps(assets, indent=2, sort_keys=True), encoding="utf-8")
+    return report
+
+
+def print_release_report(report: List[Tuple[str, int, int, int]], release_dir: Path) -> None:
+    print(f"Release assets ({release_dir / ASSET_MANIFEST}):")
+    for name, pretty, minified, compressed in report:
+        print(
+            f"  {name}: indent=2 {pretty:,} B -> minified {minified:,} B -> gzip {compressed:,} B "
+            f"(saved {pretty - compressed:,} B, {(1 - compressed / pretty) * 100 if pretty else 0:.1f}%)"
+        )
+    pretty_total = sum(row[1] for row in report)
+    compressed_total = sum(row[3] for row in report)
+    print(f"  total: {pretty_total:,} B -> {compressed_total:,} B gzip (saved {pretty_total - compressed_total:,} B)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Write minified, gzip-precompressed, content-hashed copies of the dataset JSON."
+    )
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Directory with the dataset JSON.")
+    parser.add_argument(
+        "--release-dir",
+        type=Path,
+        default=DEFAULT_RELEASE_DIR,
+        help="Output directory for release assets.",
+    )
+    args = parser.parse_args()
+
+    print_release_report(write_release(load_data_payloads(args.data_dir), args.release_dir), args.release_dir)
+
+
+if __name__ == "__main__":
+    main()
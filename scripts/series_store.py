@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+MAGIC = b"RBISERS1"
+PREAMBLE = struct.Struct("<8sQ")
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent / "outputs" / "series.store"
+
+Series = Tuple[List[str], Dict[str, List[Optional[float]]]]
+
+
+def align(offset: int, boundary: int = 8) -> int:
+    return (offset + boundary - 1) // boundary * boundary
+
+
+def write_store(path: Path, tables: Dict[str, Series]) -> int:
+    header: Dict[str, Dict[str, object]] = {}
+    blocks: List[bytes] = []
+    offset = 0
+    for name, (years, rows) in tables.items():
+        states = list(rows)
+        values = array("d")
+        mask = bytearray()
+        for state in states:
+            for value in rows[state]:
+                values.append(math.nan if value is None else value)
+                mask.append(0 if value is None else 1)
+        values_bytes = values.tobytes()
+        header[name] = {
+            "states": states,
+            "years": list(years),
+            "values": offset,
+            "mask": offset + len(values_bytes),
+        }
+        blocks.append(values_bytes)
+        blocks.append(bytes(mask))
+        offset = align(offset + len(values_bytes) + len(mask))
+        blocks.append(b"\0" * (offset - header[name]["mask"] - len(mask)))
+
+    header_bytes = json.dumps({"byteorder": sys.byteorder, "tables": header}, separators=(",", ":")).encode("utf-8")
+    data_start = align(PREAMBLE.size + len(header_bytes))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        handle.write(PREAMBLE.pack(MAGIC, len(header_bytes)))
+        handle.write(header_bytes)
+        handle.write(b"\0" * (data_start - PREAMBLE.size - len(header_bytes)))
+        for block in blocks:
+            handle.write(block)
+    return data_start + offset
+
+
+class StoreTable:
+    def __init__(self, buffer: memoryview, data_start: int, spec: Dict[str, object]) -> None:
+        self.states: List[str] = list(spec["states"])
+        self.years: List[str] = list(spec["years"])
+        self.state_index = {state: index for index, state in enumerate(self.states)}
+        self.year_index = {year: index for index, year in enumerate(self.years)}
+        size = len(self.states) * len(self.years)
+        values_start = data_start + int(spec["values"])
+        mask_start = data_start + int(spec["mask"])
+        self.values = buffer[values_start : values_start + size * 8].cast("d")
+        self.mask = buffer[mask_start : mask_start + size]
+
+    def cell(self, row: int, column: int) -> Optional[float]:
+        index = row * len(self.years) + column
+        return self.values[index] if self.mask[index] else None
+
+    def row(self, row: int) -> List[Optional[float]]:
+        width = len(self.years)
+        start = row * width
+        values = self.values[start : start + width].tolist()
+        mask = self.mask[start : start + width]
+        return [value if present else None for value, present in zip(values, mask)]
+
+    def release(self) -> None:
+        self.values.release()
+        self.mask.release()
+
+
+class SeriesStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.handle = path.open("rb")
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self) -> None:
+        path = self.path
+        size = os.fstat(self.handle.fileno()).st_size
+        # Checked before mmap, which refuses empty files, and before unpacking.
+        if size < PREAMBLE.size or self.handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a series store")
+        self.mmap = mmap.mmap(self.handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mmap)
+        _, header_size = PREAMBLE.unpack_from(self.mmap, 0)
+        if PREAMBLE.size + header_size > size:
+            raise ValueError(f"{path} is truncated (header runs past the end of the file)")
+        try:
+            header = json.loads(bytes(self.buffer[PREAMBLE.size : PREAMBLE.size + header_size]).decode("utf-8"))
+        except ValueError:
+            raise ValueError(f"{path} has a corrupt header")
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{path} was written on a {header.get('byteorder')}-endian machine")
+        data_start = align(PREAMBLE.size + header_size)
+        for name, spec in header["tables"].items():
+            cells = len(spec["states"]) * len(spec["years"])
+            if data_start + max(int(spec["values"]) + cells * 8, int(spec["mask"]) + cells) > size:
+                raise ValueError(f"{path} is truncated (table {name!r} runs past the end of the file)")
+        self._tables = {
+            name: StoreTable(self.buffer, data_start, spec) for name, spec in header["tables"].items()
+        }
+
+    def __enter__(self) -> "SeriesStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Safe on a store whose constructor failed part-way.
+        for table in getattr(self, "_tables", {}).values():
+            table.release()
+        if hasattr(self, "buffer"):
+            self.buffer.release()
+        if hasattr(self, "mmap"):
+            self.mmap.close()
+        self.handle.close()
+
+    def tables(self) -> List[str]:
+        return list(self._tables)
+
+    def years(self, table: str) -> List[str]:
+        return list(self._tables[table].years)
+
+    def states(self, table: str) -> List[str]:
+        return list(self._tables[table].states)
+
+    def get_series(self, table: str, state: str) -> List[Optional[float]]:
+        store_table = self._tables[table]
+        return store_table.row(store_table.state_index[state])
+
+    def get_year(self, table: str, year: str) -> Dict[str, Optional[float]]:
+        store_table = self._tables[table]
+        column = store_table.year_index[year]
+        return {state: store_table.cell(row, column) for row, state in enumerate(store_table.states)}
+
+    def get_value(self, table: str, state: str, year: str) -> Optional[float]:
+        store_table = self._tables[table]
+        return store_table.cell(store_table.state_index[state], store_table.year_index[year])
+
+    def as_series(self, table: str) -> Series:
+        store_table = self._tables[table]
+        rows = {state: store_table.row(index) for index, state in enumerate(store_table.states)}
+        return list(store_table.years), rows
+
+
+def open_store(path: Path = DEFAULT_STORE_PATH) -> SeriesStore:
+    return SeriesStore(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the columnar series store of parsed RBI tables.")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE_PATH, help="Path to the series store file.")
+    parser.add_argument("--table", help="Table to query (manifest table name).")
+    parser.add_argument("--state", help="Print this state's full series from --table.")
+    parser.add_argument("--year", help="Print every state's value for this year from --table.")
+    args = parser.parse_args()
+
+    with open_store(args.store) as store:
+        if not args.table:
+            for table in store.tables():
+                print(f"{table}: {len(store.states(table))} states x {len(store.years(table))} years")
+            return
+        if args.state:
+            print(json.dumps(dict(zip(store.years(args.table), store.get_series(args.table, args.state)))))
+        if args.year:
+            print(json.dumps(store.get_year(args.table, args.year), indent=2))
+        if not args.state and not args.year:
+            print(f"{args.table}: {len(store.states(args.table))} states x {len(store.years(args.table))} years")
+
+
+if __name__ == "__main__":
+    main()
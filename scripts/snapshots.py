@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from release_assets import DEFAULT_DATA_DIR, load_data_payloads, minify
+
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / "public" / "data" / "snapshots"
+INDEX_FILENAME = "index.json"
+LABEL_RE = re.compile(r"^[\w.-]+$")
+
+# Cell keys are tuples: ("data", state, field) and ("national", field) for
+# dataset payloads, (year, state, field) for series payloads.
+Cells = Dict[Tuple[str, ...], object]
+
+MISSING = object()
+
+
+def label_path(snapshot_dir: Path, label: str) -> Path:
+    return snapshot_dir / "snapshots" / f"{label}.json"
+
+
+def object_path(snapshot_dir: Path, digest: str) -> Path:
+    return snapshot_dir / "objects" / digest[:2] / f"{digest}.json"
+
+
+def delta_path(snapshot_dir: Path, parent: str, label: str) -> Path:
+    return snapshot_dir / "deltas" / f"{label}.from-{parent}.json"
+
+
+def read_json(path: Path) -> object:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_index(snapshot_dir: Path) -> Dict[str, object]:
+    try:
+        return read_json(snapshot_dir / INDEX_FILENAME)
+    except (OSError, ValueError):
+        return {"latest": None, "snapshots": []}
+
+
+def load_snapshot(snapshot_dir: Path, label: str) -> Dict[str, object]:
+    path = label_path(snapshot_dir, label)
+    if not path.exists():
+        raise SystemExit(f"No snapshot {label!r} in {snapshot_dir}")
+    return read_json(path)
+
+
+def load_shard(snapshot_dir: Path, digest: str) -> object:
+    return read_json(object_path(snapshot_dir, digest))
+
+
+def payload_kind(payload: object) -> str:
+    if not isinstance(payload, dict):
+        return "replace"
+    rows = payload.get("data")
+    if isinstance(rows, list) and all(isinstance(row, dict) and "state" in row for row in rows):
+        return "table"
+    if isinstance(payload.get("fields"), dict) and "years" in payload and "states" in payload:
+        return "series"
+    return "replace"
+
+
+def split_payload(payload: Dict[str, object], kind: str) -> Tuple[Dict[str, object], Dict[str, object], Cells]:
+    # A payload as (meta, axes, cells): the top-level keys that are not
+    # cells, the row/column labels in order, and one entry per value.
+    cells: Cells = {}
+    if kind == "table":
+        meta = {key: value for key, value in payload.items() if key not in {"data", "national"}}
+        for row in payload["data"]:
+            for field, value in row.items():
+                if field != "state":
+                    cells[("data", row["state"], field)] = value
+        for field, value in (payload.get("national") or {}).items():
+            cells[("national", field)] = value
+        axes = {"states": [row["state"] for row in payload["data"]], "national": "national" in payload}
+        return meta, axes, cells
+    meta = {key: value for key, value in payload.items() if key not in {"years", "states", "fields"}}
+    for field, by_year in payload["fields"].items():
+        for year, column in zip(payload["years"], by_year):
+            for state, value in zip(payload["states"], column):
+                if value is not None:
+                    cells[(year, state, field)] = value
+    axes = {"years": payload["years"], "states": payload["states"], "fields": list(payload["fields"])}
+    return meta, axes, cells
+
+
+def join_payload(meta: Dict[str, object], axes: Dict[str, object], cells: Cells, kind: str) -> Dict[str, object]:
+    payload = dict(meta)
+    if kind == "table":
+        rows: Dict[str, Dict[str, object]] = {state: {"state": state} for state in axes["states"]}
+        national: Dict[str, object] = {}
+        for key, value in cells.items():
+            if key[0] == "data":
+                rows[key[1]][key[2]] = value
+            else:
+                national[key[1]] = value
+        payload["data"] = [rows[state] for state in axes["states"]]
+        if axes["national"]:
+            payload["national"] = national
+        return payload
+    payload["years"] = axes["years"]
+    payload["states"] = axes["states"]
+    payload["fields"] = {
+        field: [[cells.get((year, state, field)) for state in axes["states"]] for year in axes["years"]]
+        for field in axes["fields"]
+    }
+    return payload
+
+
+def payload_delta(old: object, new: object, digest: str) -> Dict[str, object]:
+    # Changed cells only. The delta is checked by applying it: anything it
+    # cannot reproduce exactly is shipped as a whole replacement shard.
+    kind = payload_kind(new)
+    if kind == "replace" or payload_kind(old) != kind:
+        return {"kind": "replace", "shard": digest}
+    old_meta, old_axes, old_cells = split_payload(old, kind)
+    new_meta, new_axes, new_cells = split_payload(new, kind)
+    delta: Dict[str, object] = {"kind": kind, "shard": digest}
+    meta = {key: value for key, value in new_meta.items() if old_meta.get(key, MISSING) != value}
+    if meta:
+        delta["meta"] = meta
+    dropped = [key for key in old_meta if key not in new_meta]
+    if dropped:
+        delta["metaRemoved"] = dropped
+    if old_axes != new_axes:
+        delta["axes"] = new_axes
+    delta["cells"] = [
+        [*key, old_cells.get(key), value]
+        for key, value in new_cells.items()
+        if key not in old_cells or old_cells[key] != value or type(old_cells[key]) is not type(value)
+    ]
+    delta["removed"] = [[*key, value] for key, value in old_cells.items() if key not in new_cells]
+    if minify(apply_payload_delta(old, delta)) != minify(new):
+        return {"kind": "replace", "shard": digest}
+    return delta
+
+
+def apply_payload_delta(old: object, delta: Dict[str, object]) -> object:
+    kind = delta["kind"]
+    meta, axes, cells = split_payload(old, kind)
+    meta.update(delta.get("meta", {}))
+    for key in delta.get("metaRemoved", []):
+        meta.pop(key, None)
+    axes = delta.get("axes", axes)
+    for entry in delta.get("removed", []):
+        cells.pop(tuple(entry[:-1]), None)
+    for entry in delta.get("cells", []):
+        cells[tuple(entry[:-2])] = entry[-1]
+    return join_payload(meta, axes, cells, kind)
+
+
+def write_snapshot(payloads: Dict[str, object], label: str, snapshot_dir: Path) -> Dict[str, object]:
+    # Records payloads (logical name -> JSON) as snapshot `label`. A new label
+    # starts from the latest snapshot, so names this build did not produce
+    # carry over, mirroring the data directory the builders overwrite.
+    if not LABEL_RE.match(label):
+        raise SystemExit(f"Snapshot label {label!r} may only use letters, digits, '.', '_' and '-'")
+    index = load_index(snapshot_dir)
+    existing = label_path(snapshot_dir, label)
+    if existing.exists():
+        # Only the latest snapshot can be rewritten: an earlier one is the
+        # parent of the next, whose stored delta is taken against it.
+        if label != index.get("latest"):
+            raise SystemExit(
+                f"Snapshot {label!r} is not the latest ({index.get('latest')!r}); later snapshots' deltas "
+                "depend on it, so record the rebuild under a new label"
+            )
+        snapshot = read_json(existing)
+        parent = snapshot.get("parent")
+    else:
+        parent = index.get("latest")
+        snapshot = {"parent": parent, "datasets": {}}
+        if parent:
+            snapshot["datasets"] = dict(load_snapshot(snapshot_dir, parent)["datasets"])
+    datasets: Dict[str, Dict[str, object]] = dict(snapshot["datasets"])
+    written_bytes = 0
+    for name, payload in payloads.items():
+        if payload is None:
+            continue
+        data = minify(payload)
+        digest = hashlib.sha256(data).hexdigest()
+        target = object_path(snapshot_dir, digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            written_bytes += len(data)
+        datasets[name] = {"sha256": digest, "bytes": len(data)}
+
+    report: Dict[str, object] = {"label": label, "parent": parent, "objectBytes": written_bytes}
+    delta_file = None
+    if parent:
+        base = load_snapshot(snapshot_dir, parent)["datasets"]
+        delta: Dict[str, object] = {"from": parent, "to": label, "datasets": {}, "removed": []}
+        for name, entry in datasets.items():
+            previous = base.get(name)
+            if previous and previous["sha256"] == entry["sha256"]:
+                continue
+            if previous is None:
+                delta["datasets"][name] = {"kind": "added", "shard": entry["sha256"]}
+                continue
+            old = load_shard(snapshot_dir, previous["sha256"])
+            new = load_shard(snapshot_dir, entry["sha256"])
+            delta["datasets"][name] = payload_delta(old, new, entry["sha256"])
+        delta["removed"] = sorted(name for name in base if name not in datasets)
+        delta_file = delta_path(snapshot_dir, parent, label)
+        delta_file.parent.mkdir(parents=True, exist_ok=True)
+        delta_bytes = minify(delta)
+        delta_file.write_bytes(delta_bytes)
+        changed = delta["datasets"]
+        report.update(
+            {
+                "changed": sorted(changed),
+                "unchanged": len(datasets) - len(changed),
+                "deltaBytes": len(delta_bytes),
+                "changedShardBytes": sum(datasets[name]["bytes"] for name in changed),
+                "replaced": sorted(name for name, entry in changed.items() if entry["kind"] in {"replace", "added"}),
+            }
+        )
+
+    snapshot.update(
+        {
+            "snapshot": label,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "parent": parent,
+            "delta": delta_file.relative_to(snapshot_dir).as_posix() if delta_file else None,
+            "datasets": dict(sorted(datasets.items())),
+        }
+    )
+    existing.parent.mkdir(parents=True, exist_ok=True)
+    existing.write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
+    labels = [name for name in index.get("snapshots", []) if name != label]
+    if label not in index.get("snapshots", []):
+        index["latest"] = label
+        labels.append(label)
+    else:
+        labels = index["snapshots"]
+    index["snapshots"] = labels
+    (snapshot_dir / INDEX_FILENAME).write_text(json.dumps(index, indent=2), encoding="utf-8")
+    return report
+
+
+def print_snapshot_report(report: Dict[str, object], snapshot_dir: Path) -> None:
+    print(f"Snapshot {report['label']} ({label_path(snapshot_dir, report['label'])}):")
+    if not report["parent"]:
+        print(f"  first snapshot, {report['objectBytes']:,} B of shards")
+        return
+    print(
+        f"  vs {report['parent']}: {len(report['changed'])} changed ({', '.join(report['changed']) or '-'}), "
+        f"{report['unchanged']} unchanged; delta {report['deltaBytes']:,} B vs {report['changedShardBytes']:,} B "
+        f"of changed shards"
+    )
+    if report["replaced"]:
+        print(f"  shipped as whole shards: {', '.join(report['replaced'])}")
+
+
+def add_snapshot_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--snapshot",
+        metavar="LABEL",
+        help="Also record the outputs as versioned snapshot LABEL (e.g. the handbook edition, 2024-25).",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=Path,
+        default=DEFAULT_SNAPSHOT_DIR,
+        help="Directory for snapshot shards, manifests and deltas.",
+    )
+
+
+def lineage(snapshot_dir: Path, old: str, new: str) -> Optional[List[str]]:
+    # Labels from old to new by parent links, if new descends from old.
+    chain = [new]
+    seen = {new}
+    while chain[-1] != old:
+        parent = load_snapshot(snapshot_dir, chain[-1]).get("parent")
+        if not parent or parent in seen:
+            return None
+        chain.append(parent)
+        seen.add(parent)
+    return chain[::-1]
+
+
+def diff_snapshots(snapshot_dir: Path, old: str, new: str) -> Dict[str, Dict[str, object]]:
+    # Unchanged datasets are skipped by hash. Changed ones are read from the
+    # stored deltas when new descends from old; only datasets a delta had to
+    # replace whole are diffed from their two shards.
+    old_datasets = load_snapshot(snapshot_dir, old)["datasets"]
+    new_datasets = load_snapshot(snapshot_dir, new)["datasets"]
+    changed = sorted(
+        name
+        for name in set(old_datasets) | set(new_datasets)
+        if (old_datasets.get(name) or {}).get("sha256") != (new_datasets.get(name) or {}).get("sha256")
+    )
+    composed: Dict[str, Dict[Tuple[str, ...], List[object]]] = {}
+    exact = set()
+    chain = lineage(snapshot_dir, old, new) if old != new else None
+    if chain:
+        exact = {name for name in changed if name in old_datasets and name in new_datasets}
+        for parent, label in zip(chain, chain[1:]):
+            delta = read_json(delta_path(snapshot_dir, parent, label))
+            for name, entry in delta["datasets"].items():
+                if name not in exact:
+                    continue
+                if entry["kind"] in {"replace", "added"}:
+                    exact.discard(name)
+                    continue
+                cells = composed.setdefault(name, {})
+                for *key, before, after in entry.get("cells", []):
+                    cells.setdefault(tuple(key), [before, after])[1] = after
+                for *key, before in entry.get("removed", []):
+                    cells.setdefault(tuple(key), [before, MISSING])[1] = MISSING
+
+    result: Dict[str, Dict[str, object]] = {}
+    for name in changed:
+        if name not in old_datasets or name not in new_datasets:
+            result[name] = {"status": "added" if name not in old_datasets else "removed"}
+            continue
+        if name not in exact:
+            old_payload = load_shard(snapshot_dir, old_datasets[name]["sha256"])
+            new_payload = load_shard(snapshot_dir, new_datasets[name]["sha256"])
+            delta = payload_delta(old_payload, new_payload, new_datasets[name]["sha256"])
+            if delta["kind"] == "replace":
+                result[name] = {"status": "replaced"}
+                continue
+            composed[name] = {tuple(key): [before, after] for *key, before, after in delta["cells"]}
+            for *key, before in delta["removed"]:
+                composed[name][tuple(key)] = [before, MISSING]
+        cells = [
+            [*key, before, None if after is MISSING else after]
+            for key, (before, after) in composed.get(name, {}).items()
+            if before != after or type(before) is not type(after)
+        ]
+        result[name] = {"status": "changed", "cells": cells}
+    return result
+
+
+def format_cell(cell: List[object]) -> str:
+    *key, before, after = cell
+    return f"{'.'.join(str(part) for part in key)}: {json.dumps(before)} -> {json.dumps(after)}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Versioned dataset snapshots with cell-level deltas.")
+    parser.add_argument(
+        "--snapshot-dir",
+        type=Path,
+        default=DEFAULT_SNAPSHOT_DIR,
+        help="Directory for snapshot shards, manifests and deltas.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="Snapshot the dataset JSON in --data-dir.")
+    create.add_argument("label", help="Snapshot label, e.g. the handbook edition 2024-25.")
+    create.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Directory with the dataset JSON.")
+    commands.add_parser("list", help="List snapshots, oldest first.")
+    diff = commands.add_parser("diff", help="Show the cells that changed between two snapshots.")
+    diff.add_argument("old", help="Older snapshot label.")
+    diff.add_argument("new", nargs="?", help="Newer snapshot label (default: latest).")
+    diff.add_argument("--limit", type=int, default=20, help="Cells to print per dataset (0 = all).")
+    diff.add_argument("--json", action="store_true", help="Print the full diff as JSON.")
+    args = parser.parse_args()
+
+    if args.command == "create":
+        payloads = load_data_payloads(args.data_dir)
+        print_snapshot_report(write_snapshot(payloads, args.label, args.snapshot_dir), args.snapshot_dir)
+    elif args.command == "list":
+        index = load_index(args.snapshot_dir)
+        for label in index.get("snapshots", []):
+            snapshot = load_snapshot(args.snapshot_dir, label)
+            marker = " (latest)" if label == index.get("latest") else ""
+            print(
+                f"{label}{marker}: {len(snapshot['datasets'])} datasets, created {snapshot.get('created')}, "
+                f"parent {snapshot.get('parent') or '-'}"
+            )
+    else:
+        new = args.new or load_index(args.snapshot_dir).get("latest")
+        result = diff_snapshots(args.snapshot_dir, args.old, new)
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+            return
+        print(f"{args.old} -> {new}: {len(result)} dataset{'s' if len(result) != 1 else ''} changed")
+        for name, entry in result.items():
+            if entry["status"] != "changed":
+                print(f"  {name}: {entry['status']}")
+                continue
+            cells = entry["cells"]
+            print(f"  {name}: {len(cells)} cell{'s' if len(cells) != 1 else ''} changed")
+            for cell in cells[: args.limit or None]:
+                print(f"    {format_cell(cell)}")
+            if args.limit and len(cells) > args.limit:
+                print(f"    ... {len(cells) - args.limit} more")
+
+
+if __name__ == "__main__":
+    main()
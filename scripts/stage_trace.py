@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+
+DEFAULT_TRACE_DIR = Path(__file__).resolve().parent / "outputs"
+
+Event = Dict[str, object]
+
+_NULL_SPAN = nullcontext()
+_tracer: Optional["Tracer"] = None
+
+
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, object]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.counters: Dict[str, int] = {}
+        self.start = 0
+
+    def __enter__(self) -> "Span":
+        self.tracer.stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        end = time.perf_counter_ns()
+        self.tracer.stack().pop()
+        self.tracer.events.append(
+            {
+                "name": self.name,
+                "cat": self.category,
+                "ph": "X",
+                "ts": self.start / 1000,
+                "dur": (end - self.start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": dict(self.args, counters=self.counters) if self.counters else self.args,
+            }
+        )
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.events: List[Event] = []
+        self.local = threading.local()
+
+    def stack(self) -> List[Span]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def span(self, name: str, category: str, args: Dict[str, object]) -> Span:
+        return Span(self, name, category, args)
+
+    def count(self, name: str, value: int) -> None:
+        stack = self.stack()
+        if stack:
+            counters = stack[-1].counters
+            counters[name] = counters.get(name, 0) + value
+
+
+def span(name: str, category: str = "stage", **args: object) -> ContextManager[object]:
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, category, args)
+
+
+def count(name: str, value: int = 1) -> None:
+    if _tracer is not None:
+        _tracer.count(name, value)
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def start_tracing() -> Tracer:
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing() -> List[Event]:
+    global _tracer
+    events = _tracer.events if _tracer is not None else []
+    _tracer = None
+    return events
+
+
+def call_traced(func: Callable[..., object], *args: object) -> Tuple[object, List[Event]]:
+    # Runs in a worker process: trace this call only and ship the events back.
+    start_tracing()
+    try:
+        result = func(*args)
+    finally:
+        events = stop_tracing()
+    return result, events
+
+
+def merge_events(events: List[Event]) -> None:
+    if _tracer is not None:
+        _tracer.events.extend(events)
+
+
+def summarize(events: List[Event], top: int = 15) -> List[str]:
+    totals: Dict[str, Dict[str, float]] = {}
+    counters: Dict[str, Dict[str, float]] = {}
+    children: Dict[int, float] = {}
+    ordered = sorted(events, key=lambda event: (event["pid"], event["tid"], event["ts"], -event["dur"]))
+    open_spans: List[Tuple[int, Event]] = []
+    for index, event in enumerate(ordered):
+        while open_spans and (
+            open_spans[-1][1]["pid"] != event["pid"]
+            or open_spans[-1][1]["tid"] != event["tid"]
+            or open_spans[-1][1]["ts"] + open_spans[-1][1]["dur"] <= event["ts"]
+        ):
+            open_spans.pop()
+        if open_spans:
+            parent = open_spans[-1][0]
+            children[parent] = children.get(parent, 0.0) + event["dur"]
+        open_spans.append((index, event))
+
+    for index, event in enumerate(ordered):
+        entry = totals.setdefault(event["name"], {"calls": 0, "total": 0.0, "self": 0.0})
+        entry["calls"] += 1
+        entry["total"] += event["dur"]
+        entry["self"] += event["dur"] - children.get(index, 0.0)
+        span_counters = counters.setdefault(event["name"], {})
+        for key, value in event["args"].get("counters", {}).items():
+            span_counters[key] = span_counters.get(key, 0) + value
+
+    lines = [f"{'span':32} {'calls':>7} {'self ms':>10} {'total ms':>10}  counters"]
+    for name, entry in sorted(totals.items(), key=lambda item: item[1]["self"], reverse=True)[:top]:
+        counter_text = ", ".join(f"{key}={value:,.0f}" for key, value in sorted(counters.get(name, {}).items()))
+        lines.append(
+            f"{name[:32]:32} {entry['calls']:7d} {entry['self'] / 1000:10.1f} {entry['total'] / 1000:10.1f}  "
+            f"{counter_text}"
+        )
+    return lines
+
+
+def write_trace(events: List[Event], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+    summary = summarize(events)
+    summary_path = path.with_suffix(".txt")
+    summary_path.write_text("\n".join(summary) + "\n", encoding="utf-8")
+    print(f"Wrote trace {path} ({len(events)} spans; open in chrome://tracing or ui.perfetto.dev)")
+    print("Hot spots by self time:")
+    for line in summary:
+        print(f"  {line}")
+    return summary_path
+
+
+def add_profile_argument(parser: argparse.ArgumentParser, script: str) -> None:
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_TRACE_DIR / f"{script}.trace.json",
+        help=f"Record nested timing spans and write a Chrome trace (default scripts/outputs/{script}.trace.json).",
+    )
+
+
+def finish_profile(path: Optional[Path]) -> None:
+    if path is not None and _tracer is not None:
+        write_trace(stop_tracing(), path)
+
+
+def submit_traced(executor: Executor, func: Callable[..., object], *args: object) -> "Future[object]":
+    if _tracer is None:
+        return executor.submit(func, *args)
+    return executor.submit(call_traced, func, *args)
+
+
+def traced_result(future: "Future[object]") -> object:
+    # Pairs with submit_traced: unwraps worker events when tracing is on.
+    if _tracer is None:
+        return future.result()
+    result, events = future.result()
+    merge_events(events)
+    return result
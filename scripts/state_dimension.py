@@ -0,0 +1,78 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+STATES_PATH = Path(__file__).resolve().parent.parent / "src" / "data" / "states.json"
+
+# Handbook and CSV spellings that differ from the names in states.json.
+STATE_ALIASES = {
+    "andaman & nicobar": "Andaman and Nicobar Islands",
+    "andaman & nicobar islands": "Andaman and Nicobar Islands",
+    "andaman & nicobar island": "Andaman and Nicobar Islands",
+    "andaman and nicobar": "Andaman and Nicobar Islands",
+    "andaman and nicobar island": "Andaman and Nicobar Islands",
+    "dadra & nagar haveli": "Dadra and Nagar Haveli and Daman and Diu",
+    "dadra & nagar haveli and daman & diu": "Dadra and Nagar Haveli and Daman and Diu",
+    "dadra and nagar haveli and daman and diu": "Dadra and Nagar Haveli and Daman and Diu",
+    "daman & diu and dadra &": "Dadra and Nagar Haveli and Daman and Diu",
+    "daman and diu and dadra and": "Dadra and Nagar Haveli and Daman and Diu",
+    "daman & diu": "Dadra and Nagar Haveli and Daman and Diu",
+    "jammu & kashmir": "Jammu and Kashmir",
+    "nct of delhi": "Delhi",
+    "delhi": "Delhi",
+    "orissa": "Odisha",
+    "pondicherry": "Puducherry",
+}
+
+FOOTNOTE_MARKS_RE = re.compile(r"[*#@]")
+TRAILING_DASHES_RE = re.compile(r"(?:\s-+\s*)+$")
+NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def alias_key(name: str) -> str:
+    cleaned = TRAILING_DASHES_RE.sub("", FOOTNOTE_MARKS_RE.sub("", name).strip())
+    cleaned = cleaned.lower().replace("&", " and ")
+    return NON_WORD_RE.sub(" ", cleaned).strip()
+
+
+class StateDimension:
+    def __init__(self, states: List[Dict[str, str]]) -> None:
+        self.codes = [state["code"] for state in states]
+        self.by_code = {state["code"]: state for state in states}
+        self.aliases: Dict[str, str] = {}
+        self.resolved: Dict[str, Optional[str]] = {}
+        for state in states:
+            self.aliases[alias_key(state["name"])] = state["code"]
+            self.aliases[alias_key(state["code"])] = state["code"]
+        by_name = {state["name"]: state["code"] for state in states}
+        for alias, name in STATE_ALIASES.items():
+            if name in by_name:
+                self.aliases[alias_key(alias)] = by_name[name]
+
+    def code(self, name: str) -> Optional[str]:
+        # Rows repeat a few dozen raw spellings; memoize them so a lookup is one dict hit.
+        if name not in self.resolved:
+            self.resolved[name] = self.aliases.get(alias_key(name))
+        return self.resolved[name]
+
+    def name(self, code: str) -> str:
+        return self.by_code[code]["name"]
+
+    def region(self, code: str) -> str:
+        return self.by_code[code].get("region", "Other")
+
+    def canonical_name(self, name: str) -> str:
+        code = self.code(name)
+        return self.name(code) if code else name
+
+    def key(self, name: str) -> str:
+        # Compact outputs reference states by code; unknown names pass through.
+        return self.code(name) or name
+
+
+@lru_cache(maxsize=None)
+def load_state_dimension(path: Path = STATES_PATH) -> StateDimension:
+    return StateDimension(json.loads(path.read_text(encoding="utf-8")).get("states", []))
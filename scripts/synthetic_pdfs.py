@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+
+STATES_PATH = Path(__file__).resolve().parent.parent / "src" / "data" / "states.json"
+
+PAGE_WIDTH = 842
+PAGE_HEIGHT = 595
+FONT_SIZE = 7
+ROW_HEIGHT = 11
+MARGIN = 30
+NAME_WIDTH = 150
+VALUE_WIDTH = 60
+ROWS_PER_PAGE = 40
+
+# Handbook spellings, including the two-line names that the parser stitches
+# back together. Region rows carry subtotals and are dropped by the parser.
+MERGED_ROWS: List[Tuple[str, ...]] = [
+    ("Andaman & Nicobar", "Islands"),
+    ("Dadra & Nagar Haveli", "and Daman & Diu"),
+    ("Daman & Diu*",),
+    ("Ladakh",),
+]
+REGIONS = [
+    "Northern Region",
+    "North-Eastern Region",
+    "Eastern Region",
+    "Central Region",
+    "Western Region",
+    "Southern Region",
+]
+FOOTNOTES = ["Note: Figures for the latest year are provisional.", "Source: Synthetic handbook generator."]
+
+TextItem = Tuple[float, float, str]
+LineItem = Tuple[float, float, float, float]
+Page = Tuple[List[TextItem], List[LineItem]]
+
+
+def pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Path, pages: Sequence[Page]) -> int:
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for texts, lines in pages:
+        commands = [b"0.5 w"]
+        commands.extend(f"{x1:.1f} {y1:.1f} m {x2:.1f} {y2:.1f} l S".encode("ascii") for x1, y1, x2, y2 in lines)
+        for x, y, text in texts:
+            commands.append(
+                f"BT /F1 {FONT_SIZE} Tf {x:.1f} {y:.1f} Td ({pdf_escape(text)}) Tj ET".encode("cp1252")
+            )
+        stream = b"\n".join(commands)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, content_ref)
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs).encode("ascii")
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_refs))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(output))
+    return len(output)
+
+
+def letter_code(index: int) -> str:
+    code = ""
+    while True:
+        index, remainder = divmod(index, 26)
+        code = chr(ord("A") + remainder) + code
+        if index == 0:
+            return code
+        index -= 1
+
+
+def state_names(count: int) -> List[str]:
+    names = [state["name"] for state in json.loads(STATES_PATH.read_text(encoding="utf-8"))["states"]]
+    names = [name for name in names if name not in {"Ladakh", "Andaman and Nicobar Islands"}]
+    names = [name for name in names if "Daman" not in name]
+    # Names must not contain digits: the parser splits a row at its first digit.
+    names.extend(f"Synthetic State {letter_code(index)}" for index in range(max(0, count - len(names))))
+    return names[:count]
+
+
+def year_labels(count: int, fiscal: bool = True, first: int = 1990) -> List[str]:
+    if fiscal:
+        return [f"{year}-{(year + 1) % 100:02d}" for year in range(first, first + count)]
+    return [str(year) for year in range(first, first + count)]
+
+
+def format_value(rng: random.Random) -> str:
+    if rng.random() < 0.05:
+        return "-"
+    value = rng.uniform(1, 900000)
+    return f"{value:,.2f}" if rng.random() < 0.5 else f"{value:.2f}"
+
+
+def table_rows(states: List[str], width: int, rng: random.Random) -> List[List[str]]:
+    rows: List[List[str]] = []
+    per_region = max(1, len(states) // len(REGIONS))
+    for index, state in enumerate(states):
+        if index % per_region == 0 and index // per_region < len(REGIONS):
+            rows.append([REGIONS[index // per_region]] + [format_value(rng) for _ in range(width)])
+        rows.append([state] + [format_value(rng) for _ in range(width)])
+    for merged in MERGED_ROWS:
+        for part in merged[:-1]:
+            rows.append([part])
+        if merged[-1] == "Ladakh":
+            rows.append(["Ladakh - - -"])
+        else:
+            rows.append([merged[-1]] + [format_value(rng) for _ in range(width)])
+    rows.append(["All India"] + [format_value(rng) for _ in range(width)])
+    return rows
+
+
+def layout_page(title: str, header: List[str], rows: List[List[str]], footnotes: List[str]) -> Page:
+    texts: List[TextItem] = []
+    lines: List[LineItem] = []
+    y = PAGE_HEIGHT - MARGIN
+    texts.append((MARGIN, y, title))
+    y -= ROW_HEIGHT
+    texts.append((MARGIN, y, "(Rs Lakh)"))
+    y -= ROW_HEIGHT * 1.5
+
+    columns = len(header)
+    right = MARGIN + NAME_WIDTH + VALUE_WIDTH * (columns - 1)
+    top = y + ROW_HEIGHT - 2
+    for row in [header] + rows:
+        texts.append((MARGIN + 2, y, row[0]))
+        for column, value in enumerate(row[1:], start=1):
+            texts.append((MARGIN + NAME_WIDTH + VALUE_WIDTH * (column - 1) + 2, y, value))
+        lines.append((MARGIN, y - 3, right, y - 3))
+        y -= ROW_HEIGHT
+    bottom = y + ROW_HEIGHT - 3
+    lines.append((MARGIN, top, right, top))
+    for column in range(columns):
+        x = MARGIN if column == 0 else MARGIN + NAME_WIDTH + VALUE_WIDTH * (column - 1)
+        lines.append((x, top, x, bottom))
+    lines.append((right, top, right, bottom))
+
+    y -= ROW_HEIGHT / 2
+    for note in footnotes:
+        texts.append((MARGIN, y, note))
+        y -= ROW_HEIGHT
+    return texts, lines
+
+
+def handbook_pages(
+    table_id: str,
+    states: List[str],
+    years: List[str],
+    years_per_page: int,
+    rng: random.Random,
+) -> Tuple[List[Page], int]:
+    pages: List[Page] = []
+    data_rows = 0
+    for start in range(0, len(years), years_per_page):
+        chunk = years[start : start + years_per_page]
+        rows = table_rows(states, len(chunk), rng)
+        data_rows += sum(1 for row in rows if len(row) > 1)
+        for offset in range(0, len(rows), ROWS_PER_PAGE):
+            title = f"TABLE {table_id}: SYNTHETIC HANDBOOK INDICATOR" + (" (Contd.)" if pages else "")
+            last = offset + ROWS_PER_PAGE >= len(rows)
+            pages.append(
+                layout_page(
+                    title,
+                    ["State/Union Territory"] + chunk,
+                    rows[offset : offset + ROWS_PER_PAGE],
+                    FOOTNOTES if last else [],
+                )
+            )
+    return pages, data_rows
+
+
+def write_handbook_pdf(
+    path: Path,
+    table_id: str,
+    states: List[str],
+    years: List[str],
+    years_per_page: int = 7,
+    seed: int = 0,
+) -> Dict[str, int]:
+    pages, data_rows = handbook_pages(table_id, states, years, years_per_page, random.Random(seed))
+    size = write_pdf(path, pages)
+    return {"pages": len(pages), "rows": data_rows, "bytes": size}
+
+
+def write_dataset_csv(path: Path, rows: int, seed: int = 0) -> Dict[str, int]:
+    rng = random.Random(seed)
+    states = state_names(36)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["State", "GSDP (Rs Crore)", "Growth (%)", "Per Capita (Rs)"])
+        for index in range(rows):
+            writer.writerow(
+                [
+                    states[index % len(states)],
+                    format_value(rng),
+                    f"{rng.uniform(-10, 20):.2f}",
+                    f"{int(rng.uniform(50000, 500000)):,}",
+                ]
+            )
+        writer.writerow(["Total", "", "", ""])
+    return {"rows": rows, "bytes": path.stat().st_size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic RBI handbook-style PDFs and CSVs.")
+    parser.add_argument("--output-dir", type=Path, required=True, help="Directory for the generated files.")
+    parser.add_argument("--files", type=int, default=3, help="Number of handbook PDFs.")
+    parser.add_argument("--states", type=int, default=36, help="State rows per table.")
+    parser.add_argument("--years", type=int, default=21, help="Year columns per table.")
+    parser.add_argument(
+        "--years-per-page",
+        type=int,
+        default=7,
+        help="Year columns per page before the table continues.",
+    )
+    parser.add_argument("--csv-rows", type=int, default=10000, help="Rows in the generated dataset CSV.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+
+    states = state_names(args.states)
+    for index in range(args.files):
+        path = args.output_dir / f"{900 + index}T_SYNTHETIC.PDF"
+        years = year_labels(args.years, fiscal=index % 2 == 0)
+        stats = write_handbook_pdf(path, f"{900 + index}", states, years, args.years_per_page, args.seed + index)
+        print(f"Wrote {path} ({stats['pages']} pages, {stats['rows']} rows)")
+    csv_path = args.output_dir / "synthetic.csv"
+    write_dataset_csv(csv_path, args.csv_rows, args.seed)
+    print(f"Wrote {csv_path} ({args.csv_rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from typing import Dict, List
+
+import numpy as np
+
+from build_json import build_columns, build_rows, compute_national, parse_number
+from column_engine import as_python, compute_national_columns, parse_numeric_column
+
+
+CELLS = ["1,234", "(12.5)", "(7)", "-", "", "N.A.", "8%", "₹ 3", "(x)", "abc", " (0.25) "]
+
+COLUMNS: Dict[str, Dict[str, object]] = {
+    "state": {"source": ["state"]},
+    "gsdp": {"source": ["gsdp"]},
+    "growth": {"source": ["growth"]},
+}
+
+ROWS: List[List[str]] = [
+    ["State", "GSDP", "Growth (%)"],
+    ["Goa", "(1,250.5)", "(3.2)"],
+    ["Kerala", "9,800", "4.1"],
+    ["Bihar", "..", "(12)"],
+]
+
+NATIONAL = {"sum": {"totalGDP": "gsdp"}, "avg": {"avgGrowth": "growth"}, "min": {"minGrowth": "growth"}}
+
+
+def test_numeric_column_matches_parse_number() -> None:
+    values, mask = parse_numeric_column(np.array(CELLS))
+    assert as_python(values, mask) == [parse_number(cell) for cell in CELLS]
+    assert as_python(values, mask)[1:3] == [-12.5, -7]
+
+
+def test_engines_agree_on_negative_cells() -> None:
+    records = build_rows(ROWS, COLUMNS, ["gsdp", "growth"], 0)
+    table = build_columns(ROWS, COLUMNS, ["gsdp", "growth"], 0)
+
+    assert table.to_records() == records
+    assert [record["gsdp"] for record in records] == [-1250.5, 9800, None]
+    assert compute_national_columns(table, NATIONAL) == compute_national(records, NATIONAL)
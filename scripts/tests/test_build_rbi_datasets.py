@@ -0,0 +1,81 @@
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import pytest
+
+import build_rbi_datasets
+import page_analysis
+from build_rbi_datasets import build_series_dataset, parse_state_series, stop_years
+from page_analysis import iter_page_analysis, iter_text_lines
+from pdf_cache import PageCache
+from synthetic_pdfs import state_names, write_handbook_pdf, year_labels
+
+
+YEARS = year_labels(42)
+
+
+@pytest.fixture(scope="module")
+def handbook(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Six year blocks of 7 years, one page each, so a dataset reading the
+    # second block can stop long before the last page.
+    path = tmp_path_factory.mktemp("pdf") / "901T_SYNTHETIC.PDF"
+    info = write_handbook_pdf(path, "901", state_names(12), YEARS, 7)
+    assert info["pages"] == 6
+    return path
+
+
+@pytest.fixture
+def pages_read(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    read: List[int] = []
+    iter_page_lines = build_rbi_datasets.iter_page_lines
+
+    def counting(*args: object) -> Iterator[List[str]]:
+        for lines in iter_page_lines(*args):
+            read.append(len(lines))
+            yield lines
+
+    monkeypatch.setattr(build_rbi_datasets, "iter_page_lines", counting)
+    return read
+
+
+def test_early_exit_reads_fewer_pages(handbook: Path, pages_read: List[int]) -> None:
+    dataset: Dict[str, object] = {
+        "name": "synthetic",
+        "rows_from": "indicator",
+        "fields": [
+            {"name": "value", "table": "indicator", "year": YEARS[9], "required": True},
+            {"name": "growth", "derive": "growth", "table": "indicator", "year": YEARS[9], "base_year": YEARS[6]},
+        ],
+        "national": [{"name": "total", "op": "sum", "field": "value", "round": 2}],
+    }
+    targets = stop_years([dataset], {"indicator": handbook})[handbook]
+
+    full = parse_state_series(handbook)
+    full_pages = len(pages_read)
+    del pages_read[:]
+    early = parse_state_series(handbook, stop_after_years=targets)
+
+    assert full_pages == 6
+    # The block holding YEARS[7:14] closes when the third page's header is read.
+    assert len(pages_read) == 3
+    assert set(early[1]) == set(full[1])
+    assert build_series_dataset(dataset, {"indicator": early}) == build_series_dataset(dataset, {"indicator": full})
+    assert build_series_dataset(dataset, {"indicator": full})["data"]
+
+
+def test_early_exit_reads_everything_for_the_last_block(handbook: Path, pages_read: List[int]) -> None:
+    early = parse_state_series(handbook, stop_after_years=[YEARS[-1]])
+    assert len(pages_read) == 6
+    assert early == parse_state_series(handbook)
+
+
+def test_lines_reuse_a_cached_analysis(handbook: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = PageCache(tmp_path / "cache")
+    analysed = [analysis["lines"] for _, analysis in iter_page_analysis(handbook, cache)]
+    assert [lines for _, lines in iter_text_lines(handbook)] == analysed
+
+    def extract(page: object) -> List[str]:
+        raise AssertionError("page was extracted again")
+
+    monkeypatch.setattr(page_analysis, "extract_page_lines", extract)
+    assert [lines for _, lines in iter_text_lines(handbook, cache)] == analysed
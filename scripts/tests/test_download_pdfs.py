@@ -0,0 +1,122 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from download_pdfs import STATE_FILENAME, Backoff, DownloadState, download_pdf
+
+
+class RangeServer:
+    # A PDF served with an ETag, Range/If-Range support and optional 429s,
+    # which http.server's SimpleHTTPRequestHandler does not provide.
+    def __init__(self) -> None:
+        self.body = b"%PDF-1.4 " + bytes(range(256)) * 40
+        self.etag = '"v1"'
+        self.throttle: List[str] = []
+        self.requests: List[Dict[str, str]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server.requests.append(dict(self.headers))
+                if server.throttle:
+                    self.send_response(429)
+                    self.send_header("Retry-After", server.throttle.pop(0))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = server.body
+                start = 0
+                requested = self.headers.get("Range")
+                if requested and self.headers.get("If-Range") == server.etag:
+                    start = int(requested.split("=")[1].rstrip("-"))
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                else:
+                    self.send_response(200)
+                self.send_header("ETag", server.etag)
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+                self.wfile.write(body[start:])
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/table.pdf"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = RangeServer()
+    yield server
+    server.close()
+
+
+def fetch(server: RangeServer, tmp_path: Path, state: DownloadState) -> str:
+    status, _ = download_pdf(server.url, tmp_path / "table.pdf", timeout=5, state=state, backoff=Backoff(0.01))
+    return status
+
+
+def test_resumes_part_against_its_validator(server: RangeServer, tmp_path: Path) -> None:
+    state = DownloadState(tmp_path / STATE_FILENAME)
+    (tmp_path / "table.pdf.part").write_bytes(server.body[:1000])
+    state.entries["table.pdf.part"] = {"etag": server.etag}
+
+    assert fetch(server, tmp_path, state) == "downloaded"
+    assert server.requests[-1]["Range"] == "bytes=1000-"
+    assert server.requests[-1]["If-Range"] == server.etag
+    assert (tmp_path / "table.pdf").read_bytes() == server.body
+    assert state.get("table.pdf") == {"etag": server.etag}
+    assert state.get("table.pdf.part") == {}
+
+
+def test_changed_file_restarts_from_zero(server: RangeServer, tmp_path: Path) -> None:
+    state = DownloadState(tmp_path / STATE_FILENAME)
+    (tmp_path / "table.pdf.part").write_bytes(server.body[:1000])
+    state.entries["table.pdf.part"] = {"etag": server.etag}
+    server.body = b"%PDF-1.5 " + b"new" * 500
+    server.etag = '"v2"'
+
+    assert fetch(server, tmp_path, state) == "downloaded"
+    assert server.requests[-1]["If-Range"] == '"v1"'
+    assert (tmp_path / "table.pdf").read_bytes() == server.body
+
+
+def test_part_without_validator_is_discarded(server: RangeServer, tmp_path: Path) -> None:
+    state = DownloadState(tmp_path / STATE_FILENAME)
+    (tmp_path / "table.pdf.part").write_bytes(b"%PDF-stale" + b"x" * 100)
+
+    assert fetch(server, tmp_path, state) == "downloaded"
+    assert "Range" not in server.requests[-1]
+    assert (tmp_path / "table.pdf").read_bytes() == server.body
+
+
+def test_unchanged_file_is_not_downloaded_again(server: RangeServer, tmp_path: Path) -> None:
+    state = DownloadState(tmp_path / STATE_FILENAME)
+    assert fetch(server, tmp_path, state) == "downloaded"
+    assert fetch(server, tmp_path, state) == "unchanged"
+    assert server.requests[-1]["If-None-Match"] == server.etag
+
+
+def test_429_waits_for_retry_after(server: RangeServer, tmp_path: Path) -> None:
+    state = DownloadState(tmp_path / STATE_FILENAME)
+    server.throttle = ["0.3"]
+    start = time.monotonic()
+
+    assert fetch(server, tmp_path, state) == "downloaded"
+    assert len(server.requests) == 2
+    assert time.monotonic() - start >= 0.3
+    assert (tmp_path / "table.pdf").read_bytes() == server.body
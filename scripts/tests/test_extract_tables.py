@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from extract_tables import extract_tables_from_pdf, extract_tables_sharded
+from synthetic_pdfs import state_names, write_handbook_pdf, year_labels
+
+
+@pytest.fixture(scope="module")
+def handbook(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Ruled state x year tables over several pages.
+    path = tmp_path_factory.mktemp("pdf") / "900T_SYNTHETIC.PDF"
+    write_handbook_pdf(path, "900", state_names(12), year_labels(28), 7)
+    return path
+
+
+def read_outputs(written: List[Path], output_dir: Path) -> Dict[str, bytes]:
+    return {path.relative_to(output_dir).as_posix(): path.read_bytes() for path in written}
+
+
+def test_sharded_extraction_matches_serial(handbook: Path, tmp_path: Path) -> None:
+    serial = extract_tables_from_pdf(handbook, tmp_path / "serial")
+    sharded = extract_tables_sharded(handbook, tmp_path / "sharded", jobs=2)
+
+    assert len(serial) >= 4
+    assert [path.name for path in sharded] == [path.name for path in serial]
+    assert read_outputs(sharded, tmp_path / "sharded") == read_outputs(serial, tmp_path / "serial")
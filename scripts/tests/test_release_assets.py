@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+
+from release_assets import ASSET_MANIFEST, load_data_payloads, write_release
+
+
+def test_dotfiles_are_not_released(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    (data_dir / "series").mkdir(parents=True)
+    (data_dir / "gdp.json").write_text(json.dumps({"data": [{"state": "Goa", "gsdp": 1}]}), encoding="utf-8")
+    (data_dir / "series" / "gdp.json").write_text(json.dumps({"years": []}), encoding="utf-8")
+    (data_dir / ".build-state.json").write_text(json.dumps({"version": 1, "datasets": {}}), encoding="utf-8")
+
+    payloads = load_data_payloads(data_dir)
+    assert sorted(payloads) == ["gdp.json", "series/gdp.json"]
+
+    release_dir = tmp_path / "release"
+    write_release(payloads, release_dir)
+    manifest = json.loads((release_dir / ASSET_MANIFEST).read_text(encoding="utf-8"))
+    assert sorted(manifest) == ["gdp.json", "series/gdp.json"]
+    assert not [path for path in release_dir.rglob("*") if "build-state" in path.name]
+
+
+def test_missing_gzip_is_regenerated(tmp_path: Path) -> None:
+    payloads = {"gdp.json": {"data": []}, "empty.json": None}
+    write_release(payloads, tmp_path)
+    manifest = json.loads((tmp_path / ASSET_MANIFEST).read_text(encoding="utf-8"))
+    assert sorted(manifest) == ["gdp.json"]
+    compressed = tmp_path / manifest["gdp.json"]["gzip"]
+    compressed.unlink()
+    write_release(payloads, tmp_path)
+    assert compressed.stat().st_size == manifest["gdp.json"]["gzipBytes"]
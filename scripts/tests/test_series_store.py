@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+from series_store import SeriesStore, write_store
+
+
+SERIES = {
+    "gsdp": (["2021-22", "2022-23"], {"Kerala": [1.5, None], "Goa": [2.0, 3.25]}),
+}
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "series.bin"
+    write_store(path, SERIES)
+    with SeriesStore(path) as store:
+        assert store.get_series("gsdp", "Kerala") == [1.5, None]
+        assert store.get_value("gsdp", "Goa", "2022-23") == 3.25
+
+
+@pytest.mark.parametrize("keep", [0, 4, 20, -8])
+def test_truncated_store_raises_value_error(tmp_path: Path, keep: int) -> None:
+    path = tmp_path / "series.bin"
+    write_store(path, SERIES)
+    data = path.read_bytes()
+    path.write_bytes(data[:keep])
+    with pytest.raises(ValueError, match=str(path)):
+        SeriesStore(path)
+
+
+def test_other_file_raises_value_error(tmp_path: Path) -> None:
+    path = tmp_path / "series.bin"
+    path.write_bytes(b"%PDF-1.4 not a store at all")
+    with pytest.raises(ValueError, match="not a series store"):
+        SeriesStore(path)
@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pypdfium2 as pdfium
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LTChar, LTContainer, LTPage
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+from pdf_cache import PlumberDocument
+
+
+DEFAULT_TEXT_BACKEND = "pdfplumber"
+TEXT_SETTINGS: Dict[str, object] = {}
+
+# pdfplumber's extract_text defaults, reused so the pdfminer backend groups
+# characters into words and lines the same way.
+X_TOLERANCE = 3.0
+Y_TOLERANCE = 3.0
+
+
+class PdfiumDocument:
+    name = "pdfium"
+
+    def __init__(self, pdf_path: Path) -> None:
+        self.pdf = pdfium.PdfDocument(str(pdf_path))
+
+    def __len__(self) -> int:
+        return len(self.pdf)
+
+    def page(self, page_number: int) -> pdfium.PdfPage:
+        return self.pdf[page_number - 1]
+
+    def release(self, page: pdfium.PdfPage) -> None:
+        page.close()
+
+    def close(self) -> None:
+        self.pdf.close()
+
+
+class PdfminerDocument:
+    name = "pdfminer"
+
+    def __init__(self, pdf_path: Path) -> None:
+        self.handle = pdf_path.open("rb")
+        document = PDFDocument(PDFParser(self.handle))
+        self.pages = list(PDFPage.create_pages(document))
+        # laparams=None skips pdfminer's layout analysis: the aggregator only
+        # collects positioned characters.
+        self.device = PDFPageAggregator(PDFResourceManager(caching=True), laparams=None)
+        self.interpreter = PDFPageInterpreter(self.device.rsrcmgr, self.device)
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def page(self, page_number: int) -> LTPage:
+        self.interpreter.process_page(self.pages[page_number - 1])
+        return self.device.get_result()
+
+    def release(self, page: LTPage) -> None:
+        pass
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+def extract_page_lines(page) -> List[str]:
+    text = page.extract_text(**TEXT_SETTINGS) or ""
+    return text.splitlines()
+
+
+def pdfium_page_lines(page: pdfium.PdfPage) -> List[str]:
+    # pdfium emits text in content-stream order, breaking lines where the
+    # baseline moves; it does not re-sort by position.
+    text_page = page.get_textpage()
+    try:
+        text = text_page.get_text_range()
+    finally:
+        text_page.close()
+    return text.splitlines()
+
+
+def iter_chars(item: LTContainer, page_height: float) -> List[Tuple[float, float, float, str]]:
+    chars = []
+    for child in item:
+        if isinstance(child, LTChar):
+            chars.append((page_height - child.y1, child.x0, child.x1, child.get_text()))
+        elif isinstance(child, LTContainer):
+            chars.extend(iter_chars(child, page_height))
+    return chars
+
+
+def pdfminer_page_lines(page: LTPage) -> List[str]:
+    chars = sorted(iter_chars(page, page.height))
+    clusters: List[List[Tuple[float, float, float, str]]] = []
+    last_top: Optional[float] = None
+    for char in chars:
+        if last_top is None or char[0] - last_top > Y_TOLERANCE:
+            clusters.append([])
+        clusters[-1].append(char)
+        last_top = char[0]
+
+    lines = []
+    for cluster in clusters:
+        parts: List[str] = []
+        last_x1: Optional[float] = None
+        for _, x0, x1, text in sorted(cluster, key=lambda char: char[1]):
+            if text.isspace():
+                last_x1 = None
+                parts.append(" ")
+                continue
+            if last_x1 is not None and x0 - last_x1 > X_TOLERANCE:
+                parts.append(" ")
+            parts.append(text)
+            last_x1 = x1
+        line = " ".join("".join(parts).split())
+        if line:
+            lines.append(line)
+    return lines
+
+
+TEXT_BACKENDS: Dict[str, Tuple[Callable[[Path], PlumberDocument], Callable[[object], List[str]]]] = {
+    "pdfplumber": (PlumberDocument, extract_page_lines),
+    "pdfium": (PdfiumDocument, pdfium_page_lines),
+    "pdfminer": (PdfminerDocument, pdfminer_page_lines),
+}
+
+
+def text_settings(backend: str) -> Dict[str, object]:
+    # Cache settings for each backend's "text" entries. pdfplumber keeps the
+    # unmarked settings, so its entries are shared with page_analysis.
+    return TEXT_SETTINGS if backend == DEFAULT_TEXT_BACKEND else dict(TEXT_SETTINGS, backend=backend)
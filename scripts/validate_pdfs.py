@@ -1,6 +1,27 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional
+
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+
+MANIFEST_FILENAME = ".pdf-manifest.json"
+# The spec allows the header within the first 1024 bytes and %%EOF within the last 1024.
+HEADER_WINDOW = 1024
+TRAILER_WINDOW = 2048
+STARTXREF_RE = re.compile(rb"startxref\s+(\d+)\s+%%EOF")
+XREF_STREAM_RE = re.compile(rb"\d+\s+\d+\s+obj\s*<<")
+ROOT_RE = re.compile(rb"/Root\s+\d+\s+\d+\s+R")
 
 
 def is_pdf(path: Path) -> bool:
@@ -8,9 +29,131 @@ def is_pdf(path: Path) -> bool:
         return handle.read(4) == b"%PDF"
 
 
+def check_structure(data: mmap.mmap) -> Optional[str]:
+    size = len(data)
+    if data.find(b"%PDF-", 0, HEADER_WINDOW) < 0:
+        return "missing %PDF- header"
+    tail_start = max(0, size - TRAILER_WINDOW)
+    tail = data[tail_start:]
+    eof = tail.rfind(b"%%EOF")
+    if eof < 0 or eof < len(tail) - HEADER_WINDOW:
+        return "missing trailing %%EOF (truncated download?)"
+    startxref = tail.rfind(b"startxref", 0, eof)
+    match = STARTXREF_RE.search(tail, startxref) if startxref >= 0 else None
+    if not match:
+        return "unparsable startxref"
+    offset = int(match.group(1))
+    if offset >= size:
+        return f"startxref {offset} points past end of file ({size} bytes)"
+    head = data[offset : offset + 64]
+    if head.startswith(b"xref"):
+        trailer = data.find(b"trailer", offset)
+        if trailer < 0 or not ROOT_RE.search(data[trailer : trailer + 4096]):
+            return "xref table without a trailer /Root"
+    elif XREF_STREAM_RE.match(head):
+        if not ROOT_RE.search(data[offset : offset + 4096]):
+            return "xref stream without /Root"
+    else:
+        return f"startxref {offset} does not point at an xref section"
+    return None
+
+
+def count_pages(data: mmap.mmap) -> int:
+    # pdfminer seeks through the mapping: only the xref, catalog and page tree
+    # root are read. fallback=False turns a broken xref into an error instead
+    # of a full-file scan.
+    document = PDFDocument(PDFParser(data), fallback=False)
+    pages = resolve1(document.catalog["Pages"])
+    return int(resolve1(pages["Count"]))
+
+
+def mmap_sha256(data: mmap.mmap) -> str:
+    digest = hashlib.sha256()
+    view = memoryview(data)
+    try:
+        for start in range(0, len(data), 1024 * 1024):
+            digest.update(view[start : start + 1024 * 1024])
+    finally:
+        view.release()
+    return digest.hexdigest()
+
+
+def deep_validate(path: Path) -> Dict[str, object]:
+    stat = path.stat()
+    result: Dict[str, object] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": None, "pages": None}
+    if stat.st_size == 0:
+        result["error"] = "empty file"
+        return result
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        result["sha256"] = mmap_sha256(data)
+        error = check_structure(data)
+        if error is None:
+            try:
+                result["pages"] = count_pages(data)
+            except Exception as exc:  # pdfminer raises a wide range of parse errors
+                error = f"unreadable page tree: {type(exc).__name__}: {exc}"
+            else:
+                if result["pages"] < 1:
+                    error = "page tree has no pages"
+    if error:
+        result["error"] = error
+    return result
+
+
+def load_manifest(path: Path) -> Dict[str, Dict[str, object]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def run_deep(pdf_files: List[Path], manifest_path: Path, jobs: int) -> List[str]:
+    manifest = load_manifest(manifest_path)
+    pending = []
+    reused = 0
+    for pdf in pdf_files:
+        entry = manifest.get(pdf.name)
+        stat = pdf.stat()
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            reused += 1
+        else:
+            pending.append(pdf)
+
+    start = time.perf_counter()
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(deep_validate, pending))
+    else:
+        results = [deep_validate(pdf) for pdf in pending]
+    elapsed = time.perf_counter() - start
+
+    current = {pdf.name for pdf in pdf_files}
+    manifest = {name: entry for name, entry in manifest.items() if name in current}
+    manifest.update({pdf.name: result for pdf, result in zip(pending, results)})
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+    total_bytes = sum(int(result["size"]) for result in results)
+    print(
+        f"Deep-validated {len(pending)} PDFs ({total_bytes / (1024 * 1024):.1f} MB) in {elapsed:.2f}s "
+        f"with {jobs} worker{'s' if jobs != 1 else ''}; reused {reused} unchanged from {manifest_path}"
+    )
+    return [f"{name}: {entry['error']}" for name, entry in sorted(manifest.items()) if entry.get("error")]
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Validate that files are real PDFs.")
     parser.add_argument("--dir", type=Path, default=Path("../data"), help="Directory containing PDF files.")
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Also check %%EOF, startxref/trailer and the page tree, and record a hash manifest.",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Worker processes for --deep (0 = one per CPU).")
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help=f"Hash/size/page-count manifest for --deep (defaults to <dir>/{MANIFEST_FILENAME}).",
+    )
     args = parser.parse_args()
 
     pdf_files = sorted(args.dir.glob("*.PDF")) + sorted(args.dir.glob("*.pdf"))
@@ -23,11 +166,21 @@ def main() -> None:
         if not is_pdf(pdf):
             invalid.append(pdf.name)
 
+    damaged = []
+    if args.deep:
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        manifest_path = args.manifest or args.dir / MANIFEST_FILENAME
+        damaged = run_deep([pdf for pdf in pdf_files if pdf.name not in invalid], manifest_path, jobs)
+
     if invalid:
         print("Non-PDF files detected:")
         for name in invalid:
             print(f" - {name}")
-    else:
+    if damaged:
+        print("Damaged PDFs detected:")
+        for problem in damaged:
+            print(f" - {problem}")
+    if not invalid and not damaged:
         print("All files are valid PDFs.")
 
 
@@ -10,7 +10,11 @@ import {
 import { formatIndianNumber, formatCurrency } from "@/lib/formatters";
 
 // India GeoJSON (local) to avoid remote fetch/CORS issues.
-const INDIA_TOPO_URL = "/india-states.json";
+// scripts/build_map.py writes both levels; the overview's simplification
+// shows past 2x zoom, so the detail level is loaded from there on.
+const INDIA_TOPO_URL = "/india-states.overview.json";
+const INDIA_DETAIL_TOPO_URL = "/india-states.detail.json";
+const DETAIL_ZOOM = 2;
 
 interface StateData {
   state: string;
@@ -81,6 +85,7 @@ export default function IndiaMap({
   onStateClick,
 }: IndiaMapProps) {
   const [hoveredState, setHoveredState] = useState<string | null>(null);
+  const [zoom, setZoom] = useState(1);
   const [tooltipContent, setTooltipContent] = useState<{
     name: string;
     value: number;
@@ -148,8 +153,11 @@ export default function IndiaMap({
           }}
           style={{ width: "100%", height: "auto" }}
         >
-          <ZoomableGroup zoom={1}>
-            <Geographies geography={INDIA_TOPO_URL}>
+          <ZoomableGroup
+            zoom={1}
+            onMoveEnd={({ zoom: nextZoom }: { zoom: number }) => setZoom(nextZoom)}
+          >
+            <Geographies geography={zoom >= DETAIL_ZOOM ? INDIA_DETAIL_TOPO_URL : INDIA_TOPO_URL}>
               {({ geographies }: any) =>
                 geographies.map((geo: any) => {
                   const geoName = geo.properties.st_nm || geo.properties.NAME_1 || geo.properties.name;